@@ -1,4 +1,48 @@
-from controllers.weather_controller import WeatherController
+import argparse
+import sys
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Weather dashboard. Without a command the GUI is started.")
+    commands = parser.add_subparsers(dest="command")
+
+    ingest = commands.add_parser("ingest", help="Fetch and log weather for a list of cities without the GUI")
+    ingest.add_argument("--cities", required=True, help="File with one city per line ('-' for stdin)")
+    ingest.add_argument("--concurrency", type=int, default=8, help="Number of parallel lookups (default: 8)")
+    ingest.add_argument("--rate", type=float, default=1.0,
+                        help="OpenWeather requests per second shared by all workers (default: 1.0)")
+    ingest.add_argument("--log-file", default="data/weather_log.csv", help="CSV log to append results to")
+    ingest.add_argument("--fsync", action="store_true", help="fsync the log after every batch of lines")
+
+    archive = commands.add_parser("archive", help="Move closed days from the weather log into the columnar archive")
+    archive.add_argument("--log-file", default="data/weather_log.csv", help="CSV log to archive from")
+    archive.add_argument("--archive-dir", default="data/weather_archive",
+                         help="Archive root, partitioned by month and city (default: data/weather_archive)")
+
+    compact = commands.add_parser("compact", help="Keep only the latest reading per date and city in the log and archive")
+    compact.add_argument("--log-file", default="data/weather_log.csv", help="CSV log to compact")
+    compact.add_argument("--archive-dir", default="data/weather_archive", help="Archive root to compact")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "ingest":
+        # Imported lazily so headless runs never load Tk
+        from controllers.batch_ingest import run_ingest
+        return run_ingest(args)
+    if args.command == "archive":
+        from features.weather_archive import run_archive
+        return run_archive(args)
+    if args.command == "compact":
+        from features.weather_archive import run_compact
+        return run_compact(args)
+
+    from controllers.weather_controller import WeatherController
+    WeatherController()
+    return 0
+
 
 if __name__ == "__main__":
-    WeatherController()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,232 @@
+import csv
+import json
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+WEATHER_PATH = "/data/2.5/weather"
+GROUP_PATH = "/data/2.5/group"
+POLLEN_PATH = "/v1/forecast:lookup"
+API_PATHS = (WEATHER_PATH, GROUP_PATH, POLLEN_PATH)
+
+
+def load_city_ids(path: str = "data/city_gazetteer.csv") -> Dict[str, int]:
+    """name -> OpenWeather city ID from a gazetteer file, so the stub answers ID lookups for bundled cities."""
+    try:
+        with open(path, newline="") as f:
+            return {row['name']: int(row['id']) for row in csv.DictReader(f)}
+    except (OSError, KeyError, ValueError):
+        return {}
+
+
+class StubConfig:
+    """Behavior of the stand-in API server; can be changed while it is running.
+
+    latency: Base delay in seconds added to every response
+    jitter: Extra uniformly random delay of up to this many seconds
+    error_rate: Probability (0-1) that a request is answered with HTTP 500
+    rate_limit_every: A burst of 429s starts at request 1, N+1, 2N+1, ... (0 disables)
+    rate_limit_burst: Number of consecutive requests answered with 429 in a burst
+    retry_after: Value of the Retry-After header sent with 429s (None to omit it)
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit_every: int = 0, rate_limit_burst: int = 1,
+                 retry_after: Optional[float] = 0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_every = rate_limit_every
+        self.rate_limit_burst = rate_limit_burst
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+
+class StubApiServer:
+    """Local HTTP server that answers like OpenWeather's current weather (by name or ID), its
+    group-by-ID endpoint, and Google's pollen forecast.
+
+    City IDs come from `cities` (name -> ID, default: the bundled gazetteer). A name search for
+    any other city makes up a stable ID and remembers it, so later ID and group lookups work;
+    unknown IDs are answered with 404 like the real API.
+
+    Usage:
+        with StubApiServer(StubConfig(latency=0.05)) as server:
+            model = WeatherModel(api_key="stub", api_base_url=server.weather_url)
+    """
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0,
+                 cities: Optional[Mapping[str, int]] = None):
+        self.config = config or StubConfig()
+        self._names: Dict[int, str] = {city_id: name for name, city_id in
+                                       (load_city_ids() if cities is None else cities).items()}
+        self._ids: Dict[str, int] = {name.lower(): city_id for city_id, name in self._names.items()}
+        self.requests: Dict[str, int] = {}  # path -> requests received
+        self.responses: Dict[int, int] = {}  # status code -> responses sent
+        self._burst_left = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def weather_url(self) -> str:
+        return self.base_url + WEATHER_PATH
+
+    @property
+    def pollen_url(self) -> str:
+        return self.base_url + POLLEN_PATH
+
+    def start(self) -> "StubApiServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubApiServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests.clear()
+            self.responses.clear()
+
+    def total_requests(self) -> int:
+        with self._lock:
+            return sum(self.requests.values())
+
+    def _choose_status(self, path: str) -> Tuple[int, float]:
+        """Record the request and decide how to answer it (under the lock, so bursts are exact)."""
+        config = self.config
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            count = sum(self.requests.values())
+            if config.rate_limit_every and (count - 1) % config.rate_limit_every == 0:
+                self._burst_left = config.rate_limit_burst
+            if self._burst_left > 0:
+                self._burst_left -= 1
+                status = 429
+            elif config.random.random() < config.error_rate:
+                status = 500
+            elif path not in API_PATHS:
+                status = 404
+            else:
+                status = 200
+            delay = config.latency + config.random.uniform(0, config.jitter)
+        return status, delay
+
+    def _count_response(self, status: int):
+        with self._lock:
+            self.responses[status] = self.responses.get(status, 0) + 1
+
+    def _city_by_name(self, name: str) -> Tuple[int, str]:
+        with self._lock:
+            city_id = self._ids.get(name.lower())
+            if city_id is None:
+                city_id = 1_000_000 + zlib.crc32(name.lower().encode()) % 9_000_000
+                self._ids[name.lower()] = city_id
+                self._names.setdefault(city_id, name.title())
+            return city_id, self._names[city_id]
+
+    def _city_by_id(self, city_id: str) -> Optional[Tuple[int, str]]:
+        try:
+            city_id = int(city_id)
+        except ValueError:
+            return None
+        with self._lock:
+            name = self._names.get(city_id)
+        return None if name is None else (city_id, name)
+
+    def _body(self, path: str, query: Dict) -> Optional[Dict]:
+        """Response body for a 200 answer, or None if the requested city does not exist."""
+        if path == POLLEN_PATH:
+            return _pollen_body(query)
+        if path == GROUP_PATH:
+            ids = query.get("id", [""])[0].split(",")
+            found = [city for city in map(self._city_by_id, ids) if city is not None]
+            return {"cnt": len(found), "list": [_weather_body(*city) for city in found]}
+        if "id" in query:
+            city = self._city_by_id(query["id"][0])
+        else:
+            city = self._city_by_name(query.get("q", ["unknown"])[0])
+        return None if city is None else _weather_body(*city)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real APIs
+            disable_nagle_algorithm = True  # Headers and body are separate writes; avoid delayed-ACK stalls
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                status, delay = server._choose_status(url.path)
+                if delay > 0:
+                    time.sleep(delay)
+
+                body = server._body(url.path, parse_qs(url.query)) if status == 200 else None
+                if status == 200 and body is None:
+                    status, body = 404, {"cod": "404", "message": "city not found"}
+                elif body is None:
+                    body = {"error": {"code": status}}
+                server._count_response(status)
+
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if status == 429 and server.config.retry_after is not None:
+                    self.send_header("Retry-After", str(server.config.retry_after))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
+
+
+def _weather_body(city_id: int, city: str) -> Dict:
+    seed = sum(city.lower().encode())
+    return {
+        "id": city_id,
+        "coord": {"lat": round(seed % 180 - 90 + 0.5, 4), "lon": round(seed % 360 - 180 + 0.5, 4)},
+        "weather": [{"description": "clear sky"}],
+        "main": {"temp": 60 + seed % 30, "humidity": 30 + seed % 60},
+        "dt": int(time.time()),
+        "name": city,
+        "sys": {"country": "US"},
+    }
+
+
+def _pollen_body(query: Dict) -> Dict:
+    days = int(query.get("days", ["1"])[0])
+    today = datetime.now().date()
+    daily_info = []
+    for offset in range(days):
+        day = today + timedelta(days=offset)
+        daily_info.append({
+            "date": {"year": day.year, "month": day.month, "day": day.day},
+            "pollenTypeInfo": [
+                {"code": code, "indexInfo": {"value": (offset + i) % 6},
+                 "healthRecommendations": ["Limit time outdoors."]}
+                for i, code in enumerate(("GRASS", "TREE", "WEED"))
+            ],
+        })
+    return {"dailyInfo": daily_info}
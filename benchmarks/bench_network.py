@@ -0,0 +1,134 @@
+"""Network load benchmarks for the fetch path, run against the local stand-in API server.
+
+    python benchmarks/bench_network.py [--requests 200] [--concurrency 8] [--scenario flaky]
+
+Each scenario drives WeatherModel and PollenModel (response caches disabled) through a
+fresh HttpTransport and reports throughput, p50/p99 latency per logical fetch, failures
+and retry amplification (HTTP requests seen by the server per logical fetch). The
+weather_many row fetches the same number of cities, all with known IDs, through one
+WeatherModel.fetch_many call, so its amplification shows the saving from group requests.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import csv
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.api_stub_server import StubApiServer, StubConfig
+from controllers.batch_ingest import percentile
+from models.http_transport import HttpTransport
+from models.pollen_model import PollenModel
+from models.weather_model import WeatherModel
+
+SCENARIOS: Dict[str, Dict] = {
+    'baseline': {},
+    'slow': {'latency': 0.05, 'jitter': 0.05},
+    'flaky': {'error_rate': 0.05},
+    'rate_limited': {'rate_limit_every': 25, 'rate_limit_burst': 3, 'retry_after': 0},
+}
+
+
+def run_load(fetch: Callable[[int], Tuple[Optional[Dict], str]], requests: int, concurrency: int,
+             server: StubApiServer) -> Dict[str, float]:
+    """Call fetch(i) for i in range(requests) on `concurrency` threads and summarize the run."""
+    def timed(i: int) -> Tuple[bool, float]:
+        start = time.perf_counter()
+        data, _ = fetch(i)
+        return data is not None, time.perf_counter() - start
+
+    server.reset_stats()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies: List[float] = [latency for _, latency in results]
+    return {
+        'fetches': requests,
+        'failed': sum(1 for ok, _ in results if not ok),
+        'throughput_per_s': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'amplification': round(server.total_requests() / requests, 3),
+    }
+
+
+def run_batch_load(weather: WeatherModel, cities: List[str], concurrency: int,
+                   server: StubApiServer) -> Dict[str, float]:
+    """Fetch `cities` with one fetch_many call; a city's latency is the time until its result is yielded."""
+    server.reset_stats()
+    start = time.perf_counter()
+    results = [(data is not None, time.perf_counter() - start)
+               for _, data, _ in weather.fetch_many(cities, max_workers=concurrency)]
+    elapsed = time.perf_counter() - start
+
+    latencies: List[float] = [latency for _, latency in results]
+    return {
+        'fetches': len(cities),
+        'failed': len(cities) - sum(1 for ok, _ in results if ok),
+        'throughput_per_s': round(len(cities) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'amplification': round(server.total_requests() / len(cities), 3),
+    }
+
+
+def bench_scenario(name: str, requests: int, concurrency: int, backoff_base: float) -> List[Tuple[str, Dict]]:
+    """Run the weather and pollen loads for one scenario on its own server and transport."""
+    rows = []
+    city_ids = {f"City {i}": 7_000_000 + i for i in range(requests)}
+    tmp_dir = tempfile.mkdtemp()
+    gazetteer_path = os.path.join(tmp_dir, "city_gazetteer.csv")
+    with open(gazetteer_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(['name', 'id', 'lat', 'lon', 'country'])
+        writer.writerows([city, city_id, 0.0, 0.0, "US"] for city, city_id in city_ids.items())
+
+    with StubApiServer(StubConfig(**SCENARIOS[name]), cities=city_ids) as server:
+        transport = HttpTransport(pool_maxsize=concurrency)
+        transport.BACKOFF_BASE = backoff_base
+
+        weather = WeatherModel(api_key="stub", transport=transport, cache_ttl=None, requests_per_second=0,
+                               api_base_url=server.weather_url, gazetteer_path=None)
+        rows.append((f"{name}/weather", run_load(
+            lambda i: weather.fetch_weather_data(f"city {i}"), requests, concurrency, server)))
+
+        batched = WeatherModel(api_key="stub", transport=transport, cache_ttl=None, requests_per_second=0,
+                               api_base_url=server.weather_url, gazetteer_path=gazetteer_path)
+        rows.append((f"{name}/weather_many", run_batch_load(batched, list(city_ids), concurrency, server)))
+
+        pollen = PollenModel(api_key="stub", transport=transport, store_path=None,
+                             requests_per_second=0, api_base_url=server.pollen_url)
+        # Distinct grid cells, so every call reaches the server
+        rows.append((f"{name}/pollen", run_load(
+            lambda i: pollen.fetch_pollen_data(30 + i * 0.2, -80), requests, concurrency, server)))
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Logical fetches per model and scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel callers")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--backoff-base", type=float, default=0.01,
+                        help="Retry backoff base in seconds (production default is 1)")
+    args = parser.parse_args(argv)
+
+    columns = ['fetches', 'failed', 'throughput_per_s', 'p50_ms', 'p99_ms', 'amplification']
+    print(f"{'scenario':<26}" + "".join(f"{column:>18}" for column in columns))
+    for name in args.scenario or SCENARIOS:
+        for label, stats in bench_scenario(name, args.requests, args.concurrency, args.backoff_base):
+            print(f"{label:<26}" + "".join(f"{stats[column]:>18}" for column in columns))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from models.weather_model import WeatherModel
+from features.weather_logger import WeatherLogger
+
+
+def read_cities(path: str) -> Iterator[str]:
+    """Yield city names from a file (one per line, '#' comments and blank lines skipped); '-' reads stdin."""
+    source = sys.stdin if path == "-" else open(path)
+    try:
+        for line in source:
+            city = line.split("#", 1)[0].strip()
+            if city:
+                yield city
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values` (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class IngestReport:
+    """Counters and latencies collected during a batch ingest."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.failures: List[Tuple[str, str]] = []  # (city, reason)
+        self.succeeded = 0
+        self.elapsed = 0.0
+        self.log_error: Optional[str] = None  # Reported by the buffered logger when it is closed
+
+    @property
+    def total(self) -> int:
+        return self.succeeded + len(self.failures)
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'total': self.total,
+            'succeeded': self.succeeded,
+            'failed': len(self.failures),
+            'elapsed_s': round(self.elapsed, 3),
+            'throughput_per_s': round(self.throughput, 2),
+            'p50_ms': round(percentile(self.latencies, 50) * 1000, 1),
+            'p90_ms': round(percentile(self.latencies, 90) * 1000, 1),
+            'p99_ms': round(percentile(self.latencies, 99) * 1000, 1),
+            'max_ms': round(max(self.latencies, default=0.0) * 1000, 1),
+        }
+
+    def write(self, out: TextIO):
+        stats = self.summary()
+        out.write(f"Ingested {stats['succeeded']}/{stats['total']} cities in {stats['elapsed_s']}s "
+                  f"({stats['throughput_per_s']} cities/s)\n")
+        out.write(f"Latency p50 {stats['p50_ms']} ms, p90 {stats['p90_ms']} ms, "
+                  f"p99 {stats['p99_ms']} ms, max {stats['max_ms']} ms\n")
+        if self.log_error:
+            out.write(f"Log file error: {self.log_error}\n")
+        if self.failures:
+            out.write(f"{len(self.failures)} failures:\n")
+            for city, reason in self.failures:
+                out.write(f"  {city}: {reason}\n")
+
+
+def ingest(cities: Iterable[str], weather_model: WeatherModel, weather_logger: WeatherLogger,
+           concurrency: int = 8) -> IngestReport:
+    """
+    Streams cities through WeatherModel.fetch_many on `concurrency` worker threads and logs every result.
+
+    Cities are read in chunks of 2 * concurrency * GROUP_SIZE, so arbitrarily long city lists
+    are processed in constant memory while each chunk still fills every worker with a group
+    request for the cities the gazetteer knows. A city listed twice within a chunk is fetched
+    and logged once. The latency of a city is the time from the start of its chunk until its
+    result arrives. Results are logged from the calling thread.
+
+    Returns:
+        IngestReport with throughput, per-city latencies and failures
+    """
+    report = IngestReport()
+    chunk_size = 2 * concurrency * WeatherModel.GROUP_SIZE
+    cities = iter(cities)
+    start = time.perf_counter()
+
+    while True:
+        chunk = list(islice(cities, chunk_size))
+        if not chunk:
+            break
+        chunk_start = time.perf_counter()
+        for city, weather_data, source_info in weather_model.fetch_many(chunk, max_workers=concurrency):
+            report.latencies.append(time.perf_counter() - chunk_start)
+            if weather_data is None:
+                report.failures.append((city, source_info))
+                continue
+            log_error = weather_logger.log_weather_data(city, weather_data, source_info)
+            if log_error:
+                report.failures.append((city, log_error))
+            else:
+                report.succeeded += 1
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def run_ingest(args) -> int:
+    """Entry point for `python app.py ingest`. Returns the process exit code (1 if any city or log write failed)."""
+    weather_model = WeatherModel(max_workers=args.concurrency, requests_per_second=args.rate)
+    weather_logger = WeatherLogger(args.log_file, buffered=True, flush_every=500, fsync=args.fsync)
+    report = ingest(read_cities(args.cities), weather_model, weather_logger, args.concurrency)
+    report.log_error = weather_logger.close()
+    report.write(sys.stdout)
+    return 1 if report.failures or report.log_error else 0
@@ -0,0 +1,92 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+
+class RefreshPipeline:
+    """Runs fetch jobs on worker threads and hands their results back to the GUI thread.
+
+    Work is grouped into channels (e.g. "dashboard" and "search"). Submitting to a channel
+    supersedes whatever that channel was doing: queued jobs are cancelled and results of
+    jobs already running are dropped, so only the newest request ever reaches the view.
+    """
+
+    def __init__(self, dispatch: Callable[[Callable[[], None]], None], max_workers: int = 4):
+        """
+        Args:
+            dispatch: Schedules a callable on the GUI thread, e.g. lambda fn: main_window.after(0, fn)
+            max_workers: Number of worker threads shared by all channels
+        """
+        self.dispatch = dispatch
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refresh")
+        self._generations: Dict[str, int] = {}
+        self._futures: Dict[str, List[Future]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, channel: str, jobs: Dict[str, Callable[[], Any]],
+               on_done: Callable[[Dict[str, Any]], None]) -> int:
+        """
+        Runs every job in parallel and calls on_done({name: result}) on the GUI thread
+        once all of them have finished, unless a newer submit to the channel arrived first.
+
+        Returns:
+            The generation number of this request
+        """
+        results: Dict[str, Any] = {}
+        remaining = [len(jobs)]
+
+        with self._lock:
+            generation = self._generations.get(channel, 0) + 1
+            self._generations[channel] = generation
+            for future in self._futures.pop(channel, []):
+                future.cancel()
+
+            futures = {name: self.executor.submit(self._run_job, job) for name, job in jobs.items()}
+            self._futures[channel] = list(futures.values())
+
+        # Registered outside the lock: a job that has already finished runs its callback right here
+        for name, future in futures.items():
+            future.add_done_callback(
+                lambda f, name=name: self._job_finished(channel, generation, name, f,
+                                                        results, remaining, on_done))
+        return generation
+
+    @staticmethod
+    def _run_job(job: Callable[[], Any]) -> Any:
+        try:
+            return job()
+        except Exception as e:
+            # Models report failures as (None, message); keep that contract for unexpected errors too
+            return None, f"Unexpected error: {e}"
+
+    def _job_finished(self, channel: str, generation: int, name: str, future: Future,
+                      results: Dict[str, Any], remaining: List[int],
+                      on_done: Callable[[Dict[str, Any]], None]):
+        if future.cancelled():
+            return
+        with self._lock:
+            results[name] = future.result()
+            remaining[0] -= 1
+            if remaining[0] > 0 or self._generations.get(channel) != generation:
+                return
+            self._futures.pop(channel, None)
+        self.dispatch(lambda: self._deliver(channel, generation, results, on_done))
+
+    def _deliver(self, channel: str, generation: int, results: Dict[str, Any],
+                 on_done: Callable[[Dict[str, Any]], None]):
+        # Checked again on the GUI thread: a newer request may have been submitted meanwhile
+        if self.is_current(channel, generation):
+            on_done(results)
+
+    def is_current(self, channel: str, generation: int) -> bool:
+        with self._lock:
+            return self._generations.get(channel) == generation
+
+    def is_busy(self, channel: str) -> bool:
+        """True while a request on the channel is still running."""
+        with self._lock:
+            return channel in self._futures
+
+    def shutdown(self):
+        """Cancel queued jobs and stop accepting new ones (running jobs finish in the background)."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
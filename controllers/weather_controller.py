@@ -1,55 +1,133 @@
 import sys
 import os
+import re
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.weather_model import WeatherModel
 from models.pollen_model import PollenModel
+from models.http_transport import deadline_in
 from features.weather_logger import WeatherLogger
+from features.prefetch_scheduler import PrefetchScheduler
+from features.city_index import CityPrefixIndex
+from controllers.refresh_pipeline import RefreshPipeline
 from views.dashboard_view import WeatherView
 
+# Letters separated by spaces, periods, commas, apostrophes or hyphens (e.g. "St. John's", "Winston-Salem")
+CITY_NAME_PATTERN = re.compile(r"[^\W\d_]+(?:[ .,'\-]+[^\W\d_]+)*\.?")
+
 
 class WeatherController:
     """Controller class that coordinates between the models (data layer) and view (Tkinter GUI)."""
+
+    REFRESH_BUDGET = 20  # Seconds a refresh or search may spend on the network, retries included
     
     def __init__(self):
         # Initialize models and logger
         self.weather_model = WeatherModel()
         self.pollen_model = PollenModel()
-        self.weather_logger = WeatherLogger()
+        # Log writes happen off the GUI thread; the ring keeps recent days for quick lookups
+        self.weather_logger = WeatherLogger(buffered=True, ring_file="data/recent_readings.ring")
         
-        # Initialize view with callback
-        self.weather_view = WeatherView(self.handle_data_refresh_request)
+        # Initialize view with callback (a button press asks for the "refreshed" confirmation)
+        self.weather_view = WeatherView(lambda: self.handle_data_refresh_request(notify=True))
         
         # Set controller reference in view for search functionality
         self.weather_view.set_controller(self)
 
+        # Network calls run on worker threads; results are marshalled back with main_window.after
+        self.refresh_pipeline = RefreshPipeline(lambda callback: self.weather_view.main_window.after(0, callback))
+
+        # Warm the weather cache for frequently searched cities in the background
+        self.prefetch_scheduler = PrefetchScheduler(self.weather_model, self.weather_logger.log_file)
+
+        # Typeahead over every known city, weighted by how often (and how recently) it was looked up
+        self.city_index = CityPrefixIndex.from_gazetteer(self.weather_model.gazetteer,
+                                                         dict(self.prefetch_scheduler.rank_cities()))
+        self.unknown_cities = set()  # Names the API answered with 404 during this session
+
         # Load initial data for Atlanta
         self.load_atlanta_data()
+        self.start_prefetch()
         
         # Start the application
-        self.weather_view.run()
+        try:
+            self.weather_view.run()
+        finally:
+            self.stop_prefetch()
+            self.refresh_pipeline.shutdown()
+            self.weather_logger.close()
     
+    def start_prefetch(self, interval=None, budget=None):
+        """
+        Start (or reconfigure) background prefetching of frequently searched cities.
+
+        Args:
+            interval (float, optional): Seconds between prefetch cycles
+            budget (int, optional): Maximum API requests per cycle
+        """
+        if interval is not None:
+            self.prefetch_scheduler.interval = interval
+        if budget is not None:
+            self.prefetch_scheduler.budget = budget
+        self.prefetch_scheduler.resume()
+        self.prefetch_scheduler.start()
+
+    def pause_prefetch(self, seconds=None):
+        """Pause background prefetching for `seconds`, or until start_prefetch() is called again."""
+        self.prefetch_scheduler.pause(seconds)
+
+    def stop_prefetch(self):
+        """Stop the background prefetch thread."""
+        self.prefetch_scheduler.stop()
+
     def load_atlanta_data(self):
         """Load weather and pollen data for Atlanta, GA on startup."""
         self.handle_data_refresh_request()
+
+    def _pollen_for_city(self, city_name: str, deadline: float):
+        """Fetch pollen at a city's coordinates, resolved through the (cached, single-flight) weather lookup."""
+        weather_data, _ = self.weather_model.fetch_weather_data(city_name, deadline)
+        if weather_data:
+            return self.pollen_model.fetch_pollen_data(weather_data.get('lat'), weather_data.get('lon'), deadline)
+        # Fall back to Atlanta if the weather lookup failed
+        return self.pollen_model.fetch_pollen_data(deadline=deadline)
     
-    def handle_data_refresh_request(self, city_name=None):
+    def handle_data_refresh_request(self, city_name=None, notify=False):
         """
         Handles the data refresh request from the view.
-        Fetches both weather and pollen data for the specified city or Atlanta as default.
+        Fetches weather and pollen data for the specified city or Atlanta as default
+        in parallel on worker threads; the dashboard is updated when both have finished.
+        A newer refresh supersedes one that is still in progress, and all retries
+        together are cut off after REFRESH_BUDGET seconds.
         
         Args:
             city_name (str, optional): Name of city to fetch data for. Defaults to "Atlanta".
+            notify (bool): Show the "Data has been refreshed" confirmation when done.
         """
         # Use provided city name or default to Atlanta
         target_city = city_name if city_name else "Atlanta"
-        
-        # Fetch weather data for the target city
-        weather_data, weather_source = self.weather_model.fetch_weather_data(target_city)
-        
-        # Fetch pollen data (keeping Atlanta as default since pollen model might be location-specific)
-        # You may want to modify this if your pollen model supports other cities
-        pollen_data, pollen_source = self.pollen_model.fetch_pollen_data()
+        deadline = deadline_in(self.REFRESH_BUDGET)
+
+        if city_name:
+            pollen_job = lambda: self._pollen_for_city(target_city, deadline)
+        else:
+            # Atlanta's coordinates are known, so pollen does not wait for the weather lookup
+            pollen_job = lambda: self.pollen_model.fetch_pollen_data(deadline=deadline)
+
+        self.weather_view.show_loading()
+        self.refresh_pipeline.submit(
+            "dashboard",
+            {
+                'weather': lambda: self.weather_model.fetch_weather_data(target_city, deadline),
+                'pollen': pollen_job,
+            },
+            lambda results: self._apply_refresh(target_city, results, notify)
+        )
+
+    def _apply_refresh(self, target_city, results, notify):
+        """Show the results of a dashboard refresh (runs on the Tk main thread)."""
+        weather_data, weather_source = results['weather']
+        pollen_data, pollen_source = results['pollen']
         
         # Handle weather API errors
         if weather_data is None:
@@ -70,11 +148,19 @@ class WeatherController:
             log_error = self.weather_logger.log_weather_data(target_city, weather_data, weather_source)
             if log_error:
                     self.weather_view.show_warning("File Write Error", log_error)
+
+        if notify and weather_data:
+            self.weather_view.show_refresh()
     
+    def suggest_cities(self, prefix):
+        """Typeahead suggestions for the search tab (answered from memory, never the network)."""
+        return self.city_index.suggest(prefix)
+
     def handle_search_request(self, city_name):
         """
         Handle search requests from the search view.
         This updates ONLY the search tab, not the dashboard.
+        The lookup runs on a worker thread; searching again cancels a lookup still in progress.
         
         Args:
             city_name (str): Name of city to search for weather data
@@ -82,23 +168,52 @@ class WeatherController:
         if not city_name or not city_name.strip():
             self.weather_view.show_error("Invalid Input", "Please enter a valid city name.")
             return
+
+        city_name = city_name.strip()
+        if not CITY_NAME_PATTERN.fullmatch(city_name):
+            self.weather_view.show_error("Invalid Input", f"'{city_name}' is not a valid city name.")
+            return
+
+        # Catch typos before they cost an API round-trip
+        if city_name not in self.city_index:
+            suggestion = self.city_index.closest(city_name)
+            if suggestion and self.weather_view.ask_yes_no("City Not Found", f"Did you mean {suggestion}?"):
+                city_name = suggestion
+            elif self.weather_model.normalize_city_name(city_name) in self.unknown_cities:
+                self.weather_view.show_error("City Not Found", f"No weather data is available for '{city_name}'.")
+                return
+
+        deadline = deadline_in(self.REFRESH_BUDGET)
+        self.weather_view.show_search_loading(city_name)
         
         # Fetch weather data for the searched city
-        weather_data, weather_source = self.weather_model.fetch_weather_data(city_name.strip())
+        self.refresh_pipeline.submit(
+            "search",
+            {'weather': lambda: self.weather_model.fetch_weather_data(city_name, deadline)},
+            lambda results: self._apply_search(city_name, results)
+        )
+
+    def _apply_search(self, city_name, results):
+        """Show the result of a search (runs on the Tk main thread)."""
+        weather_data, weather_source = results['weather']
         
         # Handle weather API errors
         if weather_data is None:
             if "404" in weather_source:
+                self.unknown_cities.add(self.weather_model.normalize_city_name(city_name))
                 self.weather_view.show_error("Weather Network Error", f"Could not connect to weather service. {weather_source}")
             else:
                 self.weather_view.show_error("Weather Error", f"Weather error occurred: {weather_source}")
+        else:
+            # Offer the city in the typeahead from now on
+            self.city_index.add(city_name)
         
         # Update ONLY the search display (not the main dashboard)
         self.weather_view.update_search_display(weather_data, weather_source)
         
         # Log the weather data (if available)
         if weather_data:
-            log_error = self.weather_logger.log_weather_data(city_name.strip(), weather_data, weather_source)
+            log_error = self.weather_logger.log_weather_data(city_name, weather_data, weather_source)
             if log_error:
                 self.weather_view.show_warning("File Write Error", log_error)
                 
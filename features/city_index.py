@@ -0,0 +1,96 @@
+import difflib
+import heapq
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models.city_gazetteer import normalize_city_name
+
+
+class CityPrefixIndex:
+    """In-memory typeahead index over city names, ranked by weight (e.g. search frequency).
+
+    Normalized names are kept in a sorted array, so the cities starting with a prefix
+    are one contiguous slice found with bisect. One- and two-letter prefixes match large
+    slices, so their top suggestions are precomputed; longer prefixes are ranked on the fly.
+    """
+
+    MAX_SUGGESTIONS = 10
+    PRECOMPUTED_PREFIX_LENGTH = 2
+
+    def __init__(self, cities: Iterable[Tuple[str, float]] = ()):
+        """
+        Args:
+            cities: (display_name, weight) pairs; duplicate names keep the highest weight
+        """
+        merged: Dict[str, Tuple[str, float]] = {}
+        for name, weight in cities:
+            key = normalize_city_name(name)
+            if key and (key not in merged or weight > merged[key][1]):
+                merged[key] = (name.strip(), weight)
+
+        self._keys: List[str] = sorted(merged)
+        self._names: Dict[str, str] = {key: name for key, (name, _) in merged.items()}
+        self._weights: Dict[str, float] = {key: weight for key, (_, weight) in merged.items()}
+        self._top: Dict[str, List[str]] = {}  # Short prefix -> heaviest keys
+        self._precompute({key[:length] for key in self._keys
+                          for length in range(1, self.PRECOMPUTED_PREFIX_LENGTH + 1)})
+
+    @classmethod
+    def from_gazetteer(cls, gazetteer, weights: Optional[Dict[str, float]] = None) -> "CityPrefixIndex":
+        """Index every city the gazetteer knows, weighted by weights[normalized_name] (default 0)."""
+        weights = weights or {}
+        names = gazetteer.names() if gazetteer else []
+        return cls((name, weights.get(normalize_city_name(name), 0.0)) for name in names)
+
+    def _rank(self, prefix: str, limit: int) -> List[str]:
+        """The `limit` heaviest keys starting with `prefix` (ties alphabetical)."""
+        keys = self._keys[bisect_left(self._keys, prefix):bisect_left(self._keys, prefix + "\uffff")]
+        return heapq.nsmallest(limit, keys, key=lambda key: (-self._weights[key], key))
+
+    def _precompute(self, prefixes: Iterable[str]):
+        for prefix in prefixes:
+            self._top[prefix] = self._rank(prefix, self.MAX_SUGGESTIONS)
+
+    def suggest(self, prefix: str, limit: int = MAX_SUGGESTIONS) -> List[str]:
+        """Display names starting with `prefix`, heaviest first."""
+        key = normalize_city_name(prefix)
+        if not key:
+            return []
+        if len(key) <= self.PRECOMPUTED_PREFIX_LENGTH and limit <= self.MAX_SUGGESTIONS:
+            keys = self._top.get(key, [])[:limit]
+        else:
+            keys = self._rank(key, limit)
+        return [self._names[k] for k in keys]
+
+    def __contains__(self, city_name: str) -> bool:
+        return normalize_city_name(city_name) in self._names
+
+    def closest(self, city_name: str, cutoff: float = 0.8) -> Optional[str]:
+        """
+        Best near-miss spelling among names sharing the first letter (for "Did you mean ...?").
+
+        Returns:
+            Display name of the closest known city, or None if nothing is similar enough
+        """
+        key = normalize_city_name(city_name)
+        if not key:
+            return None
+        candidates = self._keys[bisect_left(self._keys, key[0]):bisect_left(self._keys, key[0] + "\uffff")]
+        matches = difflib.get_close_matches(key, candidates, n=1, cutoff=cutoff)
+        return self._names[matches[0]] if matches else None
+
+    def add(self, city_name: str, weight: float = 1.0):
+        """Insert a city (or raise its weight) and refresh the precomputed suggestions it affects."""
+        key = normalize_city_name(city_name)
+        if not key:
+            return
+        if key in self._names:
+            self._weights[key] = max(self._weights[key], weight)
+        else:
+            insort(self._keys, key)
+            self._names[key] = city_name.strip()
+            self._weights[key] = weight
+        self._precompute(key[:length] for length in range(1, self.PRECOMPUTED_PREFIX_LENGTH + 1))
+
+    def __len__(self) -> int:
+        return len(self._keys)
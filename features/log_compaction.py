@@ -0,0 +1,310 @@
+import os
+import sqlite3
+import threading # The GUI, the prefetch thread and maintenance jobs may refresh the same rollups.
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from features.log_index import DateLike, parse_log_line
+from features.log_lock import log_lock
+from models.city_gazetteer import normalize_city_name
+
+
+def _iso(value: DateLike) -> str:
+    return (date.fromisoformat(value.strip()) if isinstance(value, str) else value).isoformat()
+
+
+class DailyRollups:
+    """Per-(date, city) sample count and min/max/mean of temperature and humidity over the weather log.
+
+    The rollups and the byte offset of the log they cover live in SQLite, next to the log.
+    refresh() reads only the lines appended since the last refresh and upserts one row per
+    (date, city) touched, so keeping the rollups current costs O(new rows). Each refresh is
+    a single transaction, so processes sharing the log never double-count a line.
+
+    Jobs that rewrite the log (compaction, archiving) go through rewrite_log(), which folds
+    every line into the rollups first and then rebases the offset onto the new file. That
+    way rollups keep counting rows that were deduplicated or moved out of the log. If the
+    log is replaced any other way, the rollups are rebuilt from the new file.
+    """
+
+    def __init__(self, log_file: str = "data/weather_log.csv", db_path: Optional[str] = None):
+        self.log_file = log_file
+        self.db_path = db_path or os.path.splitext(log_file)[0] + "_rollups.db"
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS weather_daily (
+                   date TEXT NOT NULL,
+                   city_key TEXT NOT NULL,
+                   city TEXT NOT NULL,
+                   samples INTEGER NOT NULL,
+                   temp_min REAL NOT NULL,
+                   temp_max REAL NOT NULL,
+                   temp_sum REAL NOT NULL,
+                   humidity_min INTEGER NOT NULL,
+                   humidity_max INTEGER NOT NULL,
+                   humidity_sum INTEGER NOT NULL,
+                   PRIMARY KEY (date, city_key)
+               )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS weather_daily_city ON weather_daily (city_key, date)")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS log_position (
+                   id INTEGER PRIMARY KEY CHECK (id = 0),
+                   dev INTEGER NOT NULL,
+                   ino INTEGER NOT NULL,
+                   offset INTEGER NOT NULL
+               )"""
+        )
+
+    def _position(self) -> Tuple[Optional[Tuple[int, int]], int]:
+        row = self._conn.execute("SELECT dev, ino, offset FROM log_position WHERE id = 0").fetchone()
+        return ((row[0], row[1]), row[2]) if row else (None, 0)
+
+    def _set_position(self, file_id: Tuple[int, int], offset: int):
+        self._conn.execute("INSERT OR REPLACE INTO log_position VALUES (0, ?, ?, ?)", (*file_id, offset))
+
+    @property
+    def version(self) -> Tuple:
+        """Changes whenever lines are folded in or the log is rewritten, for callers that cache derived data."""
+        with self._lock:
+            return self._position()
+
+    def refresh(self, upto: Optional[int] = None) -> int:
+        """
+        Folds the log lines appended since the last refresh into the rollups.
+
+        Args:
+            upto: Stop at this byte offset instead of the end of the file
+
+        Returns:
+            Number of rows added
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")  # Also serializes refreshes from other processes
+            try:
+                added = self._fold(upto)
+                self._conn.execute("COMMIT")
+                return added
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _fold(self, upto: Optional[int]) -> int:
+        try:
+            stat = os.stat(self.log_file)
+        except OSError:
+            return 0
+        file_id, offset = self._position()
+        if (stat.st_dev, stat.st_ino) != file_id or stat.st_size < offset:
+            if file_id is not None:
+                # Replaced behind our back: rebuild from the new file
+                self._conn.execute("DELETE FROM weather_daily")
+            file_id, offset = (stat.st_dev, stat.st_ino), 0
+            self._set_position(file_id, offset)
+        end = min(stat.st_size, upto) if upto is not None else stat.st_size
+        if end <= offset:
+            return 0
+
+        with open(self.log_file, "rb") as f:
+            f.seek(offset)
+            chunk = f.read(end - offset)
+        complete = chunk.rfind(b"\n") + 1  # Only complete lines
+        days: Dict[Tuple[str, str], List] = {}
+        added = 0
+        for raw in chunk[:complete].splitlines():
+            entry = parse_log_line(raw.decode("utf-8", errors="replace"))
+            if entry is None:
+                continue
+            temp, humidity = entry['temp'], entry['humidity']
+            key = (entry['date'].isoformat(), normalize_city_name(entry['city']))
+            row = days.get(key)
+            if row is None:
+                days[key] = [entry['city'], 1, temp, temp, temp, humidity, humidity, humidity]
+            else:
+                row[1] += 1
+                row[2] = min(row[2], temp)
+                row[3] = max(row[3], temp)
+                row[4] += temp
+                row[5] = min(row[5], humidity)
+                row[6] = max(row[6], humidity)
+                row[7] += humidity
+            added += 1
+
+        self._conn.executemany(
+            """INSERT INTO weather_daily VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (date, city_key) DO UPDATE SET
+                   samples = samples + excluded.samples,
+                   temp_min = MIN(temp_min, excluded.temp_min),
+                   temp_max = MAX(temp_max, excluded.temp_max),
+                   temp_sum = temp_sum + excluded.temp_sum,
+                   humidity_min = MIN(humidity_min, excluded.humidity_min),
+                   humidity_max = MAX(humidity_max, excluded.humidity_max),
+                   humidity_sum = humidity_sum + excluded.humidity_sum""",
+            [(day, key, *row) for (day, key), row in days.items()]
+        )
+        self._set_position(file_id, offset + complete)
+        return added
+
+    def replace_log(self, read_size: int, write_log: Callable[[], int]):
+        """
+        Runs a log rewrite inside one rollups transaction.
+
+        Every line up to `read_size` is folded in first; write_log() then replaces the log and
+        returns how many leading bytes of the new file are already counted. No other refresh
+        can run in between and mistake the new file for an unknown replacement.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._fold(read_size)
+                kept_size = write_log()
+                stat = os.stat(self.log_file)
+                self._set_position((stat.st_dev, stat.st_ino), kept_size)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def samples(self) -> List[Tuple[date, str, int]]:
+        """(date, normalized_city_name, sample_count) for every rolled-up day, as of the last refresh."""
+        with self._lock:
+            rows = self._conn.execute("SELECT date, city_key, samples FROM weather_daily").fetchall()
+        return [(date.fromisoformat(day), key, count) for day, key, count in rows]
+
+    def daily(self, city: Optional[str] = None, start: Optional[DateLike] = None,
+              end: Optional[DateLike] = None) -> pd.DataFrame:
+        """
+        Daily summaries for charts, after folding in any new log lines.
+
+        Args:
+            city: Only this city (any capitalization/spacing), default all cities
+            start: First date to include (date or 'YYYY-MM-DD')
+            end: Last date to include
+
+        Returns:
+            DataFrame sorted by date and city with columns date, city, samples, temp_min, temp_max,
+            temp_mean, humidity_min, humidity_max and humidity_mean
+        """
+        self.refresh()
+        conditions, params = [], []
+        if city is not None:
+            conditions.append("city_key = ?")
+            params.append(normalize_city_name(city))
+        if start is not None:
+            conditions.append("date >= ?")
+            params.append(_iso(start))
+        if end is not None:
+            conditions.append("date <= ?")
+            params.append(_iso(end))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            frame = pd.read_sql_query(
+                f"""SELECT date, city, samples, temp_min, temp_max, temp_sum * 1.0 / samples AS temp_mean,
+                           humidity_min, humidity_max, humidity_sum * 1.0 / samples AS humidity_mean
+                    FROM weather_daily {where} ORDER BY date, city_key""",
+                self._conn, params=params
+            )
+        frame['date'] = pd.to_datetime(frame['date'])
+        return frame
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class LogChangedError(Exception):
+    """The log was replaced or truncated between reading it and rewriting it."""
+
+
+def read_log_lines(log_file: str) -> Tuple[List[bytes], int, Optional[Tuple[int, int]]]:
+    """
+    Reads the complete lines of the log (a half-written last line is left for the writer to finish).
+
+    Returns:
+        (lines with their newlines, byte size they cover, (st_dev, st_ino) of the file read);
+        ([], 0, None) if the log does not exist
+    """
+    try:
+        with open(log_file, "rb") as f:
+            stat = os.fstat(f.fileno())
+            content = f.read()
+    except FileNotFoundError:
+        return [], 0, None
+    size = content.rfind(b"\n") + 1
+    return content[:size].splitlines(keepends=True), size, (stat.st_dev, stat.st_ino)
+
+
+def rewrite_log(log_file: str, kept: List[bytes], read_size: int, file_id: Optional[Tuple[int, int]],
+                rollups: Optional[DailyRollups] = None) -> bool:
+    """
+    Replaces the log with `kept` followed by whatever was appended after the first `read_size` bytes.
+
+    The copy and the replace happen under log_lock, so no writer can append in between and lose
+    its line to the old file. `file_id` is the identity read_log_lines() reported; if another job
+    replaced or truncated the log since, nothing is written, because `read_size` no longer marks
+    the end of what was read. With rollups, every line up to `read_size` is folded in before the
+    rewrite and the offset is rebased afterwards, so dropped or moved rows still count and the
+    copied tail is counted once.
+
+    Returns:
+        False if the log changed since it was read (read it again and retry), True otherwise
+    """
+    def write_log() -> int:
+        tmp_path = log_file + ".tmp"
+        with log_lock(log_file):
+            try:
+                stat = os.stat(log_file)
+            except FileNotFoundError:
+                raise LogChangedError(log_file)
+            if (stat.st_dev, stat.st_ino) != file_id or stat.st_size < read_size:
+                raise LogChangedError(log_file)
+            with open(tmp_path, "wb") as out:
+                out.writelines(kept)
+                kept_size = out.tell()
+                with open(log_file, "rb") as f:
+                    f.seek(read_size)
+                    out.write(f.read())
+            os.replace(tmp_path, log_file)
+        return kept_size
+
+    try:
+        if rollups is None:
+            write_log()
+        else:
+            rollups.replace_log(read_size, write_log)  # Rolled back if the log changed
+    except LogChangedError:
+        return False
+    return True
+
+
+def compact_log(log_file: str, rollups: Optional[DailyRollups] = None) -> int:
+    """
+    Keeps only the latest line per (date, city) in the log; the header and unparsable lines stay.
+
+    Returns:
+        Number of lines dropped
+    """
+    while True:
+        lines, read_size, file_id = read_log_lines(log_file)
+        keys: List[Optional[Tuple[date, str]]] = []
+        latest: Dict[Tuple[date, str], int] = {}
+        for i, raw in enumerate(lines):
+            entry = parse_log_line(raw.decode("utf-8", errors="replace"))
+            key = (entry['date'], normalize_city_name(entry['city'])) if entry else None
+            keys.append(key)
+            if key is not None:
+                latest[key] = i
+
+        kept = [raw for i, (raw, key) in enumerate(zip(lines, keys)) if key is None or latest[key] == i]
+        dropped = len(lines) - len(kept)
+        if not dropped:
+            if rollups is not None:
+                rollups.refresh()
+            return 0
+        if rewrite_log(log_file, kept, read_size, file_id, rollups):
+            return dropped
+        # Another job rewrote the log meanwhile: start over from its result
@@ -0,0 +1,191 @@
+import os
+import threading # Queries may come from the GUI and worker threads while the log grows.
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, List, Optional, Union
+
+from models.city_gazetteer import normalize_city_name
+
+DateLike = Union[date, str]
+
+
+class _DateOffsets:
+    """Parallel arrays of date ordinals (sorted) and the byte offsets of the matching log lines."""
+
+    __slots__ = ('dates', 'offsets')
+
+    def __init__(self):
+        self.dates = array('l')
+        self.offsets = array('q')
+
+    def add(self, day: int, offset: int):
+        if not self.dates or day >= self.dates[-1]:
+            self.dates.append(day)
+            self.offsets.append(offset)
+        else:  # Out-of-order line (e.g. a backfill): keep the dates sorted
+            i = bisect_right(self.dates, day)
+            self.dates.insert(i, day)
+            self.offsets.insert(i, offset)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+def _to_ordinal(value: DateLike) -> int:
+    if isinstance(value, str):
+        value = date.fromisoformat(value.strip())
+    return value.toordinal()
+
+
+def parse_log_line(line: str) -> Optional[Dict]:
+    """
+    Parses one "date, city, temp, description, humidity, source" log line.
+    City names may themselves contain ", ", so the trailing fields are taken from the right.
+
+    Returns:
+        Dict with typed fields, or None for the header or a malformed line
+    """
+    parts = line.rstrip("\r\n").split(", ")
+    if len(parts) < 6:
+        return None
+    try:
+        return {
+            'date': date.fromisoformat(parts[0].strip()),
+            'city': ", ".join(parts[1:-4]).strip(),
+            'temp': float(parts[-4]),
+            'description': parts[-3],
+            'humidity': int(float(parts[-2])),
+            'source': parts[-1],
+        }
+    except ValueError:
+        return None
+
+
+class WeatherLogIndex:
+    """In-memory index over the weather log: byte offsets of every line by city, sorted by date.
+
+    The file is read once; refresh() then only parses the bytes appended since the last call
+    (complete lines only, so a half-written line is picked up next time). If the file shrinks
+    or is replaced (e.g. by log rotation), the index is rebuilt from scratch.
+    """
+
+    def __init__(self, log_file: str):
+        self.log_file = log_file
+        self.offset = 0  # Bytes of the file already indexed
+        self.lines_indexed = 0
+        self._file_id = None
+        self._all = _DateOffsets()
+        self._cities: Dict[str, _DateOffsets] = {}
+        self._day_cache: Dict[bytes, int] = {}
+        self._city_cache: Dict[bytes, str] = {}
+        self._lock = threading.Lock()
+
+    def _reset(self):
+        self.offset = 0
+        self.lines_indexed = 0
+        self._all = _DateOffsets()
+        self._cities = {}
+
+    def refresh(self):
+        """Index the lines appended since the last refresh."""
+        with self._lock:
+            try:
+                stat = os.stat(self.log_file)
+            except OSError:
+                self._reset()
+                return
+            file_id = (stat.st_dev, stat.st_ino)
+            if file_id != self._file_id or stat.st_size < self.offset:
+                self._reset()
+                self._file_id = file_id
+            if stat.st_size == self.offset:
+                return
+
+            with open(self.log_file, "rb") as f:
+                f.seek(self.offset)
+                chunk = f.read(stat.st_size - self.offset)
+            end = chunk.rfind(b"\n") + 1  # Only complete lines
+            position = self.offset
+            for raw in chunk[:end].splitlines(keepends=True):
+                self._index_line(raw, position)
+                position += len(raw)
+            self.offset += end
+
+    def _index_line(self, raw: bytes, offset: int):
+        parts = raw.split(b", ", 2)
+        if len(parts) < 3:
+            return
+        # Dates and city names repeat on almost every line, so their parsed forms are memoized
+        day = self._day_cache.get(parts[0])
+        if day is None:
+            try:
+                day = date.fromisoformat(parts[0].decode().strip()).toordinal()
+            except ValueError:
+                return  # Header or malformed line
+            self._day_cache[parts[0]] = day
+        if parts[2].count(b", ") > 3:
+            # The city name itself contains ", "; the last four fields are temp..source
+            entry = parse_log_line(raw.decode("utf-8", errors="replace"))
+            if entry is None:
+                return  # Malformed, e.g. two writers' lines torn into one
+            key = normalize_city_name(entry['city'])
+        else:
+            key = self._city_cache.get(parts[1])
+            if key is None:
+                key = self._city_cache[parts[1]] = normalize_city_name(parts[1].decode("utf-8", errors="replace"))
+        entries = self._cities.get(key)
+        if entries is None:
+            entries = self._cities[key] = _DateOffsets()
+        self._all.add(day, offset)
+        entries.add(day, offset)
+        self.lines_indexed += 1
+
+    def query(self, city: Optional[str] = None, start: Optional[DateLike] = None,
+              end: Optional[DateLike] = None, last: Optional[int] = None) -> List[Dict]:
+        """
+        Returns log entries in date order.
+
+        Args:
+            city: Only this city (any capitalization/spacing), default all cities
+            start: First date to include (date or 'YYYY-MM-DD')
+            end: Last date to include
+            last: Only the most recent `last` matching entries
+
+        Returns:
+            List of dicts with 'date', 'city', 'temp', 'description', 'humidity' and 'source'
+        """
+        while True:
+            self.refresh()
+            with self._lock:
+                file_id, indexed = self._file_id, self.offset
+                entries = self._all if city is None else self._cities.get(normalize_city_name(city))
+                if not entries:
+                    return []
+                lo = bisect_left(entries.dates, _to_ordinal(start)) if start is not None else 0
+                hi = bisect_right(entries.dates, _to_ordinal(end)) if end is not None else len(entries)
+                if last is not None:
+                    lo = max(lo, hi - last)
+                offsets = entries.offsets[lo:hi]
+
+            try:
+                f = open(self.log_file, "rb")
+            except FileNotFoundError:
+                continue  # Replaced between refresh and open; the next refresh resets the index
+            with f:
+                stat = os.fstat(f.fileno())
+                if (stat.st_dev, stat.st_ino) != file_id or stat.st_size < indexed:
+                    continue  # Compaction or archiving replaced the log: the offsets belong to the old file
+                results = []
+                for offset in offsets:
+                    f.seek(offset)
+                    entry = parse_log_line(f.readline().decode("utf-8", errors="replace"))
+                    if entry:
+                        results.append(entry)
+                return results
+
+    def cities(self) -> List[str]:
+        """Normalized names of every city in the log."""
+        self.refresh()
+        with self._lock:
+            return list(self._cities)
@@ -0,0 +1,64 @@
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def lock_path(log_file: str) -> str:
+    """The lock file guarding a log. It is separate from the log because rewrites replace the log's inode."""
+    return log_file + ".lock"
+
+
+@contextmanager
+def log_lock(log_file: str) -> Iterator[None]:
+    """
+    Exclusive lock on a log, across processes and threads.
+
+    Every open of the lock file gets its own lock, so threads of one process exclude each other
+    as well. Writers hold it for a single write; jobs that replace the log hold it for the rewrite.
+    """
+    fd = os.open(lock_path(log_file), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)  # Released when the descriptor is closed
+            yield
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+def append_to_log(log_file: str, data: bytes, fsync: bool = False):
+    """
+    Appends `data` (whole lines) to the log so that it never interleaves with other writers.
+
+    The data is written with O_APPEND while holding log_lock, so the critical section is one write
+    of an already formatted batch. Opening the log under the lock also guarantees the bytes land in
+    the current file, not in one that a compaction or archive job is about to replace. The optional
+    fsync happens after the lock is released so a slow disk flush does not block other writers.
+    """
+    with log_lock(log_file):
+        fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        except BaseException:
+            os.close(fd)
+            raise
+    try:
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -1,18 +1,72 @@
+import hashlib
+import json
+import os
 import pandas as pd
 import numpy as np
+import joblib
+import sklearn
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import StandardScaler
 from datetime import datetime, timedelta
+from models.pollen_risk import load_risk_table
 import warnings
 warnings.filterwarnings('ignore')
 
+
+def _folded_coefficients(scaler, model, targets):
+    """Fold the scaling into the coefficients so prediction is one matrix multiply on raw features.
+    Returns (weights of shape (features, targets), bias of shape (targets,))"""
+    coef = model.coef_.reshape(targets, -1)  # (targets, features)
+    scale = scaler.scale_
+    weights = (coef / scale).T
+    bias = np.asarray(model.intercept_, dtype=float).reshape(-1) - (scaler.mean_ / scale) @ coef.T
+    return weights, bias
+
+
+def _fit_bootstrap_members(X, Y, seeds):
+    """Fit one scaler + regression per seed on a bootstrap resample of the rows (runs in a worker).
+    Returns stacked (weights, bias) of shape (members, features, targets) and (members, targets)"""
+    weights, biases = [], []
+    for seed in seeds:
+        rows = np.random.default_rng(seed).integers(0, len(X), len(X))
+        scaler = StandardScaler().fit(X[rows])
+        model = LinearRegression().fit(scaler.transform(X[rows]), Y[rows])
+        member_weights, member_bias = _folded_coefficients(scaler, model, Y.shape[1])
+        weights.append(member_weights)
+        biases.append(member_bias)
+    return np.stack(weights), np.stack(biases)
+
+
 class PollenPredictor:
-    def __init__(self, data_path='data/merged_pollen_weather_data.csv'):
+    # Bump when the training procedure changes, so saved artifacts are retrained
+    MODEL_FORMAT = 4
+    # Percentiles of the bootstrap ensemble reported as the forecast band
+    BAND_PERCENTILES = (10, 50, 90)
+    # Days on either side of a date whose weather counts as "similar" for forecast inputs
+    CLIMATOLOGY_WINDOW = 7
+
+    def __init__(self, data_path='data/merged_pollen_weather_data.csv', model_path='data/pollen_models.joblib',
+                 risk_table_path='data/pollen_risk_thresholds.json', ensemble_size=200, n_jobs=-1, random_state=0):
         self.data_path = data_path
-        self.models = {}
-        self.scalers = {}
+        self.model_path = model_path
+        # Bootstrap ensemble for uncertainty bands, fit on n_jobs worker processes (-1 = all cores)
+        self.ensemble_size = ensemble_size
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.ensemble_weights = None
+        self.ensemble_bias = None
+        self.risk_table = load_risk_table(risk_table_path)
+        self.scaler = None
+        self.model = None
+        # Scaler folded into the regression: targets = features @ weights + bias
+        self.weights = None
+        self.bias = None
+        # Median weather per day of year (index 1-366), see build_climatology
+        self.climatology = None
         self.pollen_types = ['Count.tree_pollen', 'Count.grass_pollen', 'Count.weed_pollen']
         self.feature_columns = ['temp', 'min_temp', 'max_temp', 'precip', 'wind_spd']
+        # Extended feature set including seasonal info
+        self.feature_columns_extended = self.feature_columns + ['day_of_year', 'month']
         self.data = None
         
     def load_and_prepare_data(self):
@@ -24,135 +78,241 @@ class PollenPredictor:
         self.data['day_of_year'] = self.data['date'].dt.dayofyear
         self.data['month'] = self.data['date'].dt.month
         
-        # Extended feature set including seasonal info
-        self.feature_columns_extended = self.feature_columns + ['day_of_year', 'month']
-        
         return self.data
     
     def train_models(self):
-        """Train linear regression models for each pollen type"""
+        """Train one multi-output linear regression covering every pollen type"""
         if self.data is None:
             self.load_and_prepare_data()
         
         # Remove rows with missing values
         clean_data = self.data.dropna(subset=self.pollen_types + self.feature_columns_extended)
         
-        X = clean_data[self.feature_columns_extended]
-        
-        for pollen_type in self.pollen_types:
-            y = clean_data[pollen_type]
-            
-            # Scale features
-            scaler = StandardScaler()
-            X_scaled = scaler.fit_transform(X)
-            
-            # Train model
-            model = LinearRegression()
-            model.fit(X_scaled, y)
-            
-            # Store model and scaler
-            self.models[pollen_type] = model
-            self.scalers[pollen_type] = scaler
+        X = clean_data[self.feature_columns_extended].to_numpy(dtype=float)
+        Y = clean_data[self.pollen_types].to_numpy(dtype=float)
+        
+        # Every target shares the same features, so one scaler and one least-squares solve cover them all
+        self.scaler = StandardScaler()
+        self.model = LinearRegression()
+        self.model.fit(self.scaler.fit_transform(X), Y)
+        self._fold_scaler()
+        self.train_ensemble(X, Y)
+
+    def _fold_scaler(self):
+        self.weights, self.bias = _folded_coefficients(self.scaler, self.model, len(self.pollen_types))
+
+    def train_ensemble(self, X, Y):
+        """Fit ensemble_size regressions on bootstrap resamples of the training rows, in parallel.
+
+        Members are split into one contiguous block per worker, so each process pays the
+        startup and data transfer once. Member i always uses the i-th seed spawned from
+        random_state, so the ensemble does not depend on n_jobs"""
+        seeds = np.random.SeedSequence(self.random_state).spawn(self.ensemble_size)
+        workers = min(joblib.effective_n_jobs(self.n_jobs), self.ensemble_size)
+        blocks = joblib.Parallel(n_jobs=workers)(
+            joblib.delayed(_fit_bootstrap_members)(X, Y, chunk) for chunk in np.array_split(seeds, workers)
+        )
+        self.ensemble_weights = np.concatenate([weights for weights, _ in blocks])
+        self.ensemble_bias = np.concatenate([bias for _, bias in blocks])
+
+    def fingerprint(self):
+        """Hash of the training data file and everything else that shapes the fitted models"""
+        digest = hashlib.sha256()
+        with open(self.data_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        config = {
+            'format': self.MODEL_FORMAT,
+            'sklearn': sklearn.__version__,  # Pickled estimators are only safe to load on the same version
+            'features': self.feature_columns_extended,
+            'targets': self.pollen_types,
+            'ensemble': [self.ensemble_size, self.random_state],
+        }
+        digest.update(json.dumps(config, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def save_models(self, fingerprint=None):
+        """Write the fitted model and scaler to model_path, tagged with the data fingerprint"""
+        artifact = {
+            'fingerprint': fingerprint or self.fingerprint(),
+            'model': self.model,
+            'scaler': self.scaler,
+            'ensemble_weights': self.ensemble_weights,
+            'ensemble_bias': self.ensemble_bias,
+            'climatology': self.climatology if self.climatology is not None else self.build_climatology(),
+        }
+        directory = os.path.dirname(self.model_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.model_path + '.tmp'
+        joblib.dump(artifact, tmp_path)
+        os.replace(tmp_path, self.model_path)
+
+    def load_models(self, fingerprint=None):
+        """Load saved models if they were trained on the current data and configuration.
+        Returns True on success, False if there is no usable artifact"""
+        try:
+            artifact = joblib.load(self.model_path)
+        except Exception:
+            # Missing, truncated or written by an incompatible version: retrain instead
+            return False
+        if not isinstance(artifact, dict) or artifact.get('fingerprint') != (fingerprint or self.fingerprint()):
+            return False
+        self.model = artifact['model']
+        self.scaler = artifact['scaler']
+        self.ensemble_weights = artifact['ensemble_weights']
+        self.ensemble_bias = artifact['ensemble_bias']
+        self.climatology = artifact['climatology']
+        self._fold_scaler()
+        return True
+
+    def ensure_models(self):
+        """Load the saved models, or train and save them when the data or configuration changed.
+        Returns True if the models had to be trained"""
+        fingerprint = self.fingerprint()
+        if self.load_models(fingerprint):
+            return False
+        self.train_models()
+        try:
+            self.save_models(fingerprint)
+        except OSError:
+            pass  # Read-only data directory: keep the freshly trained models in memory
+        return True
     
-    def get_historical_weather_pattern(self, target_date):
-        """Get historical weather pattern for similar dates"""
+    def build_climatology(self):
+        """Precompute median weather for every day of year (1-366) over a window of
+        CLIMATOLOGY_WINDOW days on either side, wrapping around the year boundary"""
         if self.data is None:
             self.load_and_prepare_data()
         
-        target_day_of_year = target_date.timetuple().tm_yday
-        target_month = target_date.month
-        
-        # Find similar dates (within 7 days of the same day of year)
-        similar_dates = self.data[
-            (abs(self.data['day_of_year'] - target_day_of_year) <= 7) |
-            (abs(self.data['day_of_year'] - target_day_of_year) >= 358)  # Handle year boundary
-        ]
-        
-        if len(similar_dates) > 0:
-            # Use median values for similar dates
-            return {
-                'temp': similar_dates['temp'].median(),
-                'min_temp': similar_dates['min_temp'].median(),
-                'max_temp': similar_dates['max_temp'].median(),
-                'precip': similar_dates['precip'].median(),
-                'wind_spd': similar_dates['wind_spd'].median(),
-                'day_of_year': target_day_of_year,
-                'month': target_month
-            }
-        else:
+        days = np.arange(1, 367)
+        data_days = self.data['day_of_year'].to_numpy()
+        # (366, rows) mask of the similar dates for each day of year
+        distance = np.abs(days[:, None] - data_days[None, :])
+        window = (distance <= self.CLIMATOLOGY_WINDOW) | (distance >= 365 - self.CLIMATOLOGY_WINDOW)
+        
+        columns = {}
+        for column in self.feature_columns:
+            values = self.data[column].to_numpy(dtype=float)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)  # Days without similar dates give NaN
+                medians = np.nanmedian(np.where(window, values[None, :], np.nan), axis=1)
+                overall = np.nanmedian(values)
             # Fallback to overall medians
-            return {
-                'temp': self.data['temp'].median(),
-                'min_temp': self.data['min_temp'].median(),
-                'max_temp': self.data['max_temp'].median(),
-                'precip': self.data['precip'].median(),
-                'wind_spd': self.data['wind_spd'].median(),
-                'day_of_year': target_day_of_year,
-                'month': target_month
-            }
+            columns[column] = np.where(np.isnan(medians), overall, medians)
+        
+        self.climatology = pd.DataFrame(columns, index=pd.Index(days, name='day_of_year'))
+        return self.climatology
     
-    def predict_pollen(self, weather_data):
-        """Predict pollen counts based on weather data"""
-        if not self.models:
-            self.train_models()
+    def get_historical_weather_pattern(self, target_date):
+        """Get historical weather pattern for similar dates"""
+        if self.climatology is None:
+            self.build_climatology()
         
-        predictions = {}
+        target_day_of_year = target_date.timetuple().tm_yday
+        row = self.climatology.to_numpy()[target_day_of_year - 1]
+        
+        pattern = {column: float(value) for column, value in zip(self.feature_columns, row)}
+        pattern['day_of_year'] = target_day_of_year
+        pattern['month'] = target_date.month
+        return pattern
+    
+    def predict_batch(self, features):
+        """Predict every pollen type for many feature rows at once.
+
+        features: array-like of shape (rows, len(feature_columns_extended)) in that column order
+        Returns an array of shape (rows, len(pollen_types)), clipped at zero"""
+        if self.model is None:
+            self.ensure_models()
+        
+        predictions = np.asarray(features, dtype=float) @ self.weights + self.bias
+        
+        # Ensure non-negative predictions
+        return np.maximum(predictions, 0)
+
+    def predict_band(self, features):
+        """Ensemble percentiles (BAND_PERCENTILES) for many feature rows in one batched pass.
+
+        features: array-like of shape (rows, len(feature_columns_extended)) in that column order
+        Returns an array of shape (len(BAND_PERCENTILES), rows, len(pollen_types)), clipped at zero"""
+        if self.ensemble_weights is None:
+            self.ensure_models()
         
+        # (members, rows, targets) from one stacked multiply
+        members = np.matmul(np.asarray(features, dtype=float), self.ensemble_weights) + self.ensemble_bias[:, None, :]
+        return np.percentile(np.maximum(members, 0), self.BAND_PERCENTILES, axis=0)
+
+    def predict_pollen(self, weather_data):
+        """Predict pollen counts based on weather data"""
         # Prepare feature vector
-        features = np.array([[
-            weather_data['temp'],
-            weather_data['min_temp'],
-            weather_data['max_temp'],
-            weather_data['precip'],
-            weather_data['wind_spd'],
-            weather_data['day_of_year'],
-            weather_data['month']
-        ]])
-        
-        for pollen_type in self.pollen_types:
-            # Scale features
-            features_scaled = self.scalers[pollen_type].transform(features)
-            
-            # Make prediction
-            prediction = self.models[pollen_type].predict(features_scaled)[0]
-            
-            # Ensure non-negative prediction
-            prediction = max(0, prediction)
-            
-            predictions[pollen_type] = round(prediction, 1)
-        
-        return predictions
+        features = np.array([[weather_data[column] for column in self.feature_columns_extended]])
+        
+        counts = self.predict_batch(features)[0]
+        return {pollen_type: round(float(count), 1) for pollen_type, count in zip(self.pollen_types, counts)}
     
+    def classify_risk(self, counts, pollen_type):
+        """Vectorized get_risk_level: risk level names for an array of counts of one pollen type"""
+        return self.risk_table.classify(counts, pollen_type)
+
     def get_risk_level(self, pollen_count, pollen_type):
         """Convert pollen count to risk level based on typical thresholds"""
-        if 'tree' in pollen_type.lower():
-            if pollen_count <= 14:
-                return 'Low'
-            elif pollen_count <= 95:
-                return 'Moderate'
-            elif pollen_count <= 1499:
-                return 'High'
-            else:
-                return 'Very High'
-        elif 'grass' in pollen_type.lower():
-            if pollen_count <= 9:
-                return 'Low'
-            elif pollen_count <= 49:
-                return 'Moderate'
-            elif pollen_count <= 199:
-                return 'High'
-            else:
-                return 'Very High'
-        elif 'weed' in pollen_type.lower():
-            if pollen_count <= 9:
-                return 'Low'
-            elif pollen_count <= 49:
-                return 'Moderate'
-            elif pollen_count <= 199:
-                return 'High'
-            else:
-                return 'Very High'
-        return 'Unknown'
+        return self.classify_risk([pollen_count], pollen_type)[0]
+
+    @staticmethod
+    def display_name(pollen_type):
+        """'Count.tree_pollen' -> 'Tree Pollen'"""
+        return pollen_type.replace('Count.', '').replace('_', ' ').title()
+
+    def forecast_range(self, start, end):
+        """Pollen forecast for every date from start to end (inclusive, dates or 'YYYY-MM-DD').
+        Returns a tidy DataFrame with one row per date and pollen type and the columns
+        date, day_name, pollen_type, count, risk_level and the ensemble band p10, p50 and p90"""
+        if self.climatology is None:
+            self.build_climatology()
+        
+        dates = pd.date_range(pd.Timestamp(start), pd.Timestamp(end), freq='D')
+        day_of_year = dates.dayofyear.to_numpy()
+        
+        # Feature matrix for all dates: climatology rows plus the seasonal columns
+        climate = self.climatology.to_numpy()[day_of_year - 1]
+        seasonal = {'day_of_year': day_of_year, 'month': dates.month.to_numpy()}
+        features = np.column_stack([
+            seasonal[column] if column in seasonal else climate[:, self.feature_columns.index(column)]
+            for column in self.feature_columns_extended
+        ])
+        
+        counts = np.round(self.predict_batch(features), 1)  # (dates, pollen types)
+        band = np.round(self.predict_band(features), 1)  # (percentiles, dates, pollen types)
+        risks = np.column_stack([self.classify_risk(counts[:, i], pollen_type)
+                                 for i, pollen_type in enumerate(self.pollen_types)])
+        
+        types = len(self.pollen_types)
+        return pd.DataFrame({
+            'date': np.repeat(dates.to_numpy(), types),
+            'day_name': np.repeat(dates.day_name().to_numpy(), types),
+            'pollen_type': np.tile([self.display_name(t) for t in self.pollen_types], len(dates)),
+            'count': counts.reshape(-1),
+            'risk_level': risks.reshape(-1),
+            **{f'p{q}': values.reshape(-1) for q, values in zip(self.BAND_PERCENTILES, band)},
+        })
+
+    @staticmethod
+    def _forecast_dicts(frame):
+        """The nested dicts of get_daily_forecast, one per date in a forecast_range frame"""
+        values = ['count', 'risk_level'] + [column for column in frame.columns
+                                            if column.startswith('p') and column[1:].isdigit()]
+        forecasts = []
+        for day, rows in frame.groupby('date', sort=True):
+            forecasts.append({
+                'date': day.strftime('%Y-%m-%d'),
+                'day_name': rows['day_name'].iloc[0],
+                'predictions': {
+                    pollen_type: {column: value if column == 'risk_level' else float(value)
+                                  for column, value in zip(values, row)}
+                    for pollen_type, row in zip(rows['pollen_type'], rows[values].itertuples(index=False))
+                },
+            })
+        return forecasts
     
     def get_daily_forecast(self, target_date=None):
         """Get pollen forecast for a specific date"""
@@ -161,25 +321,7 @@ class PollenPredictor:
         elif isinstance(target_date, str):
             target_date = datetime.strptime(target_date, '%Y-%m-%d').date()
         
-        weather_data = self.get_historical_weather_pattern(target_date)
-        predictions = self.predict_pollen(weather_data)
-        
-        forecast = {
-            'date': target_date.strftime('%Y-%m-%d'),
-            'day_name': target_date.strftime('%A'),
-            'predictions': {}
-        }
-        
-        for pollen_type, count in predictions.items():
-            clean_name = pollen_type.replace('Count.', '').replace('_', ' ').title()
-            risk_level = self.get_risk_level(count, pollen_type)
-            
-            forecast['predictions'][clean_name] = {
-                'count': count,
-                'risk_level': risk_level
-            }
-        
-        return forecast
+        return self._forecast_dicts(self.forecast_range(target_date, target_date))[0]
     
     def get_three_day_forecast(self, start_date=None):
         """Get 3-day pollen forecast"""
@@ -188,14 +330,7 @@ class PollenPredictor:
             start_date = start_date + timedelta(days=1)
 
         elif isinstance(start_date, str):
-            start_date = start_date + timedelta(days=1)
             start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-            
-        forecasts = []
-        
-        for i in range(3):
-            forecast_date = start_date + timedelta(days=i)
-            forecast = self.get_daily_forecast(forecast_date)
-            forecasts.append(forecast)
+            start_date = start_date + timedelta(days=1)
         
-        return forecasts
\ No newline at end of file
+        return self._forecast_dicts(self.forecast_range(start_date, start_date + timedelta(days=2)))
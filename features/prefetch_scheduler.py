@@ -0,0 +1,117 @@
+import threading # Background prefetch thread and its stop/pause signals.
+import time
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from features.log_compaction import DailyRollups
+
+
+class PrefetchScheduler:
+    """Keeps the weather cache warm for the cities users look up most.
+
+    Every `interval` seconds the search history in the weather log's daily rollups is
+    ranked by frequency and recency (each lookup counts 0.5 ** (age_days / half_life_days)),
+    and the top cities that are not already fresh in WeatherModel's cache are fetched,
+    at most `budget` cities per cycle. When an API call reports a rate limit,
+    quota or open circuit, prefetching pauses for `rate_limit_pause` seconds so that
+    user requests keep the remaining capacity.
+    """
+
+    RATE_LIMIT_MARKERS = ("rate limited", "quota exceeded", "temporarily unavailable")
+
+    def __init__(self, weather_model, log_file: str = "data/weather_log.csv", interval: float = 300,
+                 budget: int = 10, half_life_days: float = 7, rate_limit_pause: float = 900):
+        self.weather_model = weather_model
+        self.log_file = log_file
+        self.interval = interval
+        self.budget = budget
+        self.half_life_days = half_life_days
+        self.rate_limit_pause = rate_limit_pause
+
+        self.paused_until = 0.0
+        self.rollups = DailyRollups(log_file)  # Sample counts survive log compaction and archiving
+        self._ranking: List[Tuple[str, float]] = []
+        self._ranking_version: Optional[Tuple] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def rank_cities(self, today: Optional[date] = None) -> List[Tuple[str, float]]:
+        """
+        Scores every city in the weather log, re-ranking only when new lines have been logged.
+
+        Returns:
+            List of (normalized_city_name, score) with the highest score first
+        """
+        self.rollups.refresh()
+        version = self.rollups.version
+        if version == self._ranking_version and today is None:
+            return self._ranking
+
+        today = today or datetime.now().date()
+        scores: Dict[str, float] = {}
+        for day, city, samples in self.rollups.samples():
+            age_days = max((today - day).days, 0)
+            scores[city] = scores.get(city, 0.0) + samples * 0.5 ** (age_days / self.half_life_days)
+
+        self._ranking = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        self._ranking_version = version
+        return self._ranking
+
+    def run_once(self) -> List[str]:
+        """
+        Runs one prefetch cycle (skipped while paused).
+
+        Returns:
+            Cities that were fetched from the API in this cycle
+        """
+        if self.is_paused():
+            return []
+        cache = self.weather_model.cache
+        if cache is None:
+            return []
+
+        candidates = []
+        for city, _ in self.rank_cities():
+            if len(candidates) >= self.budget:
+                break
+            if city not in cache:
+                candidates.append(city)
+
+        # fetch_many packs cities with a known ID into group requests
+        fetched = []
+        for city, weather_data, source_info in self.weather_model.fetch_many(candidates):
+            fetched.append(city)
+            if weather_data is None and any(marker in source_info for marker in self.RATE_LIMIT_MARKERS):
+                self.pause(self.rate_limit_pause)
+        return fetched
+
+    def _run(self):
+        # The first cycle waits a full interval too, so it never competes with the app's first load
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                # A broken log line or model error must not kill the background thread
+                pass
+
+    def start(self):
+        """Start prefetching on a daemon thread (no-op if already running); the first cycle runs after `interval` seconds."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="weather-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread after the current fetch."""
+        self._stop.set()
+
+    def pause(self, seconds: Optional[float] = None):
+        """Skip prefetch cycles for `seconds`, or until resume() when no duration is given."""
+        self.paused_until = time.monotonic() + seconds if seconds is not None else float("inf")
+
+    def resume(self):
+        self.paused_until = 0.0
+
+    def is_paused(self) -> bool:
+        return time.monotonic() < self.paused_until
@@ -0,0 +1,153 @@
+import mmap
+import os
+from datetime import date, datetime
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from features.log_lock import log_lock
+from models.city_gazetteer import normalize_city_name
+
+MAGIC = b"WXRING01"
+HEADER = np.dtype([('magic', 'S8'), ('days', '<u4'), ('max_cities', '<u4'), ('record_size', '<u4'), ('_pad', 'V44')])
+CITY_NAME = np.dtype('S64')  # Normalized city name, UTF-8, zero padded; empty = free slot
+RECORD = np.dtype([('date', '<M8[D]'), ('temp', '<f8'), ('humidity', '<i2'), ('description', 'S30')])
+NO_DATE = np.datetime64('NaT', 'D')
+
+
+def _as_date(value) -> date:
+    if isinstance(value, str):
+        return date.fromisoformat(value.strip())
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class RecentReadingsRing:
+    """Fixed-size binary file holding the last `days` days of readings for up to `max_cities` cities.
+
+    Layout: a 64-byte header, a directory of `max_cities` city names, then one region of
+    `days` fixed-width records per city. A reading for day d goes to slot d.toordinal() % days
+    of its city's region (a later reading on the same day replaces it), so the file never
+    grows and "the last 7 days" is 7 direct slot reads however long the CSV log gets.
+
+    The file is memory-mapped; city_days() returns a NumPy view of a city's region without
+    copying. Several processes may write the same file: claiming a directory slot for a new
+    city happens under log_lock, and record writes set the date last so a reader never sees a
+    new date with the previous day's values. When the directory is full, new cities are skipped.
+    """
+
+    def __init__(self, path: str = "data/recent_readings.ring", days: int = 32, max_cities: int = 256):
+        self.path = path
+        if not os.path.exists(path):
+            self._create(days, max_cities)
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        header = np.frombuffer(self._map, dtype=HEADER, count=1).copy()[0]
+        if header['magic'] != MAGIC or header['record_size'] != RECORD.itemsize:
+            self.close()
+            raise ValueError(f"{path} is not a recent-readings ring file")
+        # The file's own geometry wins over the arguments, so every process agrees on it
+        self.days = int(header['days'])
+        self.max_cities = int(header['max_cities'])
+        self._directory = np.frombuffer(self._map, dtype=CITY_NAME, count=self.max_cities, offset=HEADER.itemsize)
+        self._records = np.frombuffer(self._map, dtype=RECORD, count=self.max_cities * self.days,
+                                      offset=HEADER.itemsize + CITY_NAME.itemsize * self.max_cities
+                                      ).reshape(self.max_cities, self.days)
+        self._slots: Dict[bytes, int] = {}
+        self._load_directory()
+
+    def _create(self, days: int, max_cities: int):
+        with log_lock(self.path):
+            if os.path.exists(self.path):
+                return  # Another process created it first
+            header = np.zeros(1, dtype=HEADER)
+            header[0] = (MAGIC, days, max_cities, RECORD.itemsize, b"")
+            records = np.zeros(max_cities * days, dtype=RECORD)
+            records['date'] = NO_DATE
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(header.tobytes())
+                f.write(np.zeros(max_cities, dtype=CITY_NAME).tobytes())
+                f.write(records.tobytes())
+            os.replace(tmp_path, self.path)
+
+    def _load_directory(self):
+        self._slots = {bytes(name): slot for slot, name in enumerate(self._directory) if name}
+
+    def _slot(self, city_name: str, create: bool) -> Optional[int]:
+        key = normalize_city_name(city_name).encode("utf-8")[:CITY_NAME.itemsize]
+        slot = self._slots.get(key)
+        if slot is None:
+            self._load_directory()  # Another process may have added the city
+            slot = self._slots.get(key)
+        if slot is not None or not create:
+            return slot
+        with log_lock(self.path):
+            self._load_directory()
+            if key in self._slots:
+                return self._slots[key]
+            free = np.flatnonzero(self._directory == b"")
+            if not len(free):
+                return None
+            slot = int(free[0])
+            self._directory[slot] = key
+            self._slots[key] = slot
+            return slot
+
+    def record(self, city_name: str, weather_data: Mapping) -> bool:
+        """
+        Stores a reading in the slot for its day.
+
+        Returns:
+            False if the ring has no room for another city, True otherwise
+        """
+        slot = self._slot(city_name, create=True)
+        if slot is None:
+            return False
+        day = _as_date(weather_data['date'])
+        entry = self._records[slot, day.toordinal() % self.days]
+        entry['date'] = NO_DATE  # Readers skip the slot while it is being rewritten
+        entry['temp'] = weather_data['temp']
+        entry['humidity'] = weather_data['humidity']
+        entry['description'] = str(weather_data['description']).encode("utf-8")[:30]
+        entry['date'] = np.datetime64(day, 'D')
+        return True
+
+    def city_days(self, city_name: str) -> Optional[np.ndarray]:
+        """
+        Zero-copy view of a city's `days` slots, in slot (not date) order. Empty slots have date NaT,
+        and slots from more than `days` days ago hold stale readings until their day comes round again.
+
+        Returns:
+            Structured array with 'date', 'temp', 'humidity' and 'description' (bytes), or None for an unknown city
+        """
+        slot = self._slot(city_name, create=False)
+        return None if slot is None else self._records[slot]
+
+    def last_days(self, city_name: str, days: int = 7, today: Optional[date] = None) -> np.ndarray:
+        """
+        The city's readings for the `days` days up to and including `today`, oldest first.
+
+        Returns:
+            Structured array (a copy of at most `days` records); days without a reading are left out
+        """
+        region = self.city_days(city_name)
+        if region is None:
+            return np.empty(0, dtype=RECORD)
+        end = (today or datetime.now().date()).toordinal()
+        wanted = np.arange(end - min(days, self.days) + 1, end + 1)
+        picked = region[wanted % self.days]
+        valid = picked['date'] == (wanted - date(1970, 1, 1).toordinal()).astype('M8[D]')
+        return picked[valid]
+
+    def close(self):
+        for name in ('_directory', '_records'):
+            self.__dict__.pop(name, None)  # Views must go before the map can close
+        if getattr(self, '_map', None) is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # A caller still holds a city_days() view; the map goes away with it
+            self._map = None
+        self._file.close()
@@ -0,0 +1,268 @@
+import os
+import re
+import sys
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from features.log_compaction import DailyRollups, compact_log, read_log_lines, rewrite_log
+from features.log_index import DateLike, parse_log_line
+from models.city_gazetteer import normalize_city_name
+
+COLUMNS = ('date', 'temp', 'description', 'humidity', 'source')
+_STORED = ('city',) + COLUMNS
+_CATEGORICAL = ('city', 'description', 'source')  # Few distinct values: stored as codes + a value table
+
+
+def _month(day: date) -> str:
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def _to_date(value: DateLike) -> date:
+    return date.fromisoformat(value.strip()) if isinstance(value, str) else value
+
+
+def partition_name(city_name: str) -> str:
+    """File name for a city's partition: its normalized name with anything but letters/digits as '_'."""
+    return re.sub(r"[^0-9a-z]+", "_", normalize_city_name(city_name)).strip("_") or "_"
+
+
+class WeatherArchive:
+    """Columnar archive of closed weather-log days, partitioned by month and city.
+
+    Layout: <root>/<YYYY-MM>/<city>.npz, one uncompressed .npz per partition with typed
+    columns (date as datetime64[D], temp float64, humidity int16, and city/description/source
+    as uint16 codes into a small value table). np.load reads .npz members lazily, so a
+    scan only reads the partitions that can match its predicates, and only the columns
+    it asks for. Each partition is rewritten atomically (temp file + os.replace) and holds
+    at most one row per city and date: the latest reading archived for that day.
+
+    File names are sanitized city names, so different cities can share a partition
+    ("Winston-Salem" and "Winston Salem"); the per-row city column keeps them apart, with
+    one label per normalized name.
+    """
+
+    def __init__(self, root: str = "data/weather_archive"):
+        self.root = root
+
+    def _path(self, month: str, city_name: str) -> str:
+        return os.path.join(self.root, month, partition_name(city_name) + ".npz")
+
+    def partitions(self, city: Optional[str] = None, start: Optional[DateLike] = None,
+                   end: Optional[DateLike] = None) -> List[str]:
+        """Paths of the partitions that may hold rows for `city` between `start` and `end`, oldest month first."""
+        if not os.path.isdir(self.root):
+            return []
+        first = _month(_to_date(start)) if start is not None else None
+        last = _month(_to_date(end)) if end is not None else None
+        wanted = partition_name(city) + ".npz" if city is not None else None
+
+        paths = []
+        for month in sorted(os.listdir(self.root)):
+            if (first and month < first) or (last and month > last):
+                continue
+            month_dir = os.path.join(self.root, month)
+            if not os.path.isdir(month_dir):
+                continue
+            if wanted is not None:
+                if os.path.exists(os.path.join(month_dir, wanted)):
+                    paths.append(os.path.join(month_dir, wanted))
+            else:
+                paths.extend(os.path.join(month_dir, name)
+                             for name in sorted(os.listdir(month_dir)) if name.endswith(".npz"))
+        return paths
+
+    @staticmethod
+    def _read(path: str, columns: Sequence[str]) -> Dict[str, np.ndarray]:
+        with np.load(path) as partition:
+            data = {}
+            for column in columns:
+                if column == 'city' and 'city_values' not in partition.files:
+                    # Older partitions hold a single city label for every row
+                    data[column] = np.full(len(partition['date']), str(partition['city']))
+                elif column in _CATEGORICAL:
+                    data[column] = partition[column + '_values'][partition[column]]
+                else:
+                    data[column] = partition[column]
+            return data
+
+    def _write(self, path: str, data: Dict[str, np.ndarray]):
+        arrays = {}
+        for column in _STORED:
+            if column in _CATEGORICAL:
+                values, codes = np.unique(data[column].astype(str), return_inverse=True)
+                arrays[column + '_values'] = values
+                arrays[column] = codes.astype(np.uint16)
+            else:
+                arrays[column] = data[column]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    def append(self, entries: Iterable[Dict]) -> int:
+        """
+        Adds log entries (dicts as returned by parse_log_line) to their month/city partitions.
+
+        Returns:
+            Number of rows written
+        """
+        groups: Dict[Tuple[str, str], List[Dict]] = {}
+        for entry in entries:
+            key = (_month(entry['date']), partition_name(entry['city']))
+            groups.setdefault(key, []).append(entry)
+
+        for (month, _), rows in groups.items():
+            path = self._path(month, rows[0]['city'])
+            existing = self._read(path, _STORED) if os.path.exists(path) else None
+            # One label per normalized name: the one already archived, else the first one seen
+            labels = {normalize_city_name(label): label for label in existing['city']} if existing else {}
+            data = {
+                'city': np.array([labels.setdefault(normalize_city_name(row['city']), row['city']) for row in rows]),
+                'date': np.array([row['date'] for row in rows], dtype='datetime64[D]'),
+                'temp': np.array([row['temp'] for row in rows], dtype=np.float64),
+                'description': np.array([row['description'] for row in rows]),
+                'humidity': np.array([row['humidity'] for row in rows], dtype=np.int16),
+                'source': np.array([row['source'] for row in rows]),
+            }
+            if existing:
+                data = {column: np.concatenate([existing[column], data[column]]) for column in _STORED}
+            self._write(path, self._latest_per_date(data))
+        return sum(len(rows) for rows in groups.values())
+
+    @staticmethod
+    def _latest_per_date(data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Sorts by city, then date, and keeps the last row of each (city, date)
+        (rows are in log order, so the latest reading)."""
+        order = np.lexsort((data['date'], data['city']))  # Stable, so ties keep log order
+        data = {column: values[order] for column, values in data.items()}
+        cities, dates = data['city'], data['date']
+        keep = np.append((dates[1:] != dates[:-1]) | (cities[1:] != cities[:-1]), True)
+        return {column: values[keep] for column, values in data.items()}
+
+    def compact(self) -> int:
+        """
+        Drops repeated dates from partitions written before appends deduplicated them.
+
+        Returns:
+            Number of rows dropped
+        """
+        dropped = 0
+        for path in self.partitions():
+            data = self._read(path, _STORED)
+            compacted = self._latest_per_date(data)
+            if len(compacted['date']) == len(data['date']):
+                continue
+            dropped += len(data['date']) - len(compacted['date'])
+            self._write(path, compacted)
+        return dropped
+
+    def scan(self, columns: Optional[Sequence[str]] = None, city: Optional[str] = None,
+             start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> pd.DataFrame:
+        """
+        Reads archived rows, touching only the partitions and columns needed.
+
+        Args:
+            columns: Subset of 'date', 'temp', 'description', 'humidity', 'source' (default all)
+            city: Only this city (any capitalization/spacing), default all cities
+            start: First date to include (date or 'YYYY-MM-DD')
+            end: Last date to include
+
+        Returns:
+            DataFrame with a 'city' column followed by the requested columns, ordered by month, then city, then date
+        """
+        columns = list(columns or COLUMNS)
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown archive columns: {', '.join(sorted(unknown))}")
+        # The city and date columns are needed for row filtering even when they are not returned
+        read_columns = ['city'] + columns
+        if (start is not None or end is not None) and 'date' not in columns:
+            read_columns.append('date')
+        lo = np.datetime64(_to_date(start), 'D') if start is not None else None
+        hi = np.datetime64(_to_date(end), 'D') if end is not None else None
+        wanted = normalize_city_name(city) if city is not None else None
+
+        chunks: Dict[str, List[np.ndarray]] = {column: [] for column in ['city'] + columns}
+        for path in self.partitions(city, start, end):
+            data = self._read(path, read_columns)
+            keep = np.ones(len(data['city']), dtype=bool)
+            if wanted is not None:
+                # The partition may also hold other cities whose names map to the same file name
+                keep &= np.array([normalize_city_name(label) == wanted for label in data['city']], dtype=bool)
+            if lo is not None:
+                keep &= data['date'] >= lo
+            if hi is not None:
+                keep &= data['date'] <= hi
+            if keep.any():
+                for column in chunks:
+                    chunks[column].append(data[column][keep])
+
+        # One concatenation per column
+        result = pd.DataFrame({'city': pd.Categorical(np.concatenate(chunks['city']) if chunks['city'] else [])})
+        for column in columns:
+            values = np.concatenate(chunks[column]) if chunks[column] else np.array([])
+            result[column] = pd.Categorical(values) if column in _CATEGORICAL else values
+        return result
+
+
+def archive_closed_days(log_file: str, archive: WeatherArchive, today: Optional[date] = None,
+                        rollups: Optional[DailyRollups] = None) -> int:
+    """
+    Moves every log line dated before `today` into the archive and rewrites the log with the rest.
+
+    The archive is written before the log is rewritten, so an interruption can at worst leave
+    rows in both places, never in neither (and the archive keeps one row per date). Lines
+    appended to the log while the job runs are copied over before the rewritten log replaces it.
+    If another job (compaction, a second archive run) replaces the log in the meantime, the
+    log is read again and the job starts over.
+
+    Returns:
+        Number of lines archived
+    """
+    today = today or datetime.now().date()
+    while True:
+        lines, read_size, file_id = read_log_lines(log_file)
+
+        closed, kept = [], []
+        for raw in lines:
+            entry = parse_log_line(raw.decode("utf-8", errors="replace"))
+            if entry is not None and entry['date'] < today:
+                closed.append(entry)
+            else:
+                kept.append(raw)  # Header, current day, and anything unparsable stays in the log
+        if not closed:
+            return 0
+
+        archive.append(closed)
+        if rewrite_log(log_file, kept, read_size, file_id, rollups):
+            return len(closed)
+        # Another job rewrote the log meanwhile; rows archived twice collapse to one per date
+
+
+def run_archive(args) -> int:
+    """Entry point for `python app.py archive`. Returns the process exit code."""
+    archive = WeatherArchive(args.archive_dir)
+    try:
+        archived = archive_closed_days(args.log_file, archive, rollups=DailyRollups(args.log_file))
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Could not archive {args.log_file}: {e}\n")
+        return 1
+    sys.stdout.write(f"Archived {archived} lines from {args.log_file} to {args.archive_dir}\n")
+    return 0
+
+
+def run_compact(args) -> int:
+    """Entry point for `python app.py compact`. Returns the process exit code."""
+    try:
+        dropped_log = compact_log(args.log_file, DailyRollups(args.log_file))
+        dropped_archive = WeatherArchive(args.archive_dir).compact()
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Could not compact {args.log_file}: {e}\n")
+        return 1
+    sys.stdout.write(f"Dropped {dropped_log} repeated lines from {args.log_file} "
+                     f"and {dropped_archive} rows from {args.archive_dir}\n")
+    return 0
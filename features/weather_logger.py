@@ -1,30 +1,179 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import logging
+import queue
+import threading
+import time
+from datetime import date
+from features.log_index import DateLike, WeatherLogIndex
+from features.log_lock import append_to_log
+from features.recent_ring import RecentReadingsRing
 
 class WeatherLogger:
-    """Handles logging of weather data to files."""
-    
-    def __init__(self, log_file: str = "data/weather_log.csv"):
+    """Handles logging of weather data to files.
+
+    By default every call appends one line synchronously. With buffered=True lines go
+    through a bounded queue to a background writer thread, which appends them in batches:
+    after `flush_every` lines or `flush_interval` seconds, whichever comes first, with an
+    optional fsync per batch. Write errors from the thread are returned by the next call
+    to log_weather_data, flush or close.
+
+    Every write (a line, or a whole batch) is a single locked append (see append_to_log),
+    so several processes can log to the same file without interleaving partial lines.
+
+    With ring_file set, every reading is also stored in a memory-mapped RecentReadingsRing
+    right away (also in buffered mode), for constant-time recent() lookups.
+    """
+
+    _FLUSH = object()  # Queue sentinel: write the current batch now
+    _STOP = object()  # Queue sentinel: write the current batch and end the writer thread
+
+    def __init__(self, log_file: str = "data/weather_log.csv", buffered: bool = False,
+                 flush_every: int = 100, flush_interval: float = 1.0, fsync: bool = False,
+                 queue_size: int = 10000, put_timeout: float = 1.0, ring_file: Optional[str] = None):
         self.log_file = log_file
-    
+        self.buffered = buffered
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.put_timeout = put_timeout  # How long a full queue may block the caller
+        self._error: Optional[str] = None
+        self._error_lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        self._index: Optional[WeatherLogIndex] = None  # Built on the first query
+        self.ring = RecentReadingsRing(ring_file) if ring_file else None
+        if buffered:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._writer = threading.Thread(target=self._write_loop, name="weather-logger", daemon=True)
+            self._writer.start()
+
+    @staticmethod
+    def format_line(city_name: str, weather_data: Dict, source_info: str) -> str:
+        return f"{weather_data['date']}, {city_name}, {weather_data['temp']}, {weather_data['description']}, {weather_data['humidity']}, {source_info}\n"
+
     def log_weather_data(self, city_name: str, weather_data: Optional[Dict], source_info: str) -> Optional[str]:
         """
         Logs weather data to a file.
-        
+
         Args:
             city_name: Name of the city
             weather_data: Dictionary containing weather information
             source_info: Information about data source
-            
+
         Returns:
             Error message if logging failed, None if successful
+            (in buffered mode: if the buffer is full or an earlier batch failed to write)
         """
         if not weather_data:
             return "No weather data to log"
-        
+
+        line = self.format_line(city_name, weather_data, source_info)
+        if self.ring is not None:
+            try:
+                self.ring.record(city_name, weather_data)
+            except (OSError, ValueError) as e:
+                # The CSV is the record of truth; a bad ring write must not lose the line
+                logging.warning("Could not store %s in the recent readings ring: %s", city_name, e)
+        if self.buffered and self._writer.is_alive():  # After close() lines are written directly
+            try:
+                self._queue.put(line, timeout=self.put_timeout)
+            except queue.Full:
+                return "Could not save data to log file: log buffer is full"
+            return self._take_error()
+
         try:
-            with open(self.log_file, "a") as log_file:
-                log_file.write(f"{weather_data['date']}, {city_name}, {weather_data['temp']}, {weather_data['description']}, {weather_data['humidity']}, {source_info}\n")
+            append_to_log(self.log_file, line.encode("utf-8"))
             return None
         except IOError as e:
-            return f"Could not save data to log file: {e}"
\ No newline at end of file
+            return f"Could not save data to log file: {e}"
+
+    def _take_error(self) -> Optional[str]:
+        with self._error_lock:
+            error, self._error = self._error, None
+            return error
+
+    def _write_batch(self, lines: List[str]):
+        try:
+            append_to_log(self.log_file, "".join(lines).encode("utf-8"), fsync=self.fsync)
+        except IOError as e:
+            logging.error("Could not write %d weather log lines: %s", len(lines), e)
+            with self._error_lock:
+                self._error = f"Could not save data to log file: {e}"
+
+    def _write_loop(self):
+        batch: List[str] = []
+        deadline = 0.0
+        while True:
+            # Sleep until the oldest buffered line is due, or indefinitely while idle
+            timeout = max(deadline - time.monotonic(), 0) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, str):
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+                if len(batch) < self.flush_every and time.monotonic() < deadline:
+                    continue
+
+            if batch:
+                self._write_batch(batch)
+                for _ in batch:
+                    self._queue.task_done()
+                batch = []
+            if item is self._FLUSH:
+                self._queue.task_done()
+            elif item is self._STOP:
+                self._queue.task_done()
+                return
+
+    def flush(self) -> Optional[str]:
+        """Write every queued line now and wait for it. Returns a pending write error, if any."""
+        if self.buffered and self._writer.is_alive():
+            self._queue.put(self._FLUSH)
+            self._queue.join()
+        return self._take_error()
+
+    def close(self) -> Optional[str]:
+        """Drain the buffer and stop the writer thread. Returns a pending write error, if any."""
+        if self.buffered and self._writer.is_alive():
+            self._queue.put(self._STOP)
+            self._writer.join()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+        return self._take_error()
+
+    def query(self, city: Optional[str] = None, start: Optional[DateLike] = None,
+              end: Optional[DateLike] = None, last: Optional[int] = None) -> List[Dict]:
+        """
+        Reads logged observations back, e.g. query("Atlanta", last=10) or query(start="2025-07-01").
+
+        The first call indexes the log file; later calls only index newly appended lines.
+        In buffered mode, lines still waiting in the queue are not visible until written (see flush).
+
+        Args:
+            city: Only this city, default all cities
+            start: First date to include (date or 'YYYY-MM-DD')
+            end: Last date to include
+            last: Only the most recent `last` matching entries
+
+        Returns:
+            List of dicts with 'date', 'city', 'temp', 'description', 'humidity' and 'source', oldest first
+        """
+        if self._index is None:
+            self._index = WeatherLogIndex(self.log_file)
+        return self._index.query(city, start, end, last)
+
+    def recent(self, city: str, days: int = 7, today: Optional[date] = None):
+        """
+        The city's latest reading per day for the last `days` days, from the ring (requires ring_file).
+
+        Returns:
+            NumPy structured array with 'date', 'temp', 'humidity' and 'description', oldest first
+        """
+        if self.ring is None:
+            raise RuntimeError("WeatherLogger was created without a ring_file")
+        return self.ring.last_days(city, days, today)
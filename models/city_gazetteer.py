@@ -0,0 +1,130 @@
+import csv
+import os
+import threading # Lookups come from several fetch threads while new cities are learned.
+from typing import Dict, Iterable, List, Optional
+
+
+def normalize_city_name(city_name: str) -> str:
+    """Lookup key for a city: lower case with collapsed whitespace (same as WeatherModel's cache key)."""
+    return " ".join(city_name.lower().split())
+
+
+class CityRecord:
+    """A gazetteer entry; city_id/lat/lon stay None until the city has been resolved once."""
+
+    __slots__ = ('name', 'city_id', 'lat', 'lon', 'country')
+
+    def __init__(self, name: str, city_id: Optional[int] = None, lat: Optional[float] = None,
+                 lon: Optional[float] = None, country: str = ""):
+        self.name = name
+        self.city_id = city_id
+        self.lat = lat
+        self.lon = lon
+        self.country = country
+
+    def __repr__(self):
+        return f"CityRecord({self.name!r}, city_id={self.city_id}, lat={self.lat}, lon={self.lon})"
+
+
+class CityGazetteer:
+    """Offline index of city names -> OpenWeather city ID and coordinates.
+
+    Resolved cities come from the bundled file (name,id,lat,lon,country) and are learned
+    from API responses at runtime. The bundled file is never written: learned entries are
+    appended to `learned_path` (default: the bundled name with a _learned suffix, which is
+    not tracked) so later runs resolve them without a name search, and they take precedence
+    over bundled entries. Names that only appear in the seed files (the team dataset and the
+    weather log) are known but unresolved until first fetched.
+    """
+
+    FIELDS = ['name', 'id', 'lat', 'lon', 'country']
+
+    def __init__(self, path: Optional[str] = "data/city_gazetteer.csv",
+                 seed_files: Iterable[str] = ("data/team_weather_data.csv", "data/weather_log.csv"),
+                 learned_path: Optional[str] = None):
+        self.path = path
+        if learned_path is None and path:
+            learned_path = os.path.splitext(path)[0] + "_learned.csv"
+        self.learned_path = learned_path
+        self._records: Dict[str, CityRecord] = {}
+        self._by_id: Dict[int, CityRecord] = {}
+        self._lock = threading.Lock()
+
+        for seed_file in seed_files:
+            self._load_seed_names(seed_file)
+        for gazetteer_file in (path, learned_path):
+            if gazetteer_file and os.path.exists(gazetteer_file):
+                self._load_bundled(gazetteer_file)
+
+    def _load_seed_names(self, seed_file: str):
+        try:
+            with open(seed_file, newline="") as f:
+                reader = csv.DictReader(f, skipinitialspace=True)
+                for row in reader:
+                    name = (row.get('city') or "").strip()
+                    if name.lower() == 'city':  # Header row repeated inside the log
+                        continue
+                    if name and normalize_city_name(name) not in self._records:
+                        self._records[normalize_city_name(name)] = CityRecord(name)
+        except OSError:
+            pass
+
+    def _load_bundled(self, path: str):
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                try:
+                    record = CityRecord(row['name'], int(row['id']), float(row['lat']), float(row['lon']),
+                                        row.get('country') or "")
+                except (KeyError, TypeError, ValueError):
+                    continue
+                self._records[normalize_city_name(record.name)] = record
+                self._by_id[record.city_id] = record
+
+    def resolve(self, city_name: str) -> Optional[CityRecord]:
+        """Return the entry for a city name, or None if the name has never been seen."""
+        with self._lock:
+            return self._records.get(normalize_city_name(city_name))
+
+    def city_id(self, city_name: str) -> Optional[int]:
+        record = self.resolve(city_name)
+        return record.city_id if record else None
+
+    def by_id(self, city_id: int) -> Optional[CityRecord]:
+        with self._lock:
+            return self._by_id.get(city_id)
+
+    def names(self) -> List[str]:
+        """Display names of every known city."""
+        with self._lock:
+            return [record.name for record in self._records.values()]
+
+    def learn(self, city_name: str, city_id: int, lat: float, lon: float, country: str = "",
+              display_name: Optional[str] = None) -> CityRecord:
+        """Record the ID and coordinates of a city (from an API response) and persist it."""
+        key = normalize_city_name(city_name)
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None and record.city_id == city_id:
+                return record
+            name = record.name if record else (display_name or city_name)
+            record = CityRecord(name, city_id, lat, lon, country)
+            self._records[key] = record
+            self._by_id[city_id] = record
+            self._append(record)
+            return record
+
+    def _append(self, record: CityRecord):
+        if not self.learned_path:
+            return
+        try:
+            write_header = not os.path.exists(self.learned_path)
+            with open(self.learned_path, "a", newline="") as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(self.FIELDS)
+                writer.writerow([record.name, record.city_id, record.lat, record.lon, record.country])
+        except OSError:
+            pass  # The in-memory entry still works for this run
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -0,0 +1,375 @@
+import random # Jitter for retry backoff.
+import threading # Guards the shared host table, each token bucket and each circuit breaker.
+import time # For token refill, backoff delays, deadlines and quota day rollover.
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class QuotaExceededError(requests.exceptions.RequestException):
+    """Raised when an upstream host's daily request quota has been used up."""
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised when an endpoint's circuit breaker is open and the call is rejected without a request."""
+
+
+class DeadlineExceededError(requests.exceptions.RequestException):
+    """Raised when the time budget of a call runs out before a request could be sent."""
+
+
+def deadline_in(seconds: float) -> float:
+    """Absolute deadline (time.monotonic() based) `seconds` from now, for passing to fetch_json."""
+    return time.monotonic() + seconds
+
+
+class TokenBucket:
+    """Thread-safe token bucket with optional daily quota accounting.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. The lock is only
+    held while the bucket is updated; callers that must wait sleep outside of it.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, daily_quota: Optional[int] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.daily_quota = daily_quota
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.quota_day = datetime.now(timezone.utc).date()
+        self.requests_today = 0
+        self._lock = threading.Lock()
+
+    def configure(self, rate: float, capacity: float = 1.0, daily_quota: Optional[int] = None):
+        """Change the refill rate, burst size and daily quota in place."""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            self.capacity = capacity
+            self.daily_quota = daily_quota
+            self.tokens = min(self.tokens, capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        else:
+            self.tokens = self.capacity
+        self.last_refill = now
+
+        today = datetime.now(timezone.utc).date()
+        if today != self.quota_day:
+            self.quota_day = today
+            self.requests_today = 0
+
+    def try_acquire(self) -> float:
+        """
+        Takes one token without blocking.
+
+        Returns:
+            0.0 if a token was taken, otherwise the number of seconds until one is available
+
+        Raises:
+            QuotaExceededError: if the daily quota is already used up
+        """
+        with self._lock:
+            self._refill()
+            if self.daily_quota is not None and self.requests_today >= self.daily_quota:
+                raise QuotaExceededError(f"Daily quota of {self.daily_quota} requests exhausted")
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.requests_today += 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self, deadline: Optional[float] = None):
+        """
+        Waits (without holding the lock) until a token can be taken.
+
+        Raises:
+            DeadlineExceededError: if no token becomes available before `deadline`
+        """
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise DeadlineExceededError(f"rate limit wait of {wait:.1f}s exceeds the time budget")
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Thread-safe closed/open/half-open circuit breaker for one endpoint.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls are
+    rejected immediately. Once `reset_timeout` seconds have passed it is half-open:
+    a single probe request is let through, and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """
+        Admits one call, or raises if the endpoint should not be called right now.
+
+        Raises:
+            CircuitOpenError: while open, or while another half-open probe is in flight
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            retry_in = self.opened_at + self.reset_timeout - self.clock()
+            if retry_in > 0:
+                raise CircuitOpenError(f"circuit open after {self.failures} failures, retrying in {retry_in:.0f}s")
+            if self._probe_in_flight:
+                raise CircuitOpenError("circuit half-open, probe request already in flight")
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self.opened_at = self.clock()
+
+    def release(self):
+        """Give back an admitted call that was never sent (outcome unknown)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class HttpTransport:
+    """Shared HTTP layer: pooled keep-alive connections, per-host rate limits, per-endpoint
+    circuit breakers and retries bounded by a deadline.
+
+    One instance is shared by every model (see get_default_transport) so that all
+    threads reuse the same connection pool, token buckets and breakers.
+    """
+
+    MAX_RETRIES = 3
+    BACKOFF_BASE = 1  # Seconds; retry n waits a random time up to BACKOFF_BASE * 2**n ("full jitter")
+    BACKOFF_CAP = 8  # Upper bound on a single backoff delay
+    RATE_LIMIT_WAIT = 60  # Seconds to wait after an HTTP 429 without a Retry-After header
+    DEFAULT_BUDGET = 30  # Seconds a fetch_json call may take across all retries when no deadline is given
+
+    def __init__(self, pool_maxsize: int = 32, timeout: float = 10,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.timeout = timeout
+        self.session = requests.Session()  # Reuse connections & keeps connections alive
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.failure_threshold = failure_threshold  # Defaults for breakers created on first use
+        self.reset_timeout = reset_timeout
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def set_rate_limit(self, host: str, requests_per_second: float, burst: float = 1.0,
+                       daily_quota: Optional[int] = None):
+        """Configure the token bucket for an upstream host (e.g. 'api.openweathermap.org')."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                self._buckets[host] = TokenBucket(requests_per_second, burst, daily_quota)
+                return
+        bucket.configure(requests_per_second, burst, daily_quota)
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        """Return the token bucket for the host of `url`, creating a 1 req/s bucket if needed."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(1.0)
+            return bucket
+
+    @staticmethod
+    def _endpoint(url: str) -> str:
+        parts = urlsplit(url)
+        return parts.netloc + parts.path
+
+    def set_circuit_breaker(self, url: str, failure_threshold: int, reset_timeout: float):
+        """Replace the circuit breaker of the endpoint `url` (query string ignored)."""
+        with self._lock:
+            self._breakers[self._endpoint(url)] = CircuitBreaker(failure_threshold, reset_timeout)
+
+    def breaker_for(self, url: str) -> CircuitBreaker:
+        """Return the circuit breaker of the endpoint `url`, creating one with the transport defaults."""
+        endpoint = self._endpoint(url)
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    @staticmethod
+    def _is_endpoint_failure(status_code) -> bool:
+        """Only 429s and server errors count against the breaker; a 404 means the endpoint is up."""
+        return status_code == 429 or status_code in range(500, 600)
+
+    def get(self, url: str, params: Optional[Dict] = None, timeout: Optional[float] = None,
+            deadline: Optional[float] = None) -> requests.Response:
+        """
+        Rate-limited GET over the pooled session. HTTP errors are raised via raise_for_status.
+
+        Raises:
+            CircuitOpenError: the endpoint's breaker rejected the call (nothing was sent)
+            DeadlineExceededError: `deadline` passed before the request could be sent
+        """
+        breaker = self.breaker_for(url)
+        breaker.allow()
+        try:
+            self.bucket_for(url).acquire(deadline)
+            timeout = timeout or self.timeout
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DeadlineExceededError("time budget exhausted")
+                timeout = min(timeout, remaining)
+            response = self.session.get(url, params=params, timeout=timeout)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            if self._is_endpoint_failure(e.response.status_code):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except (QuotaExceededError, DeadlineExceededError):
+            breaker.release()  # Nothing was sent, so this says nothing about the endpoint
+            raise
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return response
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2 ** attempt))
+
+    def _rate_limit_wait(self, response) -> float:
+        """Seconds to wait after a 429: the Retry-After header if it holds a number, else RATE_LIMIT_WAIT."""
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (AttributeError, TypeError, ValueError):
+            return self.RATE_LIMIT_WAIT
+
+    def fetch_json(self, url: str, params: Optional[Dict], parse: Callable[[Dict], Any],
+                   label: str = "API", description: str = "data",
+                   source_info: str = "API Data", deadline: Optional[float] = None) -> Tuple[Optional[Any], str]:
+        """
+        GETs a JSON endpoint with the shared retry/backoff policy and parses the body.
+
+        Only 429s, server errors, timeouts and connection errors are retried; other 4xx
+        responses are returned at once. Retries wait a jittered exponential backoff (or the
+        server's Retry-After on a 429) and are abandoned as soon as the next attempt could
+        not start before `deadline`.
+        Calls to an endpoint whose circuit breaker is open fail immediately.
+
+        Args:
+            url: Endpoint URL
+            params: Query parameters
+            parse: Turns the decoded JSON body into the returned data; returning None
+                means the response held no usable data (not retried)
+            label: Prefix for error messages, e.g. "API" or "Pollen API"
+            description: What is being fetched, used in the final error message
+            source_info: Source string returned on success
+            deadline: time.monotonic() value by which the call must finish (see deadline_in),
+                defaults to DEFAULT_BUDGET seconds from now
+
+        Returns:
+            Tuple of (parsed_data, source_info_string)
+            parsed_data is None if fetch failed
+        """
+        max_retries = self.MAX_RETRIES
+        if deadline is None:
+            deadline = deadline_in(self.DEFAULT_BUDGET)
+
+        for attempt in range(max_retries):
+            delay = self._backoff(attempt)
+            try:
+                response = self.get(url, params=params, deadline=deadline)
+                data = parse(response.json())
+                if data is None:
+                    return None, f"No {description} available in API response"
+                return data, source_info
+
+            except QuotaExceededError as e:
+                return None, f"{label} quota exceeded: {e}"
+
+            except CircuitOpenError as e:
+                return None, f"{label} temporarily unavailable ({e})"
+
+            except DeadlineExceededError as e:
+                return None, f"Gave up fetching {description}: {e}. Last error: {source_info}"
+
+            except requests.exceptions.Timeout:
+                source_info = f"{label} request timed out (attempt {attempt + 1}/{max_retries})"
+
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code == 429:  # Rate limited
+                    delay = self._rate_limit_wait(e.response)
+                    source_info = f"{label} rate limited (attempt {attempt + 1}/{max_retries})"
+                elif e.response.status_code in range(400, 500):
+                    # The request itself is wrong (unknown city, bad key): retrying gets the same answer
+                    return None, f"{label} HTTP Error: {e.response.status_code}"
+                else:
+                    source_info = f"{label} HTTP Error: {e.response.status_code}"
+
+            except requests.exceptions.RequestException as e:
+                source_info = f"{label} network error (attempt {attempt + 1}/{max_retries}): {e}"
+
+            except Exception as e:
+                source_info = f"Unexpected {label} error (attempt {attempt + 1}/{max_retries}): {e}"
+
+            if attempt < max_retries - 1:
+                if time.monotonic() + delay >= deadline:
+                    return None, f"Gave up fetching {description}: time budget exhausted. Last error: {source_info}"
+                time.sleep(delay)
+
+        # If all attempts fail, return final error message
+        return None, f"Failed to fetch {description} after {max_retries} attempts. Last error: {source_info}"
+
+
+_default_transport: Optional[HttpTransport] = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport() -> HttpTransport:
+    """Return the process-wide transport shared by WeatherModel and PollenModel."""
+    global _default_transport
+    with _default_transport_lock:
+        if _default_transport is None:
+            _default_transport = HttpTransport()
+        return _default_transport
@@ -1,9 +1,13 @@
 import os
-import requests
+import threading
 from dotenv import load_dotenv
-from datetime import datetime, timezone
-import time
+from datetime import date, datetime, timedelta
 from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from models.http_transport import HttpTransport, get_default_transport
+from models.pollen_risk import load_risk_table
+from models.pollen_store import PollenForecastStore
+from models.records import PollenReading
 
 # Load environment variables from .env file
 load_dotenv()
@@ -11,176 +15,193 @@ load_dotenv()
 class PollenModel:
     """Model class responsible for pollen data operations and Google Pollen API interactions."""
 
-    def __init__(self, api_key: Optional[str] = None):
-        self.api_base_url = "https://pollen.googleapis.com/v1/forecast:lookup"
+    def __init__(self, api_key: Optional[str] = None, requests_per_second: float = 1.0,
+                 daily_quota: Optional[int] = None, transport: Optional[HttpTransport] = None,
+                 forecast_days: int = 5, store_path: Optional[str] = "data/pollen_forecast.db",
+                 grid_resolution: float = 0.1, cache_ttl: float = 5 * 24 * 3600,
+                 api_base_url: Optional[str] = None):
+        # api_base_url can point at a stand-in server (see benchmarks/api_stub_server.py)
+        self.api_base_url = api_base_url or "https://pollen.googleapis.com/v1/forecast:lookup"
         self.api_key = api_key or os.getenv('GOOGLE_POLLEN_API_KEY')
 
         if not self.api_key:
             raise ValueError("Google Pollen API key not found. Please set GOOGLE_POLLEN_API_KEY in .env file or pass api_key parameter.")
 
-        self.session = requests.Session()
-        self.last_request_time = 0
-        self.min_request_interval = 1.0  # Minimum seconds between requests
+        # Shared pooled session + per-host token bucket (and daily quota for the paid API)
+        self.transport = transport or get_default_transport()
+        self.transport.set_rate_limit(urlsplit(self.api_base_url).netloc, requests_per_second,
+                                      daily_quota=daily_quota)
 
-        # Atlanta coordinates
+        # Request the whole forecast horizon (the API allows up to 5 days) and keep it on disk
+        self.forecast_days = forecast_days
+        self.store = PollenForecastStore(store_path) if store_path else None
+
+        # Lookups are cached per grid cell (degrees), so nearby cities share one upstream request.
+        # 0.1 degrees is roughly 11 km; stored forecasts older than cache_ttl seconds are refetched.
+        self.grid_resolution = grid_resolution
+        self.cache_ttl = cache_ttl
+        self._cell_locks: Dict[str, threading.Lock] = {}
+        self._cell_locks_guard = threading.Lock()
+
+        # Atlanta coordinates (default location)
         self.atlanta_lat = 33.749
         self.atlanta_lon = -84.388
 
-    def _respect_rate_limit(self):
-        """Ensure we don't exceed API rate limits."""
-        time_since_last = time.time() - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
+    def quantize(self, lat: float, lon: float) -> Tuple[float, float]:
+        """Snap a coordinate to the center of its grid cell."""
+        res = self.grid_resolution
+        return round(round(lat / res) * res, 6), round(round(lon / res) * res, 6)
+
+    def _lock_for(self, location: str) -> threading.Lock:
+        with self._cell_locks_guard:
+            lock = self._cell_locks.get(location)
+            if lock is None:
+                lock = self._cell_locks[location] = threading.Lock()
+            return lock
 
-    def fetch_pollen_data(self) -> Tuple[Optional[Dict], str]:
+    @classmethod
+    def _parse_pollen_forecast(cls, json_data: Dict) -> Optional[Dict[str, PollenReading]]:
         """
-        Fetches pollen data for Atlanta from the Google Pollen API.
+        Parses every day of a forecast response.
 
         Returns:
-            Tuple of (pollen_data_dict, source_info_string)
-            pollen_data_dict is None if fetch failed
+            Dict of {'YYYY-MM-DD': PollenReading}, or None if the response is empty
         """
-        self._respect_rate_limit()
-
-        pollen_data = None
-        source_info = "Google Pollen API Data"
-
-        # Retry logic
-        max_retries = 3
-        retry_delays = [1, 2, 4]
-
-        for attempt in range(max_retries):
-            try:
-                params = {
-                    'key': self.api_key,
-                    'location.longitude': self.atlanta_lon,
-                    'location.latitude': self.atlanta_lat,
-                    'days': 1
-                }
-
-                response = requests.get(self.api_base_url, params=params, timeout=10)
-                response.raise_for_status()
-
-                json_data = response.json()
-
-                # Extract pollen data from the response
-                if 'dailyInfo' in json_data and len(json_data['dailyInfo']) > 0:
-                    daily_info = json_data['dailyInfo'][0]
-
-                    # Extract pollen counts and health recommendations
-                    pollen_types = daily_info.get('pollenTypeInfo', [])
-
-                    # Initialize with default values
-                    grass_index = 0
-                    tree_index = 0
-                    weed_index = 0
-                    health_recommendations = []
-
-                    # Parse pollen data and recommendations
-                    for pollen_type in pollen_types:
-                        code = pollen_type.get('code', '')
-                        index_info = pollen_type.get('indexInfo', {})
-                        value = index_info.get('value', 0)
-
-                        if code == 'GRASS':
-                            grass_index = value
-                        elif code == 'TREE':
-                            tree_index = value
-                        elif code == 'WEED':
-                            weed_index = value
-
-                        # Extract any health recommendations tied to this pollen type
-                        recs = pollen_type.get('healthRecommendations', [])
-                        for rec in recs:
-                            recommendation_text = rec
-                            if recommendation_text:
-                                health_recommendations.append(f"{code.title()}: {recommendation_text}")                    
-                                break
-                    pollen_data = {
-                        'grass': grass_index,
-                        'tree': tree_index,
-                        'weed': weed_index,
-                        'health_recommendations': health_recommendations
-                    }
-
-                    return pollen_data, source_info
-                else:
-                    source_info = "No pollen data available in API response"
-                    return None, source_info
-
-            except requests.exceptions.Timeout:
-                source_info = f"Pollen API request timed out (attempt {attempt + 1}/{max_retries})"
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delays[attempt])
-                    continue
-
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:  # Rate limited
-                    source_info = f"Pollen API rate limited (attempt {attempt + 1}/{max_retries}): Waiting 60 seconds..."
-                    time.sleep(60)
-                    continue
-                else:
-                    source_info = f"Pollen API HTTP Error: {e.response.status_code}"
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delays[attempt])
-                        continue
-
-            except requests.exceptions.RequestException as e:
-                source_info = f"Pollen API network error (attempt {attempt + 1}/{max_retries}): {e}"
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delays[attempt])
-                    continue
-
-            except Exception as e:
-                source_info = f"Unexpected pollen API error (attempt {attempt + 1}/{max_retries}): {e}"
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delays[attempt])
-                    continue
-
-        # If all attempts fail, return final error message
-        source_info = f"Failed to fetch pollen data after {max_retries} attempts. Last error: {source_info}"
-        return None, source_info
+        if 'dailyInfo' not in json_data or len(json_data['dailyInfo']) == 0:
+            return None
+
+        today = datetime.now().date()
+        forecast = {}
+        for offset, daily_info in enumerate(json_data['dailyInfo']):
+            day_info = daily_info.get('date')
+            if day_info:
+                day = date(day_info['year'], day_info['month'], day_info['day'])
+            else:
+                day = today + timedelta(days=offset)
+            forecast[day.isoformat()] = cls._parse_daily_info(daily_info)
+        return forecast
 
     @staticmethod
-    def get_pollen_color(index: int) -> str:
+    def _parse_daily_info(daily_info: Dict) -> PollenReading:
+        """Extract one day's pollen indexes and health recommendations."""
+        # Extract pollen counts and health recommendations
+        pollen_types = daily_info.get('pollenTypeInfo', [])
+
+        # Initialize with default values
+        grass_index = 0
+        tree_index = 0
+        weed_index = 0
+        health_recommendations = []
+
+        # Parse pollen data and recommendations
+        for pollen_type in pollen_types:
+            code = pollen_type.get('code', '')
+            index_info = pollen_type.get('indexInfo', {})
+            value = index_info.get('value', 0)
+
+            if code == 'GRASS':
+                grass_index = value
+            elif code == 'TREE':
+                tree_index = value
+            elif code == 'WEED':
+                weed_index = value
+
+            # Extract any health recommendations tied to this pollen type
+            recs = pollen_type.get('healthRecommendations', [])
+            for rec in recs:
+                recommendation_text = rec
+                if recommendation_text:
+                    health_recommendations.append(f"{code.title()}: {recommendation_text}")
+                    break
+
+        return PollenReading(
+            grass=grass_index,
+            tree=tree_index,
+            weed=weed_index,
+            health_recommendations=health_recommendations
+        )
+
+    def fetch_pollen_data(self, lat: Optional[float] = None, lon: Optional[float] = None,
+                          deadline: Optional[float] = None) -> Tuple[Optional[PollenReading], str]:
         """
-        Returns the color code for a given pollen index.
+        Fetches today's pollen data for a coordinate (Atlanta by default).
+
+        The coordinate is snapped to its grid cell. Today's record for that cell is
+        answered from the on-disk forecast store when a previous call (possibly from an
+        earlier run or a nearby city) already fetched it within cache_ttl. Otherwise the
+        full forecast horizon is requested for the cell center and every day is stored.
+        Concurrent lookups in the same cell wait for one request instead of each sending one.
 
         Args:
-            index: Pollen index (0-5)
+            lat: Latitude, defaults to Atlanta
+            lon: Longitude, defaults to Atlanta
+            deadline: time.monotonic() value by which retries must stop (see http_transport.deadline_in)
 
         Returns:
-            Color name for the pollen level
+            Tuple of (PollenReading, source_info_string)
+            the reading is None if fetch failed
         """
-        color_map = {
-            0: "gray",
-            1: "darkgreen",
-            2: "lightgreen",
-            3: "yellow",
-            4: "orange",
-            5: "red"
+        if lat is None or lon is None:
+            lat, lon = self.atlanta_lat, self.atlanta_lon
+        cell_lat, cell_lon = self.quantize(lat, lon)
+        location = f"{cell_lat:.4f},{cell_lon:.4f}"
+
+        with self._lock_for(location):
+            return self._fetch_cell(location, cell_lat, cell_lon, deadline)
+
+    def _fetch_cell(self, location: str, cell_lat: float, cell_lon: float,
+                    deadline: Optional[float] = None) -> Tuple[Optional[PollenReading], str]:
+        """Answer today's record for one grid cell from the store or the API."""
+        today = datetime.now().date().isoformat()
+
+        if self.store:
+            cached = self.store.load_day(location, today, max_age=self.cache_ttl)
+            if cached:
+                pollen_data, fetched_at = cached
+                return pollen_data, f"Google Pollen API Data (stored forecast from {fetched_at})"
+
+        params = {
+            'key': self.api_key,
+            'location.longitude': cell_lon,
+            'location.latitude': cell_lat,
+            'days': self.forecast_days
         }
-        return color_map.get(index, "gray")
+        forecast, source_info = self.transport.fetch_json(self.api_base_url, params, self._parse_pollen_forecast,
+                                                          label="Pollen API", description="pollen data",
+                                                          source_info="Google Pollen API Data", deadline=deadline)
+        if forecast is None:
+            return None, source_info
+
+        if self.store:
+            self.store.save_days(location, forecast)
+            self.store.purge_before(today)
+
+        # Today's entry, or the first day returned if the API's date differs from ours
+        pollen_data = forecast.get(today) or forecast[min(forecast)]
+        return pollen_data, source_info
 
     @staticmethod
-    def get_pollen_level_text(index: int) -> str:
+    def get_pollen_color(index):
+        """
+        Returns the color code for a given pollen index.
+
+        Args:
+            index: Pollen index (0-5), or an array of them
+
+        Returns:
+            Color name for the pollen level (an array of names for an array)
+        """
+        return load_risk_table().index_color(index)
+
+    @staticmethod
+    def get_pollen_level_text(index):
         """
         Returns the text description for a given pollen index.
 
         Args:
-            index: Pollen index (0-5)
+            index: Pollen index (0-5), or an array of them
 
         Returns:
-            Text description of the pollen level
+            Text description of the pollen level (an array of descriptions for an array)
         """
-        level_map = {
-            0: "None",
-            1: "Very Low",
-            2: "Low",
-            3: "Moderate",
-            4: "High",
-            5: "Very High"
-        }
-        return level_map.get(index, "Unknown")
\ No newline at end of file
+        return load_risk_table().index_level_text(index)
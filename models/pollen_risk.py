@@ -0,0 +1,121 @@
+import json
+from functools import lru_cache
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def risk_column(count_column: str) -> str:
+    """Name of the computed risk column for a count column: 'Count.tree_pollen' -> 'PredictedRisk.tree_pollen',
+    'Species.Tree.Oak' -> 'PredictedSpeciesRisk.Oak'. The prefix keeps them apart from the pollen CSVs'
+    own Risk.* / SpeciesRisk.* labels, which use other thresholds for the Count.* columns."""
+    if count_column.startswith('Count.'):
+        return 'PredictedRisk.' + count_column[len('Count.'):]
+    if count_column.startswith('Species.'):
+        return 'PredictedSpeciesRisk.' + count_column.split('.', 2)[-1]
+    return count_column + '.risk'
+
+
+def _integer_or_missing(value) -> int:
+    """`value` as an int if it is an integral number, else -1."""
+    if isinstance(value, (int, np.integer, np.bool_)):
+        return int(value)
+    if isinstance(value, (float, np.floating)) and np.isfinite(value) and value == int(value):
+        return int(value)
+    return -1
+
+
+class RiskTable:
+    """Pollen risk thresholds, applied to whole arrays with np.searchsorted.
+
+    thresholds[column] holds the inclusive upper bound of every level but the last, so with
+    levels Low/Moderate/High/Very High and bounds (9, 49, 199) a count of 49 is Moderate and 200
+    is Very High. Columns are the count columns of the pollen CSVs (Count.* and Species.*).
+    The same table also holds the names and colors of the 0-5 index levels the pollen API returns.
+    """
+
+    def __init__(self, levels: Sequence[str], thresholds: Dict[str, Sequence[float]],
+                 index_levels: Sequence[str] = (), index_colors: Sequence[str] = ()):
+        for column, bounds in thresholds.items():
+            if len(bounds) != len(levels) - 1 or list(bounds) != sorted(bounds):
+                raise ValueError(f"Thresholds for {column} must be {len(levels) - 1} ascending bounds")
+        # 'Unknown' is appended so missing counts can be mapped to the last slot
+        self.levels = np.array(list(levels) + ['Unknown'], dtype=object)
+        self.thresholds = {column: np.asarray(bounds, dtype=float) for column, bounds in thresholds.items()}
+        self.index_levels = np.array(list(index_levels) + ['Unknown'], dtype=object)
+        self.index_colors = np.array(list(index_colors) + ['gray'], dtype=object)
+
+    @classmethod
+    def from_json(cls, path: str) -> "RiskTable":
+        with open(path) as f:
+            config = json.load(f)
+        return cls(config['levels'], config['thresholds'], config.get('index_levels', ()),
+                   config.get('index_colors', ()))
+
+    def bounds_for(self, column: str) -> Optional[np.ndarray]:
+        """Thresholds for a column; names like 'Tree Pollen' fall back to the matching Count.* column."""
+        if column in self.thresholds:
+            return self.thresholds[column]
+        family = column.lower()
+        for name, bounds in self.thresholds.items():
+            if name.startswith('Count.') and name[len('Count.'):].split('_')[0] in family:
+                return bounds
+        return None
+
+    def classify(self, counts, column: str) -> np.ndarray:
+        """
+        Risk level names for an array (or Series) of counts of one column.
+
+        Returns:
+            Object array of level names; 'Unknown' for missing counts or a column without thresholds
+        """
+        counts = np.asarray(counts, dtype=float)
+        bounds = self.bounds_for(column)
+        unknown = len(self.levels) - 1
+        if bounds is None:
+            return np.full(counts.shape, self.levels[unknown], dtype=object)
+        codes = np.searchsorted(bounds, counts, side='left')
+        codes[np.isnan(counts)] = unknown
+        return self.levels[codes]
+
+    def classify_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Classifies every count column of `frame` that has thresholds, e.g. a multi-year pollen history.
+
+        Returns:
+            DataFrame with the same index and one risk column per count column (see risk_column)
+        """
+        return pd.DataFrame({risk_column(column): self.classify(frame[column], column)
+                             for column in frame.columns if column in self.thresholds}, index=frame.index)
+
+    def _lookup(self, table: np.ndarray, indexes):
+        """table[index] for integer indexes inside the table; anything else (None, 2.7, NaN, text)
+        gets the last, unknown slot, like a dict lookup with a default."""
+        unknown = len(table) - 1
+        indexes = np.asarray(indexes)
+        if indexes.dtype.kind in 'iub':
+            codes = indexes
+        elif indexes.dtype.kind == 'f':
+            with np.errstate(invalid='ignore'):
+                integral = np.isfinite(indexes) & (indexes == np.round(indexes))
+            codes = np.where(integral, indexes, -1)
+        else:
+            codes = np.vectorize(_integer_or_missing, otypes=[np.int64])(indexes) if indexes.size else indexes
+        codes = np.asarray(codes)
+        valid = (codes >= 0) & (codes < unknown)
+        return table[np.where(valid, codes, unknown).astype(int)]
+
+    def index_level_text(self, indexes):
+        """Level names of 0-5 pollen index values (scalar or array); out of range -> 'Unknown'."""
+        return self._lookup(self.index_levels, indexes)
+
+    def index_color(self, indexes):
+        """Display colors of 0-5 pollen index values (scalar or array); out of range -> 'gray'."""
+        return self._lookup(self.index_colors, indexes)
+
+
+@lru_cache(maxsize=None)
+def load_risk_table(path: str = "data/pollen_risk_thresholds.json") -> RiskTable:
+    """The risk table in `path`, read once per process."""
+    return RiskTable.from_json(path)
@@ -0,0 +1,84 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from models.records import PollenReading
+
+
+class PollenForecastStore:
+    """On-disk (SQLite) store of parsed daily pollen forecasts keyed by location and date.
+
+    PollenModel writes every day of each multi-day API response here, so later refreshes
+    and restarts can answer from disk without another paid API call.
+    """
+
+    def __init__(self, db_path: str = "data/pollen_forecast.db"):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS pollen_daily (
+                   location TEXT NOT NULL,
+                   date TEXT NOT NULL,
+                   grass INTEGER NOT NULL,
+                   tree INTEGER NOT NULL,
+                   weed INTEGER NOT NULL,
+                   health_recommendations TEXT NOT NULL,
+                   fetched_at TEXT NOT NULL,
+                   PRIMARY KEY (location, date)
+               )"""
+        )
+        self._conn.commit()
+
+    def save_days(self, location: str, days: Dict[str, PollenReading]):
+        """Insert or replace the records of a forecast response ({'YYYY-MM-DD': PollenReading})."""
+        fetched_at = datetime.now().isoformat(timespec='seconds')
+        rows = [
+            (location, day, data['grass'], data['tree'], data['weed'],
+             json.dumps(list(data.get('health_recommendations', ()))), fetched_at)
+            for day, data in days.items()
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO pollen_daily VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def load_day(self, location: str, day: str, max_age: Optional[float] = None) -> Optional[Tuple[PollenReading, str]]:
+        """
+        Returns the stored forecast for a location and day.
+
+        Args:
+            location: Location key
+            day: 'YYYY-MM-DD'
+            max_age: Ignore records fetched more than this many seconds ago
+
+        Returns:
+            Tuple of (PollenReading, fetched_at_date) or None if nothing (fresh enough) is stored
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT grass, tree, weed, health_recommendations, fetched_at FROM pollen_daily "
+                "WHERE location = ? AND date = ?", (location, day)
+            ).fetchone()
+        if row is None:
+            return None
+        grass, tree, weed, recs, fetched_at = row
+        fetched = datetime.fromisoformat(fetched_at)
+        if max_age is not None and datetime.now() - fetched > timedelta(seconds=max_age):
+            return None
+        return PollenReading(grass, tree, weed, json.loads(recs)), fetched.date().isoformat()
+
+    def purge_before(self, day: str) -> int:
+        """Delete records for dates before `day`. Returns the number of rows removed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM pollen_daily WHERE date < ?", (day,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
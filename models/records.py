@@ -0,0 +1,121 @@
+import math
+import sys
+from array import array
+from collections.abc import Mapping
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+
+class _Record(Mapping):
+    """Base for compact reading records.
+
+    Fields live in __slots__ (no per-instance __dict__), and the Mapping interface keeps
+    record['temp'], record.get('lat') and dict(record) working for code written against
+    the plain dicts the models used to return.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+def _float_or_nan(value: Optional[float]) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _nan_to_none(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class WeatherObservation(_Record):
+    """One current-weather reading; the description string is interned, so repeats share memory."""
+
+    __slots__ = ('date', 'temp', 'description', 'humidity', 'lat', 'lon')
+
+    def __init__(self, date: date, temp: float, description: str, humidity: int,
+                 lat: Optional[float] = None, lon: Optional[float] = None):
+        self.date = date
+        self.temp = temp
+        self.description = sys.intern(description)
+        self.humidity = humidity
+        self.lat = lat
+        self.lon = lon
+
+    @staticmethod
+    def to_columns(records: Sequence["WeatherObservation"]) -> Dict[str, Sequence]:
+        """
+        Converts records to typed column arrays (dates as proleptic ordinals, missing coordinates as NaN).
+
+        Returns:
+            Dict of column name -> array, plus 'description' as a list of interned strings
+        """
+        return {
+            'date': array('l', (record.date.toordinal() for record in records)),
+            'temp': array('d', (record.temp for record in records)),
+            'description': [record.description for record in records],
+            'humidity': array('l', (record.humidity for record in records)),
+            'lat': array('d', (_float_or_nan(record.lat) for record in records)),
+            'lon': array('d', (_float_or_nan(record.lon) for record in records)),
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence]) -> List["WeatherObservation"]:
+        """Inverse of to_columns."""
+        return [
+            cls(date.fromordinal(day), temp, description, humidity, _nan_to_none(lat), _nan_to_none(lon))
+            for day, temp, description, humidity, lat, lon in zip(
+                columns['date'], columns['temp'], columns['description'],
+                columns['humidity'], columns['lat'], columns['lon'])
+        ]
+
+
+class PollenReading(_Record):
+    """One day's pollen indexes (0-5); recommendation strings are interned and stored as a tuple."""
+
+    __slots__ = ('grass', 'tree', 'weed', 'health_recommendations')
+
+    def __init__(self, grass: int, tree: int, weed: int, health_recommendations: Iterable[str] = ()):
+        self.grass = grass
+        self.tree = tree
+        self.weed = weed
+        self.health_recommendations = tuple(sys.intern(text) for text in health_recommendations)
+
+    @staticmethod
+    def to_columns(records: Sequence["PollenReading"]) -> Dict[str, Sequence]:
+        """
+        Converts records to column arrays of indexes ('b', one byte each).
+
+        Returns:
+            Dict of column name -> array, plus 'health_recommendations' as a list of tuples
+        """
+        return {
+            'grass': array('b', (record.grass for record in records)),
+            'tree': array('b', (record.tree for record in records)),
+            'weed': array('b', (record.weed for record in records)),
+            'health_recommendations': [record.health_recommendations for record in records],
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence]) -> List["PollenReading"]:
+        """Inverse of to_columns."""
+        return [
+            cls(grass, tree, weed, recommendations)
+            for grass, tree, weed, recommendations in zip(
+                columns['grass'], columns['tree'], columns['weed'], columns['health_recommendations'])
+        ]
@@ -0,0 +1,133 @@
+import threading # Protects the entry table and coordinates single-flight loads.
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Flight:
+    """A load in progress that other callers for the same key can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ResponseCache:
+    """In-process TTL + LRU cache with single-flight loads and stale-while-revalidate.
+
+    - Entries younger than `ttl` seconds are served directly (hit).
+    - Entries older than `ttl` but younger than `max_stale` are served immediately
+      while one background thread refreshes them (stale hit).
+    - Concurrent misses for the same key share a single call to the loader.
+    - Once more than `max_entries` keys are stored, the least recently used is evicted.
+    """
+
+    def __init__(self, ttl: float = 600, max_entries: int = 256, max_stale: Optional[float] = None,
+                 should_cache: Optional[Callable[[Any], bool]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_stale = max_stale if max_stale is not None else ttl * 6
+        self.should_cache = should_cache or (lambda value: value is not None)
+        self.clock = clock
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (stored_at, value)
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, calling `loader()` only when needed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = self.clock() - entry[0]
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                if age < self.max_stale:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    if key not in self._inflight:
+                        flight = self._inflight[key] = _Flight()
+                        threading.Thread(target=self._load, args=(key, loader, flight),
+                                         name="cache-refresh", daemon=True).start()
+                    return entry[1]
+
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                flight = self._inflight[key] = _Flight()
+                leader = True
+
+        if leader:
+            self._load(key, loader, flight)
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], flight: _Flight):
+        try:
+            flight.result = loader()
+        except BaseException as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                if flight.error is None and self.should_cache(flight.result):
+                    self._store(key, flight.result)
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def _store(self, key: Hashable, value: Any):
+        self._entries[key] = (self.clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def put(self, key: Hashable, value: Any):
+        """Insert or replace an entry (e.g. from a prefetch)."""
+        with self._lock:
+            self._store(key, value)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one entry, or every entry when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and self.clock() - entry[0] < self.ttl
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for sizing the cache."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
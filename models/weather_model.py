@@ -1,116 +1,205 @@
 import os
-import requests
 from dotenv import load_dotenv
-from datetime import datetime, timedelta, timezone # To handle timestamps.
-import time # For delays, rate limiting, and timestamps.
-import json # For handling JSON responses (used implicitly).
-from typing import Dict, List, Optional, Tuple # Provides type hints like Tupel. Dict, List and Optional.
+from datetime import datetime, timezone # To handle timestamps.
+from concurrent.futures import ThreadPoolExecutor, as_completed # Bounded worker pool for batch fetches.
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple # Provides type hints like Tupel. Dict, List and Optional.
+from urllib.parse import urlsplit
+from models.city_gazetteer import CityGazetteer, normalize_city_name
+from models.http_transport import HttpTransport, get_default_transport
+from models.records import WeatherObservation
+from models.response_cache import ResponseCache
 
 # Load environment variables from .env file
 load_dotenv()
 
 class WeatherModel:
     """Model class responsible for weather data operations and API interactions."""
+
+    GROUP_SIZE = 20  # Maximum city IDs per OpenWeather group request
     
-    def __init__(self, api_key: Optional[str] = None):
-        self.api_base_url = "http://api.openweathermap.org/data/2.5/weather"
+    def __init__(self, api_key: Optional[str] = None, max_workers: int = 8,
+                 requests_per_second: float = 1.0, daily_quota: Optional[int] = None,
+                 transport: Optional[HttpTransport] = None, cache_ttl: Optional[float] = 600,
+                 cache_size: int = 256, api_base_url: Optional[str] = None,
+                 gazetteer_path: Optional[str] = "data/city_gazetteer.csv"):
+        # api_base_url can point at a stand-in server (see benchmarks/api_stub_server.py)
+        self.api_base_url = api_base_url or "http://api.openweathermap.org/data/2.5/weather"
+        self.api_group_url = self.api_base_url.rsplit("/", 1)[0] + "/group"
         self.api_key = api_key or os.getenv('OPENWEATHER_API_KEY')
 
         if not self.api_key:
             raise ValueError("API key not found. Please set OPENWEATHER_API_KEY in .env file or pass api_key parameter.")
-        self.session = requests.Session()  # Reuse connections & keeps connections alive
-        self.last_request_time = 0
-        self.min_request_interval = 1.0  # Minimum seconds between requests
-                
-    def _respect_rate_limit(self):
-        """Ensure we don't exceed API rate limits.
-        Checks how long it's been since the last API request.
-        If not enough time has passed (based on the rate limit), it pauses the program.
-        Ensures we don't accidentally get blocked for making too many requests too quickly.
-        """
-        time_since_last = time.time() - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
+        # Shared pooled session + per-host token bucket, so every thread and model reuses connections
+        self.transport = transport or get_default_transport()
+        self.transport.set_rate_limit(urlsplit(self.api_base_url).netloc, requests_per_second,
+                                      daily_quota=daily_quota)
+        self.max_workers = max_workers  # Upper bound on concurrent requests in fetch_many
+
+        # OpenWeather only updates `dt` about every 10 minutes, so repeat lookups are served from memory.
+        # Only successful responses are cached; cache_ttl=None disables caching.
+        self.cache = None
+        if cache_ttl is not None:
+            self.cache = ResponseCache(ttl=cache_ttl, max_entries=cache_size,
+                                       should_cache=lambda result: result[0] is not None)
+
+        # Cities with a known ID are requested by ID (exact match) and can be batched into group
+        # requests; IDs of cities found by name are learned from the responses. None disables this.
+        self.gazetteer = CityGazetteer(gazetteer_path) if gazetteer_path else None
+
+    @staticmethod
+    def normalize_city_name(city_name: str) -> str:
+        """Cache/request key for a city: lower case with collapsed whitespace."""
+        return normalize_city_name(city_name)
+
+    @staticmethod
+    def _parse_weather_response(json_data: Dict) -> WeatherObservation:
+        """Extract the fields we display and log from an OpenWeather response body."""
+        # Convert datetime from UNIX timestamp for CSV file
+        timestamp = datetime.fromtimestamp(json_data["dt"], tz=timezone.utc).date()
+
+        coord = json_data.get('coord', {})
+
+        return WeatherObservation(
+            date=timestamp,
+            temp=json_data['main']['temp'],
+            description=json_data['weather'][0]['description'],
+            humidity=json_data['main']['humidity'],
+            lat=coord.get('lat'),
+            lon=coord.get('lon')
+        )
     
-    def fetch_weather_data(self, city_name: str) -> Tuple[Optional[Dict], str]:
+    def fetch_weather_data(self, city_name: str, deadline: Optional[float] = None) -> Tuple[Optional[WeatherObservation], str]:
         """
-        Fetches weather data for a given city from the OpenWeatherMap API.
+        Fetches weather data for a given city, answering from the response cache when possible.
         
         Args:
             city_name: Name of the city to get weather for
+            deadline: time.monotonic() value by which retries must stop (see http_transport.deadline_in)
             
         Returns:
-            Tuple of (weather_data_dict, source_info_string)
-            weather_data_dict is None if fetch failed
+            Tuple of (WeatherObservation, source_info_string)
+            the observation is None if fetch failed
         """
-        self._respect_rate_limit() # Ensure rate limits are not exceeded
+        key = self.normalize_city_name(city_name)
+        if self.cache is None:
+            return self._fetch_from_api(key, deadline)
+        return self.cache.get_or_load(key, lambda: self._fetch_from_api(key, deadline))
 
-        weather_data = None
-        source_info = "Open Weather API Data"
+    def _fetch_from_api(self, city_name: str, deadline: Optional[float] = None) -> Tuple[Optional[WeatherObservation], str]:
+        """
+        Fetches weather data for a normalized city name from the OpenWeatherMap API,
+        by city ID when the gazetteer knows it and by name search otherwise.
+        Rate limiting, circuit breaking, retries and backoff are handled by the shared HttpTransport.
+        """
+        city_id = self.gazetteer.city_id(city_name) if self.gazetteer else None
+        params = {
+            'appid': self.api_key,
+            'units': 'imperial'
+        }
+        if city_id is not None:
+            params['id'] = city_id
+            parse = self._parse_weather_response
+        else:
+            params['q'] = city_name
+            parse = lambda json_data: self._parse_and_learn(city_name, json_data)
+        return self.transport.fetch_json(self.api_base_url, params, parse,
+                                         label="API", description="weather data",
+                                         source_info="Open Weather API Data", deadline=deadline)
 
-        # Attempts up to 3 retries if errors occur.
-        max_retries = 3
-        retry_delays = [1, 2, 4]  # Exponential backoff        
-        
-        for attempt in range(max_retries):
-            try:
-                # Build the URL for the API request
-                city_name = city_name.lower().strip() # Make sure that we're passing lower case and stripping the whitespace into the API
-                full_api_url = f"{self.api_base_url}?q={city_name}&appid={self.api_key}&units=imperial"
-
-                # Send the request and get the response
-                response = requests.get(full_api_url, timeout=10)
-                response.raise_for_status() # Check if an HTTP request was successful
-                
-                # Convert the response into a dictionary
-                json_data = response.json()
-                
-                # Extract the weather details we need from the dictionary    
-                timestamp = json_data["dt"]
-
-                # Convert datetime from UNIX timestamp for CSV file
-                timestamp = datetime.fromtimestamp(timestamp, tz=timezone.utc).date()
-                
-                weather_data = {
-                    "date": timestamp,
-                    "temp": json_data['main']['temp'],
-                    "description": json_data['weather'][0]['description'],
-                    "humidity": json_data['main']['humidity']
-                }
-
-                return weather_data, source_info
-                
-            except requests.exceptions.Timeout:
-                source_info = f"API request timed out (attempt {attempt + 1}/{max_retries})"
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delays[attempt])
-                    continue
-                    
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:  # Rate limited
-                    source_info = f"API rate limited (attempt {attempt + 1}/{max_retries}): Waiting 60 seconds..."
-                    time.sleep(60)  # Wait 1 minute
-                    continue
+    def _parse_and_learn(self, city_name: str, json_data: Dict) -> WeatherObservation:
+        """Parse a name-search response and remember the city's ID for later lookups."""
+        weather_data = self._parse_weather_response(json_data)
+        if self.gazetteer and json_data.get('id'):
+            self.gazetteer.learn(city_name, json_data['id'], weather_data['lat'], weather_data['lon'],
+                                 json_data.get('sys', {}).get('country', ""), display_name=json_data.get('name'))
+        return weather_data
+
+    @classmethod
+    def _parse_group_response(cls, json_data: Dict) -> Optional[Dict[int, WeatherObservation]]:
+        """Parse a group response into {city_id: WeatherObservation}, or None if it holds no cities."""
+        items = json_data.get('list') or []
+        if not items:
+            return None
+        return {item['id']: cls._parse_weather_response(item) for item in items}
+
+    def _fetch_group(self, batch: List[Tuple[str, int]]) -> List[Tuple[str, Optional[WeatherObservation], str]]:
+        """
+        Fetches up to GROUP_SIZE cities with one request to the group-by-ID endpoint.
+        Successful results are stored in the response cache like single lookups.
+
+        Args:
+            batch: (city_name, city_id) pairs
+
+        Returns:
+            List of (city_name, WeatherObservation or None, source_info_string), one per pair
+        """
+        params = {
+            'id': ",".join(str(city_id) for city_id in dict.fromkeys(city_id for _, city_id in batch)),
+            'appid': self.api_key,
+            'units': 'imperial'
+        }
+        by_id, source_info = self.transport.fetch_json(self.api_group_url, params, self._parse_group_response,
+                                                       label="API", description="weather data",
+                                                       source_info="Open Weather API Data")
+        results = []
+        for city_name, city_id in batch:
+            if by_id is None:
+                results.append((city_name, None, source_info))
+            elif city_id not in by_id:
+                results.append((city_name, None, "No weather data available in API response"))
+            else:
+                result = (by_id[city_id], source_info)
+                if self.cache is not None:
+                    self.cache.put(self.normalize_city_name(city_name), result)
+                results.append((city_name, *result))
+        return results
+
+    def fetch_many(self, cities: Iterable[str], max_workers: Optional[int] = None) -> Iterator[Tuple[str, Optional[WeatherObservation], str]]:
+        """
+        Fetches weather data for several cities concurrently on a bounded thread pool.
+
+        Cities that are not cached but have a gazetteer ID are packed into group requests
+        of up to GROUP_SIZE cities; the rest go through fetch_weather_data. Parsing, retries
+        and error messages are the same as on the single-city path, and the transport's
+        token bucket keeps the whole batch within the host's requests-per-second budget.
+
+        Args:
+            cities: City names to look up (duplicates are fetched once)
+            max_workers: Pool size, defaults to self.max_workers
+
+        Yields:
+            Tuples of (city_name, WeatherObservation or None, source_info_string) in completion order
+        """
+        unique_cities = list(dict.fromkeys(cities))
+        if not unique_cities:
+            return
+
+        singles: List[str] = []
+        by_id: List[Tuple[str, int]] = []
+        for city in unique_cities:
+            key = self.normalize_city_name(city)
+            city_id = self.gazetteer.city_id(key) if self.gazetteer else None
+            if city_id is None or (self.cache is not None and key in self.cache):
+                singles.append(city)
+            else:
+                by_id.append((city, city_id))
+        batches = [by_id[i:i + self.GROUP_SIZE] for i in range(0, len(by_id), self.GROUP_SIZE)]
+        if len(batches) == 1 and len(batches[0]) == 1:
+            # A group of one is just a single lookup (which also coalesces with concurrent callers)
+            singles.append(batches.pop()[0][0])
+
+        workers = min(max_workers or self.max_workers, len(singles) + len(batches))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="weather-fetch") as executor:
+            futures = {executor.submit(self.fetch_weather_data, city): city for city in singles}
+            futures.update({executor.submit(self._fetch_group, batch): None for batch in batches})
+            for future in as_completed(futures):
+                city = futures[future]
+                if city is None:
+                    yield from future.result()
                 else:
-                    source_info = f"{e.response.status_code}"
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delays[attempt])
-                        continue
-                        
-            except requests.exceptions.RequestException as e:
-                source_info = f"API network error (attempt {attempt + 1}/{max_retries}): {e}"
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delays[attempt])
-                    continue
-                    
-            except Exception as e:
-                source_info = f"Unexpected error (attempt {attempt + 1}/{max_retries}): {e}"
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delays[attempt])
-                    continue
-        
-        # If all attempts fail, return final error message
-        source_info = f"Failed to fetch weather data after {max_retries} attempts. Last error: {source_info}"
-        return None, source_info
\ No newline at end of file
+                    weather_data, source_info = future.result()
+                    yield city, weather_data, source_info
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters of the response cache (empty if caching is disabled)."""
+        return self.cache.stats() if self.cache else {}
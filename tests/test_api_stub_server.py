@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import requests
+from benchmarks.api_stub_server import GROUP_PATH, StubApiServer, StubConfig, WEATHER_PATH
+from models.http_transport import HttpTransport
+from models.pollen_model import PollenModel
+from models.weather_model import WeatherModel
+
+
+@pytest.fixture
+def transport():
+    transport = HttpTransport()
+    transport.BACKOFF_BASE = 0
+    return transport
+
+
+# ---------- Test: real HTTP round trip through the stand-in server ----------
+def test_models_fetch_from_stub_server(transport):
+    with StubApiServer() as server:
+        weather = WeatherModel(api_key="stub", transport=transport, cache_ttl=None,
+                               requests_per_second=0, api_base_url=server.weather_url,
+                               gazetteer_path=None)
+        pollen = PollenModel(api_key="stub", transport=transport, store_path=None,
+                             requests_per_second=0, api_base_url=server.pollen_url)
+
+        weather_data, weather_source = weather.fetch_weather_data("Miami")
+        pollen_data, pollen_source = pollen.fetch_pollen_data(25.76, -80.19)
+
+    assert weather_data is not None and weather_source == "Open Weather API Data"
+    assert weather_data["description"] == "clear sky"
+    assert pollen_data is not None
+    assert set(pollen_data) >= {"grass", "tree", "weed"}
+
+
+# ---------- Test: 429 bursts are retried and show up as retry amplification ----------
+def test_rate_limit_burst_is_retried(transport):
+    config = StubConfig(rate_limit_every=100, rate_limit_burst=2, retry_after=0)
+    with StubApiServer(config) as server:
+        weather = WeatherModel(api_key="stub", transport=transport, cache_ttl=None,
+                               requests_per_second=0, api_base_url=server.weather_url,
+                               gazetteer_path=None)
+
+        weather_data, _ = weather.fetch_weather_data("Boston")
+
+        assert weather_data is not None
+        assert server.requests[WEATHER_PATH] == 3
+        assert server.responses == {429: 2, 200: 1}
+
+
+# ---------- Test: ID lookups and group requests for gazetteer cities ----------
+def test_fetch_many_uses_group_endpoint(transport, tmp_path):
+    gazetteer = tmp_path / "city_gazetteer.csv"
+    gazetteer.write_text("name,id,lat,lon,country\nAtlanta,4180439,33.749,-84.388,US\n"
+                         "New York,5128581,40.7143,-74.006,US\nChicago,4887398,41.85,-87.65,US\n")
+    with StubApiServer() as server:
+        weather = WeatherModel(api_key="stub", transport=transport, cache_ttl=None, requests_per_second=0,
+                               api_base_url=server.weather_url, gazetteer_path=str(gazetteer))
+
+        results = {city: data for city, data, _ in weather.fetch_many(["Atlanta", "New York", "Chicago"])}
+
+        assert all(data is not None for data in results.values()), results
+        assert set(results) == {"Atlanta", "New York", "Chicago"}
+        assert server.requests == {GROUP_PATH: 1}
+
+        # Single lookups go by ID and unknown IDs get the API's 404
+        assert weather.fetch_weather_data("Chicago")[0] is not None
+        assert server.requests[WEATHER_PATH] == 1
+        with pytest.raises(requests.exceptions.HTTPError) as error:
+            transport.get(server.weather_url, {"id": 1})
+        assert error.value.response.status_code == 404
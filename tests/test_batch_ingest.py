@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import Mock
+from controllers.batch_ingest import ingest, percentile, read_cities
+from features.weather_logger import WeatherLogger
+
+
+class TestBatchIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp_dir, "weather_log.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_read_cities_skips_comments_and_blank_lines(self):
+        path = os.path.join(self.tmp_dir, "cities.txt")
+        with open(path, "w") as f:
+            f.write("# nightly list\nAtlanta\n\n  Boston  # office\n")
+
+        self.assertEqual(list(read_cities(path)), ["Atlanta", "Boston"])
+
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_ingest_logs_results_and_reports_failures(self):
+        chunks = []
+
+        def fake_fetch_many(cities, max_workers=None):
+            chunks.append(list(cities))
+            for city in cities:
+                if city == "Atlantis":
+                    yield city, None, "API HTTP Error: 404"
+                else:
+                    yield city, {"date": "2025-01-01", "temp": 70.0, "description": "clear sky",
+                                 "humidity": 40}, "Open Weather API Data"
+
+        model = Mock()
+        model.fetch_many.side_effect = fake_fetch_many
+        cities = ["Atlanta", "Atlantis"] + [f"City {i}" for i in range(200)]
+
+        report = ingest(iter(cities), model, WeatherLogger(self.log_file), concurrency=3)
+
+        self.assertEqual(report.total, 202)
+        self.assertEqual(report.succeeded, 201)
+        self.assertEqual(report.failures, [("Atlantis", "API HTTP Error: 404")])
+        self.assertEqual(len(report.latencies), 202)
+        with open(self.log_file) as f:
+            self.assertEqual(len(f.readlines()), 201)
+        # Batched through fetch_many in bounded chunks, never one request per city
+        self.assertEqual([len(chunk) for chunk in chunks], [120, 82])
+        model.fetch_weather_data.assert_not_called()
+
+    def test_headless_import_does_not_load_tk(self):
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        code = "import sys, controllers.batch_ingest; sys.exit('tkinter' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, env={**os.environ, "PYTHONPATH": root})
+        self.assertEqual(result.returncode, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
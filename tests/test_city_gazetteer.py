@@ -0,0 +1,49 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import shutil
+import tempfile
+import unittest
+from models.city_gazetteer import CityGazetteer
+
+
+class TestCityGazetteer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "city_gazetteer.csv")
+        with open(self.path, "w") as f:
+            f.write("name,id,lat,lon,country\nAtlanta,4180439,33.749,-84.388,US\n")
+        self.seed = os.path.join(self.tmp_dir, "weather_log.csv")
+        with open(self.seed, "w") as f:
+            f.write("date, city, temperature\n2025-01-01, Boston, 30\n2025-01-01, city, 0\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_resolves_bundled_and_seeded_names(self):
+        gazetteer = CityGazetteer(self.path, seed_files=[self.seed])
+
+        self.assertEqual(gazetteer.city_id("  ATLANTA "), 4180439)
+        self.assertEqual(gazetteer.resolve("atlanta").lat, 33.749)
+        self.assertIsNone(gazetteer.city_id("Boston"))  # Known name, ID not learned yet
+        self.assertIsNone(gazetteer.resolve("Atlantis"))
+        self.assertEqual(sorted(gazetteer.names()), ["Atlanta", "Boston"])
+
+    def test_learned_cities_are_persisted_apart_from_bundled_file(self):
+        with open(self.path) as f:
+            bundled = f.read()
+        gazetteer = CityGazetteer(self.path, seed_files=[self.seed])
+        gazetteer.learn("boston", 4930956, 42.3584, -71.0598, "US")
+
+        reloaded = CityGazetteer(self.path, seed_files=[])
+        self.assertEqual(reloaded.city_id("Boston"), 4930956)
+        self.assertEqual(reloaded.by_id(4930956).name, "Boston")
+        self.assertEqual(reloaded.city_id("Atlanta"), 4180439)
+        with open(self.path) as f:
+            self.assertEqual(f.read(), bundled)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir, "city_gazetteer_learned.csv")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import random
+import heapq
+import string
+import unittest
+from unittest.mock import patch
+from features.city_index import CityPrefixIndex
+
+
+class TestCityPrefixIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = CityPrefixIndex([
+            ("Atlanta", 90), ("Athens", 3), ("Atlantic City", 3), ("Austin", 10),
+            ("Boston", 5), ("New York", 4), ("Newark", 1),
+        ])
+
+    def test_suggestions_are_ranked_by_weight(self):
+        self.assertEqual(self.index.suggest("at"), ["Atlanta", "Athens", "Atlantic City"])
+        self.assertEqual(self.index.suggest("A", limit=2), ["Atlanta", "Austin"])
+        self.assertEqual(self.index.suggest("new"), ["New York", "Newark"])
+        self.assertEqual(self.index.suggest("  NEW  y"), ["New York"])
+        self.assertEqual(self.index.suggest("x"), [])
+        self.assertEqual(self.index.suggest(""), [])
+
+    def test_membership_and_closest_match(self):
+        self.assertIn("boston", self.index)
+        self.assertNotIn("Bostn", self.index)
+        self.assertEqual(self.index.closest("Bostn"), "Boston")
+        self.assertEqual(self.index.closest("Atlnta"), "Atlanta")
+        self.assertIsNone(self.index.closest("Zzyzx"))
+
+    def test_add_updates_precomputed_suggestions(self):
+        self.index.add("Augusta", weight=50)
+        self.assertEqual(self.index.suggest("a", limit=2), ["Atlanta", "Augusta"])
+        self.assertIn("augusta", self.index)
+
+    def test_suggest_only_ranks_the_prefix_slice(self):
+        rng = random.Random(0)
+        names = ("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+                 for _ in range(20_000))
+        index = CityPrefixIndex((name, rng.random()) for name in names)
+        keys = sorted(index._keys)
+
+        # Short prefixes are answered from the precomputed table without ranking anything
+        with patch.object(index, '_rank', side_effect=AssertionError("ranked a short prefix")):
+            for prefix in ("a", "q", "zy"):
+                self.assertEqual(len(index.suggest(prefix)), CityPrefixIndex.MAX_SUGGESTIONS)
+
+        # Longer prefixes rank exactly the keys starting with the prefix, not the whole index
+        ranked_sizes = []
+        nsmallest = heapq.nsmallest
+
+        def recording_nsmallest(n, iterable, key=None):
+            iterable = list(iterable)
+            ranked_sizes.append(len(iterable))
+            return nsmallest(n, iterable, key=key)
+
+        with patch('features.city_index.heapq.nsmallest', side_effect=recording_nsmallest):
+            for prefix in ("abc", "mno", "xyzw"):
+                matching = [key for key in keys if key.startswith(prefix)]
+                expected = sorted(matching, key=lambda key: (-index._weights[key], key))[:10]
+                self.assertEqual(index.suggest(prefix), [index._names[key] for key in expected])
+                self.assertEqual(ranked_sizes[-1], len(matching))
+        self.assertLess(max(ranked_sizes), len(keys) // 100)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import threading
+import pytest
+import requests
+from unittest.mock import patch, Mock
+from models.http_transport import (CircuitBreaker, CircuitOpenError, HttpTransport, TokenBucket,
+                                   QuotaExceededError, deadline_in)
+
+
+# ---------- Test: token bucket reports wait time instead of blocking ----------
+def test_token_bucket_try_acquire_is_non_blocking():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.0
+    wait = bucket.try_acquire()
+    assert 0 < wait <= 1.0
+
+
+# ---------- Test: daily quota is enforced across threads ----------
+def test_token_bucket_daily_quota_shared_by_threads():
+    bucket = TokenBucket(rate=10000, capacity=100, daily_quota=50)
+    granted = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(20):
+            try:
+                bucket.acquire()
+            except QuotaExceededError:
+                return
+            with lock:
+                granted.append(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(granted) == 50
+    assert bucket.requests_today == 50
+
+
+# ---------- Test: quota exhaustion is reported without retrying ----------
+@patch('models.http_transport.requests.Session.get')
+def test_fetch_json_reports_quota_exhaustion(mock_get):
+    transport = HttpTransport()
+    transport.set_rate_limit("example.com", 1000, daily_quota=0)
+
+    data, source = transport.fetch_json("https://example.com/api", None, lambda body: body,
+                                        label="Test API", description="test data")
+
+    assert data is None
+    assert "quota exceeded" in source
+    mock_get.assert_not_called()
+
+
+# ---------- Test: breaker opens after repeated failures and probes when half-open ----------
+def test_circuit_breaker_opens_and_half_opens():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+    breaker.allow()
+    breaker.record_failure()
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    now[0] = 11.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.allow()  # The single probe
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+# ---------- Test: open circuit fails fast without touching the network ----------
+@patch('models.http_transport.requests.Session.get', side_effect=requests.exceptions.ConnectionError("down"))
+def test_fetch_json_fails_fast_when_circuit_open(mock_get):
+    transport = HttpTransport(failure_threshold=3, reset_timeout=60)
+    transport.set_rate_limit("example.com", 1000, burst=10)
+    transport.BACKOFF_BASE = 0
+
+    data, source = transport.fetch_json("https://example.com/api", None, lambda body: body)
+    assert data is None
+    assert mock_get.call_count == 3
+
+    data, source = transport.fetch_json("https://example.com/api", None, lambda body: body)
+    assert data is None
+    assert "circuit open" in source
+    assert mock_get.call_count == 3
+
+
+# ---------- Test: a 429 whose wait exceeds the deadline gives up instead of sleeping ----------
+@patch('models.http_transport.time.sleep')
+@patch('models.http_transport.requests.Session.get')
+def test_fetch_json_respects_deadline_on_rate_limit(mock_get, mock_sleep):
+    response = Mock()
+    response.status_code = 429
+    response.headers = {'Retry-After': '60'}
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+    mock_get.return_value = response
+
+    transport = HttpTransport()
+    transport.set_rate_limit("example.com", 1000)
+    data, source = transport.fetch_json("https://example.com/api", None, lambda body: body,
+                                        label="Test API", description="test data", deadline=deadline_in(5))
+
+    assert data is None
+    assert "time budget exhausted" in source
+    assert mock_get.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+# ---------- Test: client errors other than 429 are not retried ----------
+@patch('models.http_transport.time.sleep')
+@patch('models.http_transport.requests.Session.get')
+def test_fetch_json_does_not_retry_client_errors(mock_get, mock_sleep):
+    response = Mock()
+    response.status_code = 404
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+    mock_get.return_value = response
+
+    transport = HttpTransport()
+    transport.set_rate_limit("example.com", 1000)
+    data, source = transport.fetch_json("https://example.com/api", None, lambda body: body, label="Test API")
+
+    assert data is None
+    assert source == "Test API HTTP Error: 404"
+    assert mock_get.call_count == 1
+    mock_sleep.assert_not_called()
+
+    # Server errors are still retried
+    response.status_code = 503
+    transport.BACKOFF_BASE = 0
+    data, source = transport.fetch_json("https://example.com/api", None, lambda body: body, label="Test API")
+    assert data is None
+    assert mock_get.call_count == 1 + transport.MAX_RETRIES
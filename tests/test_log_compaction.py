@@ -0,0 +1,99 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from features.log_compaction import DailyRollups, compact_log
+from features.weather_archive import WeatherArchive, archive_closed_days
+
+HEADER = "date, city, temperature, description, humidity, data_source\n"
+LINES = [
+    "2025-07-01, Atlanta, 80.0, clear sky, 40, Open Weather API Data\n",
+    "2025-07-01, Atlanta, 90.0, clear sky, 50, Open Weather API Data\n",
+    "2025-07-01, new york, 70.0, light rain, 80, Open Weather API Data\n",
+    "2025-07-01, ATLANTA, 85.0, broken clouds, 60, Open Weather API Data\n",
+    "2025-07-02, Atlanta, 91.0, clear sky, 38, Open Weather API Data\n",
+]
+
+
+class TestLogCompaction(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp_dir, "weather_log.csv")
+        with open(self.log_file, "w") as f:
+            f.write(HEADER)
+            f.writelines(LINES)
+        self.rollups = DailyRollups(self.log_file)
+
+    def tearDown(self):
+        self.rollups.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def append(self, *lines):
+        with open(self.log_file, "a") as f:
+            f.writelines(lines)
+
+    # ---------- Test: Rollups summarize each (date, city) ----------
+    def test_daily_rollups(self):
+        frame = self.rollups.daily(city="atlanta", end="2025-07-01")
+        self.assertEqual(len(frame), 1)
+        row = frame.iloc[0]
+        self.assertEqual((row['samples'], row['temp_min'], row['temp_max'], row['temp_mean']), (3, 80.0, 90.0, 85.0))
+        self.assertEqual((row['humidity_min'], row['humidity_max'], row['humidity_mean']), (40, 60, 50.0))
+        self.assertEqual(len(self.rollups.daily()), 3)
+
+    # ---------- Test: Refresh only reads appended lines ----------
+    def test_refresh_is_incremental_and_skips_partial_lines(self):
+        self.assertEqual(self.rollups.refresh(), 5)
+        self.assertEqual(self.rollups.refresh(), 0)
+        self.append("2025-07-02, Atlanta, 95.0, clear sky, 30, Open Weather API Data\n", "2025-07-03, Atl")
+        self.assertEqual(self.rollups.refresh(), 1)
+        self.append("anta, 99.0, clear sky, 30, Open Weather API Data\n")
+        self.assertEqual(self.rollups.refresh(), 1)
+
+        # A second instance (e.g. another process) continues from the stored offset
+        other = DailyRollups(self.log_file)
+        self.assertEqual(other.refresh(), 0)
+        self.assertEqual(other.daily(city="Atlanta", start="2025-07-02", end="2025-07-02").iloc[0]['temp_max'], 95.0)
+        other.close()
+
+    # ---------- Test: Compaction keeps the latest reading per (date, city) ----------
+    def test_compact_log_keeps_latest_and_rollups_still_count_everything(self):
+        self.rollups.refresh()
+        self.append("2025-07-02, Atlanta, 93.0, clear sky, 35, Open Weather API Data\n")
+
+        self.assertEqual(compact_log(self.log_file, self.rollups), 3)
+        with open(self.log_file) as f:
+            self.assertEqual(f.readlines(), [HEADER, LINES[2], LINES[3],
+                                             "2025-07-02, Atlanta, 93.0, clear sky, 35, Open Weather API Data\n"])
+        self.assertEqual(compact_log(self.log_file, self.rollups), 0)
+
+        # Every reading (including dropped ones) is still counted exactly once
+        self.assertEqual(list(self.rollups.daily(city="atlanta")['samples']), [3, 2])
+        self.append("2025-07-03, Atlanta, 88.0, clear sky, 45, Open Weather API Data\n")
+        self.assertEqual(self.rollups.refresh(), 1)
+
+    # ---------- Test: Archiving keeps rollups and dedupes partitions ----------
+    def test_archive_keeps_rollups_and_latest_row(self):
+        archive = WeatherArchive(os.path.join(self.tmp_dir, "archive"))
+        archive_closed_days(self.log_file, archive, today=date(2025, 7, 2), rollups=self.rollups)
+
+        frame = archive.scan(columns=['date', 'temp'], city="Atlanta")
+        self.assertEqual(list(frame['temp']), [85.0])
+        self.assertEqual(list(self.rollups.daily(city="atlanta")['samples']), [3, 1])
+
+    # ---------- Test: A log replaced outside the tools is re-read ----------
+    def test_unknown_replacement_rebuilds(self):
+        self.rollups.refresh()
+        replacement = self.log_file + ".new"
+        with open(replacement, "w") as f:
+            f.write(HEADER + LINES[0])
+        os.replace(replacement, self.log_file)
+        self.assertEqual(list(self.rollups.daily()['samples']), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
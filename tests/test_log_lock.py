@@ -0,0 +1,109 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import multiprocessing
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import date
+from features.log_compaction import compact_log, read_log_lines, rewrite_log
+from features.log_index import parse_log_line
+from features.weather_archive import WeatherArchive, archive_closed_days
+from features.weather_logger import WeatherLogger
+
+PROCESSES = 6
+THREADS = 4
+LINES_PER_THREAD = 300
+# Long lines make each buffered batch far bigger than one write buffer
+PADDING = "x" * 200
+
+
+def write_lines(log_file: str, writer: int, buffered: bool):
+    """Runs in a child process: several threads share one logger, like the dashboard and ingest do."""
+    logger = WeatherLogger(log_file, buffered=buffered, flush_every=50, flush_interval=0.01)
+
+    def work(thread: int):
+        for n in range(LINES_PER_THREAD):
+            weather = {"date": "2025-07-01", "temp": float(n), "description": PADDING, "humidity": thread}
+            logger.log_weather_data(f"Writer {writer}", weather, f"thread {thread}")
+
+    threads = [threading.Thread(target=work, args=(t,)) for t in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if logger.close():
+        sys.exit(1)
+
+
+class TestConcurrentLogAppends(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp_dir, "weather_log.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    # ---------- Test: Parallel writers and log rewrites never lose or tear a line ----------
+    def test_parallel_writers_with_concurrent_rewrites(self):
+        context = multiprocessing.get_context("spawn")
+        writers = [context.Process(target=write_lines, args=(self.log_file, w, w % 2 == 0))
+                   for w in range(PROCESSES)]
+        for process in writers:
+            process.start()
+
+        # Meanwhile keep replacing the log the way compaction and archiving do
+        rewrites = 0
+        while any(process.is_alive() for process in writers):
+            if not os.path.exists(self.log_file):
+                continue
+            lines, read_size, file_id = read_log_lines(self.log_file)
+            rewrite_log(self.log_file, lines, read_size, file_id)
+            rewrites += 1
+        for process in writers:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+
+        with open(self.log_file) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), PROCESSES * THREADS * LINES_PER_THREAD)
+        seen = set()
+        for line in lines:
+            entry = parse_log_line(line)
+            self.assertIsNotNone(entry, line)
+            self.assertEqual(entry['description'], PADDING)
+            seen.add((entry['city'], entry['source'], entry['temp']))
+        self.assertEqual(len(seen), len(lines))
+        self.assertGreater(rewrites, 0)
+
+    # ---------- Test: A rewrite planned on a log another job replaced is redone ----------
+    def test_overlapping_archive_and_compaction_keep_every_line(self):
+        with open(self.log_file, "w") as f:
+            f.write("date, city, temperature, description, humidity, data_source\n"
+                    "2025-07-01, Atlanta, 80.0, clear sky, 40, API\n"
+                    "2025-07-02, Atlanta, 81.0, clear sky, 41, API\n"
+                    "2025-07-02, Atlanta, 82.0, clear sky, 42, API\n")
+        # Compaction reads the log...
+        lines, read_size, file_id = read_log_lines(self.log_file)
+        kept = [lines[0], lines[1], lines[3]]
+        # ...an archive run replaces it, and a writer appends to the new file...
+        archive = WeatherArchive(os.path.join(self.tmp_dir, "archive"))
+        self.assertEqual(archive_closed_days(self.log_file, archive, today=date(2025, 7, 2)), 1)
+        WeatherLogger(self.log_file).log_weather_data("Boston", {"date": "2025-07-02", "temp": 70.0,
+                                                                 "description": "fog", "humidity": 90}, "API")
+        # ...so the stale plan is refused instead of dropping Boston and restoring 2025-07-01
+        self.assertFalse(rewrite_log(self.log_file, kept, read_size, file_id))
+        self.assertEqual(compact_log(self.log_file), 1)
+
+        with open(self.log_file) as f:
+            content = f.read()
+        self.assertIn("Boston", content)
+        self.assertNotIn("2025-07-01", content)
+        self.assertIn("82.0", content)
+        self.assertNotIn("81.0", content)
+
+
+if __name__ == "__main__":
+    unittest.main()
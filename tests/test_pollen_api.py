@@ -1,6 +1,8 @@
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from models.pollen_model import PollenModel
@@ -8,7 +10,14 @@ from models.pollen_model import PollenModel
 
 class TestPollenModel(unittest.TestCase):
 
-    @patch('models.pollen_model.requests.get')
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store_path = os.path.join(self.tmp_dir, "pollen_forecast.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    @patch('models.http_transport.requests.Session.get')
     def test_fetch_pollen_data_success(self, mock_get):
         # Mock API response structure
         mock_response_data = {
@@ -42,7 +51,7 @@ class TestPollenModel(unittest.TestCase):
         mock_response.raise_for_status = MagicMock()
         mock_get.return_value = mock_response
 
-        model = PollenModel(api_key="fake-key")
+        model = PollenModel(api_key="fake-key", store_path=self.store_path)
         data, source = model.fetch_pollen_data()
 
         # Assertions
@@ -59,8 +68,68 @@ class TestPollenModel(unittest.TestCase):
         mock_get.assert_called_once()
         args, kwargs = mock_get.call_args
         self.assertIn("location.latitude", kwargs['params'])
-        self.assertEqual(kwargs['params']['location.latitude'], 33.749)
-        self.assertEqual(kwargs['params']['location.longitude'], -84.388)
+        # Atlanta is looked up at the center of its 0.1 degree grid cell
+        self.assertAlmostEqual(kwargs['params']['location.latitude'], 33.7)
+        self.assertAlmostEqual(kwargs['params']['location.longitude'], -84.4)
+
+        self.assertEqual(kwargs['params']['days'], 5)
+
+    @patch('models.http_transport.requests.Session.get')
+    def test_forecast_days_answered_from_disk(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            'dailyInfo': [
+                {'pollenTypeInfo': [{'code': 'TREE', 'indexInfo': {'value': day + 1}}]}
+                for day in range(5)
+            ]
+        }
+        mock_response.raise_for_status = MagicMock()
+        mock_get.return_value = mock_response
+
+        first, _ = PollenModel(api_key="fake-key", store_path=self.store_path).fetch_pollen_data()
+
+        # A new model (e.g. after a restart) is answered from the stored forecast
+        second_model = PollenModel(api_key="fake-key", store_path=self.store_path)
+        second, source = second_model.fetch_pollen_data()
+
+        mock_get.assert_called_once()
+        self.assertEqual(first, second)
+        self.assertEqual(second['tree'], 1)
+        self.assertIn("stored forecast", source)
+
+
+    @patch('models.http_transport.requests.Session.get')
+    def test_nearby_coordinates_share_one_request(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            'dailyInfo': [{'pollenTypeInfo': [{'code': 'GRASS', 'indexInfo': {'value': 2}}]}]
+        }
+        mock_response.raise_for_status = MagicMock()
+        mock_get.return_value = mock_response
+
+        model = PollenModel(api_key="fake-key", store_path=self.store_path, grid_resolution=0.1)
+        decatur, _ = model.fetch_pollen_data(33.774, -84.296)
+        druid_hills, source = model.fetch_pollen_data(33.780, -84.325)
+        savannah, _ = model.fetch_pollen_data(32.081, -81.091)
+
+        self.assertEqual(decatur, druid_hills)
+        self.assertIn("stored forecast", source)
+        self.assertEqual(mock_get.call_count, 2)  # one call for the Decatur cell, one for Savannah
+
+    @patch('models.http_transport.requests.Session.get')
+    def test_expired_cell_is_refetched(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            'dailyInfo': [{'pollenTypeInfo': [{'code': 'WEED', 'indexInfo': {'value': 1}}]}]
+        }
+        mock_response.raise_for_status = MagicMock()
+        mock_get.return_value = mock_response
+
+        model = PollenModel(api_key="fake-key", store_path=self.store_path, cache_ttl=-1)
+        model.fetch_pollen_data()
+        model.fetch_pollen_data()
+
+        self.assertEqual(mock_get.call_count, 2)
 
 
 if __name__ == "__main__":
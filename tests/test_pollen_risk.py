@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unittest
+import numpy as np
+import pandas as pd
+from models.pollen_model import PollenModel
+from models.pollen_risk import RiskTable, load_risk_table
+
+POLLEN_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'pollen_atlanta_23_24.csv')
+
+
+class TestPollenRisk(unittest.TestCase):
+
+    def setUp(self):
+        self.table = load_risk_table()
+
+    # ---------- Test: A whole history is classified in one call ----------
+    def test_classify_frame_reproduces_species_risk_columns(self):
+        history = pd.read_csv(POLLEN_CSV)
+        risks = self.table.classify_frame(history)
+        species = [column for column in risks.columns if column.startswith('PredictedSpeciesRisk.')]
+        self.assertEqual(len(species), 11)
+        for column in species:
+            self.assertEqual(list(risks[column]), list(history[column[len('Predicted'):]]), column)
+        self.assertIn('PredictedRisk.tree_pollen', risks.columns)
+        self.assertEqual(len(risks), len(history))
+        # Joining the result back never overwrites the CSV's own labels
+        self.assertFalse(set(risks.columns) & set(history.columns))
+        self.assertEqual(len(history.join(risks).columns), len(history.columns) + len(risks.columns))
+
+    # ---------- Test: Bounds are inclusive, missing counts are Unknown ----------
+    def test_classify_bounds_and_missing(self):
+        counts = np.array([0, 28, 29, 57, 58, 176, 177, np.nan])
+        self.assertEqual(list(self.table.classify(counts, 'Species.Tree.Oak')),
+                         ['Low', 'Low', 'Moderate', 'Moderate', 'High', 'High', 'Very High', 'Unknown'])
+        self.assertEqual(list(self.table.classify(pd.Series([10, 60]), 'Grass Pollen')), ['Moderate', 'High'])
+        self.assertEqual(list(self.table.classify([1, 2], 'Count.mold')), ['Unknown', 'Unknown'])
+
+    def test_rejects_unsorted_thresholds(self):
+        with self.assertRaises(ValueError):
+            RiskTable(['Low', 'High'], {'Count.tree_pollen': [5, 1]})
+
+    # ---------- Test: Index text and color accept scalars and arrays ----------
+    def test_index_text_and_color(self):
+        self.assertEqual(PollenModel.get_pollen_level_text(3), 'Moderate')
+        self.assertEqual(PollenModel.get_pollen_color(5), 'red')
+        self.assertEqual(PollenModel.get_pollen_level_text(9), 'Unknown')
+        self.assertEqual(PollenModel.get_pollen_color(-1), 'gray')
+        self.assertEqual(list(PollenModel.get_pollen_level_text(np.array([0, 1, 2, 6]))),
+                         ['None', 'Very Low', 'Low', 'Unknown'])
+        self.assertEqual(list(PollenModel.get_pollen_color([1, 4])), ['darkgreen', 'orange'])
+
+    # ---------- Test: Anything but an integer 0-5 is Unknown, like the old dict lookups ----------
+    def test_index_lookup_rejects_non_integers(self):
+        for value in (None, 2.7, float('nan'), "3", -1, 6):
+            self.assertEqual(PollenModel.get_pollen_color(value), 'gray', value)
+            self.assertEqual(PollenModel.get_pollen_level_text(value), 'Unknown', value)
+        self.assertEqual(PollenModel.get_pollen_color(2.0), 'lightgreen')
+        self.assertEqual(list(PollenModel.get_pollen_level_text([3, None, 4.5, np.int64(5)])),
+                         ['Moderate', 'Unknown', 'Unknown', 'Very High'])
+        self.assertEqual(list(PollenModel.get_pollen_color(np.array([1.0, np.nan, 2.5]))),
+                         ['darkgreen', 'gray', 'gray'])
+
+
+if __name__ == '__main__':
+    unittest.main()
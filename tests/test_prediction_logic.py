@@ -0,0 +1,199 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from datetime import date, timedelta
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+from features.prediction_logic import PollenPredictor
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'merged_pollen_weather_data.csv')
+WEATHER = {'temp': 75.0, 'min_temp': 18.0, 'max_temp': 28.0, 'precip': 0.0, 'wind_spd': 2.0,
+           'day_of_year': 120, 'month': 4}
+
+
+class TestPollenPredictorPersistence(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_path = os.path.join(self.tmp_dir, 'merged.csv')
+        self.model_path = os.path.join(self.tmp_dir, 'models.joblib')
+        shutil.copy(DATA_FILE, self.data_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def predictor(self):
+        return PollenPredictor(self.data_path, self.model_path)
+
+    # ---------- Test: Saved models are reused without retraining ----------
+    def test_models_are_trained_once_then_loaded(self):
+        first = self.predictor()
+        self.assertTrue(first.ensure_models())
+        self.assertTrue(os.path.exists(self.model_path))
+
+        second = self.predictor()
+        with patch.object(PollenPredictor, 'train_models', side_effect=AssertionError("retrained")):
+            self.assertFalse(second.ensure_models())
+        self.assertEqual(second.predict_pollen(WEATHER), first.predict_pollen(WEATHER))
+        self.assertIsNone(second.data)  # Loading models does not read the training data
+
+    # ---------- Test: Data or configuration changes invalidate the artifact ----------
+    def test_changed_data_or_features_retrain(self):
+        self.predictor().ensure_models()
+
+        with open(self.data_path, 'a') as f:
+            with open(DATA_FILE) as source:
+                f.write(source.readlines()[1])
+        self.assertTrue(self.predictor().ensure_models())
+        self.assertFalse(self.predictor().ensure_models())
+
+        reconfigured = self.predictor()
+        reconfigured.feature_columns_extended = reconfigured.feature_columns + ['day_of_year']
+        self.assertFalse(reconfigured.load_models())
+
+    def test_corrupt_artifact_retrains(self):
+        with open(self.model_path, 'wb') as f:
+            f.write(b'not a model')
+        self.assertTrue(self.predictor().ensure_models())
+        self.assertFalse(self.predictor().ensure_models())
+
+
+class TestPollenPredictorBatch(unittest.TestCase):
+
+    # ---------- Test: One multi-output solve matches per-target fits ----------
+    def test_batch_matches_separate_regressions(self):
+        predictor = PollenPredictor(DATA_FILE, model_path=os.path.join(tempfile.mkdtemp(), 'models.joblib'))
+        predictor.train_models()
+        clean = predictor.data.dropna(subset=predictor.pollen_types + predictor.feature_columns_extended)
+        X = clean[predictor.feature_columns_extended].to_numpy(dtype=float)
+
+        batch = predictor.predict_batch(X)
+        self.assertEqual(batch.shape, (len(X), len(predictor.pollen_types)))
+        for column, pollen_type in enumerate(predictor.pollen_types):
+            scaler = StandardScaler().fit(X)
+            expected = LinearRegression().fit(scaler.transform(X), clean[pollen_type]).predict(scaler.transform(X))
+            np.testing.assert_allclose(batch[:, column], np.maximum(expected, 0), rtol=1e-6, atol=1e-6)
+
+        single = predictor.predict_pollen(WEATHER)
+        self.assertEqual(list(single), predictor.pollen_types)
+        self.assertTrue(all(count >= 0 for count in single.values()))
+        shutil.rmtree(os.path.dirname(predictor.model_path), ignore_errors=True)
+
+
+class TestClimatology(unittest.TestCase):
+
+    # ---------- Test: Table rows equal the masked medians they replace ----------
+    def test_climatology_matches_windowed_medians(self):
+        predictor = PollenPredictor(DATA_FILE, model_path=os.path.join(tempfile.mkdtemp(), 'models.joblib'))
+        table = predictor.build_climatology()
+        self.assertEqual(len(table), 366)
+        data = predictor.data
+
+        for day in (date(2024, 1, 2), date(2024, 6, 15), date(2024, 12, 30), date(2024, 12, 31)):
+            day_of_year = day.timetuple().tm_yday
+            distance = abs(data['day_of_year'] - day_of_year)
+            similar = data[(distance <= 7) | (distance >= 358)]
+            pattern = predictor.get_historical_weather_pattern(day)
+            for column in predictor.feature_columns:
+                self.assertAlmostEqual(pattern[column], similar[column].median(), msg=f"{day} {column}")
+            self.assertEqual((pattern['day_of_year'], pattern['month']), (day_of_year, day.month))
+        shutil.rmtree(os.path.dirname(predictor.model_path), ignore_errors=True)
+
+    def test_saved_models_include_climatology(self):
+        tmp_dir = tempfile.mkdtemp()
+        model_path = os.path.join(tmp_dir, 'models.joblib')
+        PollenPredictor(DATA_FILE, model_path).ensure_models()
+
+        loaded = PollenPredictor(DATA_FILE, model_path)
+        loaded.ensure_models()
+        forecasts = [loaded.get_daily_forecast(date(2025, 1, 1) + timedelta(days=i)) for i in range(365)]
+        self.assertEqual(len(forecasts), 365)
+        self.assertIsNone(loaded.data)  # Served from the artifact without reading the CSV
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+class TestForecastRange(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.predictor = PollenPredictor(DATA_FILE, os.path.join(self.tmp_dir, 'models.joblib'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    # ---------- Test: Tidy frame with one row per date and pollen type ----------
+    def test_forecast_range_is_tidy(self):
+        frame = self.predictor.forecast_range('2025-02-27', date(2025, 3, 2))
+        self.assertEqual(list(frame.columns),
+                         ['date', 'day_name', 'pollen_type', 'count', 'risk_level', 'p10', 'p50', 'p90'])
+        self.assertEqual(len(frame), 4 * 3)
+        self.assertEqual(list(frame['pollen_type'][:3]), ['Tree Pollen', 'Grass Pollen', 'Weed Pollen'])
+        self.assertEqual(frame['day_name'].iloc[0], 'Thursday')
+        self.assertTrue((frame['count'] >= 0).all())
+        self.assertTrue(set(frame['risk_level']) <= set(self.predictor.risk_table.levels))
+
+        # The dict API is a view over the same rows
+        daily = self.predictor.get_daily_forecast('2025-03-01')
+        rows = frame[frame['date'] == '2025-03-01']
+        self.assertEqual(daily['day_name'], 'Saturday')
+        for row in rows.to_dict('records'):
+            self.assertEqual(daily['predictions'][row['pollen_type']],
+                             {column: row[column] for column in ('count', 'risk_level', 'p10', 'p50', 'p90')})
+
+        three_day = self.predictor.get_three_day_forecast('2025-02-26')
+        self.assertEqual([forecast['date'] for forecast in three_day], ['2025-02-27', '2025-02-28', '2025-03-01'])
+
+    def test_classify_risk_matches_thresholds(self):
+        counts = [0, 9, 9.1, 49, 50, 199, 200]
+        self.assertEqual(list(self.predictor.classify_risk(counts, 'Count.grass_pollen')),
+                         ['Low', 'Low', 'Moderate', 'Moderate', 'High', 'High', 'Very High'])
+        self.assertEqual(self.predictor.get_risk_level(14, 'Count.tree_pollen'), 'Low')
+        self.assertEqual(self.predictor.get_risk_level(1500, 'Count.tree_pollen'), 'Very High')
+        self.assertEqual(self.predictor.get_risk_level(5, 'Count.mold'), 'Unknown')
+
+
+class TestBootstrapEnsemble(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.model_path = os.path.join(self.tmp_dir, 'models.joblib')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    # ---------- Test: Parallel fitting gives the same members as serial fitting ----------
+    def test_ensemble_does_not_depend_on_workers(self):
+        serial = PollenPredictor(DATA_FILE, self.model_path, ensemble_size=12, n_jobs=1)
+        serial.train_models()
+        parallel = PollenPredictor(DATA_FILE, self.model_path, ensemble_size=12, n_jobs=3)
+        parallel.train_models()
+        self.assertEqual(serial.ensemble_weights.shape, (12, len(serial.feature_columns_extended), 3))
+        np.testing.assert_allclose(parallel.ensemble_weights, serial.ensemble_weights)
+        np.testing.assert_allclose(parallel.ensemble_bias, serial.ensemble_bias)
+
+    # ---------- Test: Bands are ordered, non-negative and saved with the models ----------
+    def test_band_is_ordered_and_persisted(self):
+        predictor = PollenPredictor(DATA_FILE, self.model_path, ensemble_size=40)
+        predictor.ensure_models()
+        frame = predictor.forecast_range('2025-01-01', '2025-12-31')
+        self.assertTrue((frame['p10'] >= 0).all())
+        self.assertTrue(((frame['p10'] <= frame['p50']) & (frame['p50'] <= frame['p90'])).all())
+        self.assertGreater((frame['p90'] - frame['p10']).max(), 0)
+
+        loaded = PollenPredictor(DATA_FILE, self.model_path, ensemble_size=40)
+        with patch.object(PollenPredictor, 'train_models', side_effect=AssertionError("retrained")):
+            self.assertFalse(loaded.ensure_models())
+        np.testing.assert_allclose(loaded.predict_band([list(WEATHER.values())]),
+                                      predictor.predict_band([list(WEATHER.values())]))
+
+        # A different ensemble size is a different model
+        self.assertFalse(PollenPredictor(DATA_FILE, self.model_path, ensemble_size=41).load_models())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import date
+from unittest.mock import Mock, patch
+from features.prefetch_scheduler import PrefetchScheduler
+from models.weather_model import WeatherModel
+
+
+class TestPrefetchScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp_dir, "weather_log.csv")
+        with open(self.log_file, "w") as f:
+            f.write("date, city, temperature, description, humidity, data_source\n")
+            f.write("2025-01-01, Atlanta, 50, clear sky, 40, Open Weather API Data\n")
+            f.write("2025-01-01, Atlanta, 51, clear sky, 40, Open Weather API Data\n")
+            f.write("2025-01-01, Atlanta, 52, clear sky, 40, Open Weather API Data\n")
+            f.write("2025-03-01, New York, 40, light rain, 80, Open Weather API Data\n")
+            f.write("2025-03-01, new  york, 41, light rain, 80, Open Weather API Data\n")
+            f.write("2025-02-20, Boston, 30, snow, 90, Open Weather API Data\n")
+
+        self.model = Mock()
+        self.model.normalize_city_name = WeatherModel.normalize_city_name
+        self.model.cache = set()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_rank_cities_weighs_recency_and_frequency(self):
+        scheduler = PrefetchScheduler(self.model, self.log_file, half_life_days=7)
+        ranking = scheduler.rank_cities(today=date(2025, 3, 1))
+
+        # Two lookups today beat three lookups two months ago
+        self.assertEqual([city for city, _ in ranking], ["new york", "boston", "atlanta"])
+        self.assertAlmostEqual(ranking[0][1], 2.0)
+
+    def test_run_once_skips_cached_cities_and_respects_budget(self):
+        self.model.cache = {"new york"}
+        self.model.fetch_many.side_effect = lambda cities: ((city, {"temp": 1}, "Open Weather API Data")
+                                                           for city in cities)
+        scheduler = PrefetchScheduler(self.model, self.log_file, budget=1)
+
+        fetched = scheduler.run_once()
+
+        self.assertEqual(len(fetched), 1)
+        self.assertNotIn("new york", fetched)
+        self.model.fetch_many.assert_called_once()
+
+    def test_run_once_pauses_when_rate_limited(self):
+        source = "Failed to fetch weather data after 3 attempts. Last error: API rate limited (attempt 3/3)"
+        self.model.fetch_many.side_effect = lambda cities: ((city, None, source) for city in cities)
+        scheduler = PrefetchScheduler(self.model, self.log_file, budget=5, rate_limit_pause=60)
+
+        self.assertEqual(len(scheduler.run_once()), 3)
+        self.assertTrue(scheduler.is_paused())
+        self.assertEqual(scheduler.run_once(), [])
+
+        scheduler.resume()
+        self.assertFalse(scheduler.is_paused())
+
+    def test_first_cycle_waits_one_interval(self):
+        cycles = threading.Event()
+        scheduler = PrefetchScheduler(self.model, self.log_file, interval=0.3)
+        with patch.object(scheduler, 'run_once', side_effect=lambda: cycles.set() or []) as run_once:
+            scheduler.start()
+            try:
+                # Nothing is fetched while the app's first load is still running
+                self.assertFalse(cycles.wait(0.1))
+                self.assertTrue(cycles.wait(5))
+            finally:
+                scheduler.stop()
+        self.assertGreaterEqual(run_once.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+from features.recent_ring import RecentReadingsRing
+from features.weather_logger import WeatherLogger
+
+
+def reading(day: date, temp: float):
+    return {"date": day, "temp": temp, "description": "clear sky", "humidity": 40}
+
+
+class TestRecentReadingsRing(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "recent.ring")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    # ---------- Test: Last N days come back oldest first ----------
+    def test_last_days_wraps_around_the_ring(self):
+        ring = RecentReadingsRing(self.path, days=8, max_cities=4)
+        start = date(2025, 7, 1)
+        for i in range(20):
+            ring.record("Atlanta", reading(start + timedelta(days=i), 70.0 + i))
+        ring.record("Atlanta", reading(start + timedelta(days=19), 99.0))  # Replaces the same day
+
+        recent = ring.last_days("ATLANTA", 7, today=start + timedelta(days=19))
+        self.assertEqual(list(recent['temp']), [83.0, 84.0, 85.0, 86.0, 87.0, 88.0, 99.0])
+        self.assertEqual(str(recent['date'][0]), "2025-07-14")
+        # Days that were never written (or fell out of the ring) are left out
+        self.assertEqual(len(ring.last_days("Atlanta", 7, today=start + timedelta(days=30))), 0)
+        self.assertEqual(len(ring.last_days("Boston", 7)), 0)
+        ring.close()
+
+    # ---------- Test: Views are zero-copy and shared between instances ----------
+    def test_views_map_the_file_and_size_is_fixed(self):
+        writer = RecentReadingsRing(self.path, days=8, max_cities=4)
+        reader = RecentReadingsRing(self.path, days=99, max_cities=99)  # The file's geometry wins
+        self.assertEqual((reader.days, reader.max_cities), (8, 4))
+        size = os.path.getsize(self.path)
+
+        writer.record("New York", reading(date(2025, 7, 1), 75.0))
+        view = reader.city_days("new york")
+        self.assertFalse(view.flags.owndata)
+        writer.record("New York", reading(date(2025, 7, 2), 76.0))
+        self.assertIn(76.0, list(view['temp']))  # Same memory, no re-read
+
+        for city in ("A", "B", "C"):
+            self.assertTrue(writer.record(city, reading(date(2025, 7, 1), 1.0)))
+        self.assertFalse(writer.record("D", reading(date(2025, 7, 1), 1.0)))  # Directory full
+        self.assertEqual(os.path.getsize(self.path), size)
+        del view
+        writer.close()
+        reader.close()
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"date, city\n" * 20)
+        with self.assertRaises(ValueError):
+            RecentReadingsRing(self.path)
+
+    # ---------- Test: WeatherLogger fills the ring alongside the CSV ----------
+    def test_weather_logger_writes_ring(self):
+        logger = WeatherLogger(os.path.join(self.tmp_dir, "weather_log.csv"), buffered=True, ring_file=self.path)
+        logger.log_weather_data("Atlanta", reading(date(2025, 7, 1), 88.5), "Open Weather API Data")
+        # Visible right away, before the buffered CSV line is written
+        self.assertEqual(list(logger.recent("Atlanta", today=date(2025, 7, 1))['temp']), [88.5])
+        logger.close()
+        with self.assertRaises(RuntimeError):
+            WeatherLogger(os.path.join(self.tmp_dir, "other.csv")).recent("Atlanta")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import math
+from datetime import date
+from models.records import PollenReading, WeatherObservation
+
+
+# ---------- Test: records behave like the dicts they replace ----------
+def test_weather_observation_is_dict_compatible():
+    obs = WeatherObservation(date(2025, 7, 1), 88.5, "clear sky", 40, lat=33.7, lon=-84.4)
+
+    assert obs["temp"] == 88.5
+    assert obs.get("lat") == 33.7
+    assert obs.get("missing") is None
+    assert "humidity" in obs
+    assert dict(obs) == {"date": date(2025, 7, 1), "temp": 88.5, "description": "clear sky",
+                         "humidity": 40, "lat": 33.7, "lon": -84.4}
+    assert not hasattr(obs, "__dict__")
+
+
+# ---------- Test: repeated strings share one object ----------
+def test_strings_are_interned():
+    first = WeatherObservation(date(2025, 7, 1), 80, "".join(["light ", "rain"]), 90)
+    second = WeatherObservation(date(2025, 7, 2), 81, "".join(["light", " rain"]), 91)
+    assert first.description is second.description
+
+    reading = PollenReading(1, 2, 3, ["".join(["Tree: ", "Wear a mask"])])
+    other = PollenReading(1, 2, 3, ["".join(["Tree: Wear", " a mask"])])
+    assert reading.health_recommendations[0] is other.health_recommendations[0]
+
+
+# ---------- Test: columnar round trip ----------
+def test_columnar_round_trip():
+    observations = [
+        WeatherObservation(date(2025, 7, 1), 88.5, "clear sky", 40, lat=33.7, lon=-84.4),
+        WeatherObservation(date(2025, 7, 2), 70.0, "rain", 95),
+    ]
+    columns = WeatherObservation.to_columns(observations)
+    assert columns["temp"].typecode == "d"
+    assert math.isnan(columns["lat"][1])
+    assert WeatherObservation.from_columns(columns) == observations
+
+    readings = [PollenReading(1, 2, 3, ["Grass: Stay inside"]), PollenReading(0, 5, 4)]
+    assert PollenReading.from_columns(PollenReading.to_columns(readings)) == readings
@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import queue
+import threading
+import unittest
+from controllers.refresh_pipeline import RefreshPipeline
+
+
+class TestRefreshPipeline(unittest.TestCase):
+
+    def setUp(self):
+        # Stand-in for main_window.after: callbacks are queued and run on the test thread
+        self.gui_queue = queue.Queue()
+        self.pipeline = RefreshPipeline(self.gui_queue.put, max_workers=4)
+
+    def tearDown(self):
+        self.pipeline.shutdown()
+
+    def run_gui_callback(self):
+        self.gui_queue.get(timeout=2)()
+
+    def test_jobs_run_in_parallel_and_deliver_together(self):
+        barrier = threading.Barrier(2, timeout=2)  # both jobs must be running at the same time
+        delivered = []
+
+        def job(value):
+            barrier.wait()
+            return value, "source"
+
+        self.pipeline.submit("dashboard", {'weather': lambda: job(1), 'pollen': lambda: job(2)}, delivered.append)
+        self.run_gui_callback()
+
+        self.assertEqual(delivered, [{'weather': (1, "source"), 'pollen': (2, "source")}])
+        self.assertFalse(self.pipeline.is_busy("dashboard"))
+
+    def test_superseded_request_is_dropped(self):
+        release = threading.Event()
+        delivered = []
+
+        self.pipeline.submit("search", {'weather': lambda: release.wait(2) and ("old", "")}, delivered.append)
+        self.pipeline.submit("search", {'weather': lambda: ("new", "")}, delivered.append)
+        self.run_gui_callback()
+        release.set()
+
+        self.assertEqual(delivered, [{'weather': ("new", "")}])
+        self.assertTrue(self.gui_queue.empty())
+
+    def test_job_exception_reported_as_error_tuple(self):
+        delivered = []
+
+        def failing_job():
+            raise RuntimeError("boom")
+
+        self.pipeline.submit("search", {'weather': failing_job}, delivered.append)
+        self.run_gui_callback()
+
+        data, source = delivered[0]['weather']
+        self.assertIsNone(data)
+        self.assertIn("boom", source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import threading
+import time
+import unittest
+from models.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(ttl=600, max_entries=2, max_stale=3600, clock=self.clock)
+
+    def test_hit_after_miss(self):
+        calls = []
+        loader = lambda: calls.append(1) or "value"
+
+        self.assertEqual(self.cache.get_or_load("atlanta", loader), "value")
+        self.assertEqual(self.cache.get_or_load("atlanta", loader), "value")
+
+        self.assertEqual(len(calls), 1)
+        stats = self.cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+
+    def test_lru_eviction(self):
+        self.cache.get_or_load("a", lambda: 1)
+        self.cache.get_or_load("b", lambda: 2)
+        self.cache.get_or_load("a", lambda: 1)  # a is now most recently used
+        self.cache.get_or_load("c", lambda: 3)
+
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_failed_loads_are_not_cached(self):
+        self.cache.get_or_load("x", lambda: None)
+        self.assertNotIn("x", self.cache)
+
+    def test_stale_entry_served_while_refreshing(self):
+        self.cache.get_or_load("a", lambda: "old")
+        self.clock.now = 700  # past ttl, within max_stale
+
+        refreshed = threading.Event()
+
+        def refresh():
+            refreshed.set()
+            return "new"
+
+        self.assertEqual(self.cache.get_or_load("a", refresh), "old")
+        self.assertTrue(refreshed.wait(2))
+        for _ in range(100):
+            if "a" in self.cache:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.cache.get_or_load("a", lambda: "unused"), "new")
+        self.assertEqual(self.cache.stats()['stale_hits'], 1)
+
+    def test_concurrent_misses_share_one_load(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            started.set()
+            release.wait(2)
+            return "value"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(self.cache.get_or_load("k", slow_loader)))
+        leader.start()
+        started.wait(2)
+        followers = [threading.Thread(target=lambda: results.append(self.cache.get_or_load("k", slow_loader)))
+                     for _ in range(4)]
+        for t in followers:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in [leader] + followers:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 5)
+        self.assertEqual(self.cache.stats()['coalesced'], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
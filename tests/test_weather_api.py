@@ -7,7 +7,7 @@ from unittest.mock import patch, Mock
 from models.weather_model import WeatherModel
 
 # ---------- Test: fetch_weather_data (success) ----------
-@patch('models.weather_model.requests.get')
+@patch('models.http_transport.requests.Session.get')
 def test_fetch_weather_data_success(mock_get):
     dummy_response = {
         "dt": 1721455200,  # Example timestamp
@@ -26,7 +26,7 @@ def test_fetch_weather_data_success(mock_get):
     mock_response.raise_for_status = Mock()
     mock_get.return_value = mock_response
 
-    wm = WeatherModel(api_key="dummy")
+    wm = WeatherModel(api_key="dummy", gazetteer_path=None)
     data, source = wm.fetch_weather_data("Miami")
     
     assert data is not None
@@ -36,22 +36,104 @@ def test_fetch_weather_data_success(mock_get):
     assert "Open Weather API" in source
 
 # ---------- Test: fetch_weather_data (timeout) ----------
-@patch('models.weather_model.requests.get', side_effect=requests.exceptions.Timeout)
+@patch('models.http_transport.requests.Session.get', side_effect=requests.exceptions.Timeout)
 def test_fetch_weather_data_timeout(mock_get):
-    wm = WeatherModel(api_key="dummy")
+    wm = WeatherModel(api_key="dummy", gazetteer_path=None)
     data, source = wm.fetch_weather_data("Chicago")
     
     assert data is None
     assert "timed out" in source
 
 # ---------- Test: fetch_weather_data (HTTP error) ----------
-@patch('models.weather_model.requests.get')
+@patch('models.http_transport.requests.Session.get')
 def test_fetch_weather_data_http_error(mock_get):
     mock_response = Mock()
     mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=Mock(status=404))
     mock_get.return_value = mock_response
 
-    wm = WeatherModel(api_key="dummy")
+    wm = WeatherModel(api_key="dummy", gazetteer_path=None)
     data, source = wm.fetch_weather_data("Atlantis")  # Invalid city for test
 
     assert data is None
+
+# ---------- Test: fetch_many (batch of cities) ----------
+@patch('models.http_transport.requests.Session.get')
+def test_fetch_many_returns_result_per_city(mock_get):
+    def fake_get(url, params=None, timeout=None):
+        if params["q"] == "atlantis":
+            response = Mock()
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=Mock(status_code=404))
+            return response
+        response = Mock()
+        response.json.return_value = {
+            "dt": 1721455200,
+            "main": {"temp": 70.0, "humidity": 50},
+            "weather": [{"description": "few clouds"}]
+        }
+        response.raise_for_status = Mock()
+        return response
+
+    mock_get.side_effect = fake_get
+
+    wm = WeatherModel(api_key="dummy", requests_per_second=1000, gazetteer_path=None)
+    results = {city: (data, source) for city, data, source in wm.fetch_many(["Miami", "Boston", "Miami", "Atlantis"])}
+
+    assert set(results) == {"Miami", "Boston", "Atlantis"}
+    assert results["Miami"][0]["temp"] == 70.0
+    assert results["Boston"][1] == "Open Weather API Data"
+    assert results["Atlantis"][0] is None
+    assert "404" in results["Atlantis"][1]
+
+# ---------- Test: repeat lookups are served from the cache ----------
+@patch('models.http_transport.requests.Session.get')
+def test_fetch_weather_data_uses_cache(mock_get):
+    mock_response = Mock()
+    mock_response.json.return_value = {
+        "dt": 1721455200,
+        "main": {"temp": 80.1, "humidity": 40},
+        "weather": [{"description": "clear sky"}]
+    }
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+
+    wm = WeatherModel(api_key="dummy", requests_per_second=1000, gazetteer_path=None)
+    first, _ = wm.fetch_weather_data("New York")
+    second, _ = wm.fetch_weather_data("  new   york ")
+
+    assert first == second
+    mock_get.assert_called_once()
+    assert mock_get.call_args.kwargs["params"]["q"] == "new york"  # Name search, not a gazetteer ID
+    assert wm.cache_stats()["hits"] == 1
+
+# ---------- Test: cities with known IDs are batched into group requests ----------
+@patch('models.http_transport.requests.Session.get')
+def test_fetch_many_packs_known_ids_into_group_requests(mock_get, tmp_path):
+    gazetteer_path = tmp_path / "city_gazetteer.csv"
+    with open(gazetteer_path, "w") as f:
+        f.write("name,id,lat,lon,country\n")
+        for i in range(25):
+            f.write(f"City {i},{1000 + i},10.0,20.0,US\n")
+
+    def fake_get(url, params=None, timeout=None):
+        response = Mock()
+        response.raise_for_status = Mock()
+        ids = [int(city_id) for city_id in params["id"].split(",")]
+        response.json.return_value = {"cnt": len(ids), "list": [{
+            "id": city_id,
+            "dt": 1721455200,
+            "coord": {"lat": 10.0, "lon": 20.0},
+            "main": {"temp": 60.0 + city_id % 10, "humidity": 50},
+            "weather": [{"description": "few clouds"}]
+        } for city_id in ids]}
+        return response
+
+    mock_get.side_effect = fake_get
+
+    wm = WeatherModel(api_key="dummy", requests_per_second=1000, gazetteer_path=str(gazetteer_path))
+    results = {city: data for city, data, _ in wm.fetch_many([f"City {i}" for i in range(25)])}
+
+    assert len(results) == 25
+    assert results["City 3"]["temp"] == 63.0
+    assert mock_get.call_count == 2  # 20 + 5 cities
+    assert all(call.args[0].endswith("/group") for call in mock_get.call_args_list)
+    assert "city 3" in wm.cache  # Group results answer later single lookups
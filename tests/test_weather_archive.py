@@ -0,0 +1,101 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from features.weather_archive import WeatherArchive, archive_closed_days
+
+HEADER = "date, city, temperature, description, humidity, data_source\n"
+LINES = [
+    "2025-06-28, Atlanta, 86.81, scattered clouds, 56, Open Weather API Data\n",
+    "2025-06-30, New York, 75.2, clear sky, 40, Open Weather API Data\n",
+    "2025-07-01, Atlanta, 88.5, clear sky, 40, Open Weather API Data\n",
+    "2025-07-02, Atlanta, 90.1, broken clouds, 45, Open Weather API Data\n",
+    "2025-07-03, Atlanta, 91.0, clear sky, 38, Open Weather API Data\n",
+]
+
+
+class TestWeatherArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp_dir, "weather_log.csv")
+        self.archive = WeatherArchive(os.path.join(self.tmp_dir, "archive"))
+        with open(self.log_file, "w") as f:
+            f.write(HEADER)
+            f.writelines(LINES)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    # ---------- Test: Rotation keeps the current day in the log ----------
+    def test_archive_closed_days_moves_past_lines(self):
+        self.assertEqual(archive_closed_days(self.log_file, self.archive, today=date(2025, 7, 3)), 4)
+        with open(self.log_file) as f:
+            self.assertEqual(f.readlines(), [HEADER, LINES[4]])
+        self.assertEqual(len(self.archive.scan()), 4)
+        # Nothing left to archive
+        self.assertEqual(archive_closed_days(self.log_file, self.archive, today=date(2025, 7, 3)), 0)
+
+    # ---------- Test: Partitions are pruned by month and city ----------
+    def test_partition_pruning(self):
+        archive_closed_days(self.log_file, self.archive, today=date(2025, 7, 4))
+        names = [os.path.relpath(p, self.archive.root) for p in self.archive.partitions()]
+        self.assertEqual(names, [os.path.join("2025-06", "atlanta.npz"), os.path.join("2025-06", "new_york.npz"),
+                                 os.path.join("2025-07", "atlanta.npz")])
+        self.assertEqual(len(self.archive.partitions(city="ATLANTA")), 2)
+        self.assertEqual(len(self.archive.partitions(start="2025-07-01")), 1)
+        self.assertEqual(self.archive.partitions(city="Chicago"), [])
+
+    # ---------- Test: Scans return typed, filtered columns ----------
+    def test_scan_filters_rows_and_columns(self):
+        archive_closed_days(self.log_file, self.archive, today=date(2025, 7, 4))
+        frame = self.archive.scan(columns=['temp'], city="atlanta", start="2025-07-02", end=date(2025, 7, 3))
+        self.assertEqual(list(frame.columns), ['city', 'temp'])
+        self.assertEqual(list(frame['temp']), [90.1, 91.0])
+        self.assertEqual(str(frame['temp'].dtype), "float64")
+
+        frame = self.archive.scan(start="2025-06-30", end="2025-06-30")
+        self.assertEqual(list(frame['city']), ["New York"])
+        self.assertEqual(list(frame['description']), ["clear sky"])
+        self.assertEqual(str(frame['date'].iloc[0].date()), "2025-06-30")
+        with self.assertRaises(ValueError):
+            self.archive.scan(columns=['pressure'])
+
+    # ---------- Test: Later runs append to existing partitions ----------
+    def test_append_merges_into_existing_partition(self):
+        archive_closed_days(self.log_file, self.archive, today=date(2025, 7, 2))
+        with open(self.log_file, "a") as f:
+            f.write("2025-07-04, Atlanta, 92.3, thunderstorm, 70, Open Weather API Data\n")
+        archive_closed_days(self.log_file, self.archive, today=date(2025, 7, 5))
+
+        frame = self.archive.scan(columns=['date', 'description'], city="Atlanta", start="2025-07-01")
+        self.assertEqual([str(d.date()) for d in frame['date']], ["2025-07-01", "2025-07-02", "2025-07-03", "2025-07-04"])
+        self.assertEqual(list(frame['description']), ["clear sky", "broken clouds", "clear sky", "thunderstorm"])
+        with open(self.log_file) as f:
+            self.assertEqual(f.readlines(), [HEADER])
+
+    # ---------- Test: Cities sharing a partition file stay apart ----------
+    def test_colliding_partition_names_keep_both_cities(self):
+        day = date(2025, 7, 1)
+        self.archive.append([
+            {'date': day, 'city': "Winston-Salem", 'temp': 80.0, 'description': "clear sky", 'humidity': 40, 'source': "API"},
+            {'date': day, 'city': "Winston Salem", 'temp': 70.0, 'description': "fog", 'humidity': 90, 'source': "API"},
+        ])
+        self.archive.append([
+            {'date': day, 'city': "WINSTON-SALEM", 'temp': 81.0, 'description': "clear sky", 'humidity': 41, 'source': "API"},
+        ])
+        self.assertEqual(len(self.archive.partitions()), 1)
+
+        frame = self.archive.scan(columns=['temp'], city="Winston Salem")
+        self.assertEqual((list(frame['city']), list(frame['temp'])), (["Winston Salem"], [70.0]))
+        frame = self.archive.scan(columns=['temp'], city="winston-salem", start=day, end=day)
+        self.assertEqual((list(frame['city']), list(frame['temp'])), (["Winston-Salem"], [81.0]))
+        self.assertEqual(len(self.archive.scan()), 2)
+        self.assertEqual(self.archive.compact(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from features.weather_logger import WeatherLogger
+
+WEATHER = {"date": "2025-07-01", "temp": 88.5, "description": "clear sky", "humidity": 40}
+
+
+class TestWeatherLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp_dir, "weather_log.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def read_lines(self):
+        with open(self.log_file) as f:
+            return f.readlines()
+
+    def test_unbuffered_appends_line(self):
+        logger = WeatherLogger(self.log_file)
+        self.assertIsNone(logger.log_weather_data("Atlanta", WEATHER, "Open Weather API Data"))
+        self.assertEqual(self.read_lines(), ["2025-07-01, Atlanta, 88.5, clear sky, 40, Open Weather API Data\n"])
+        self.assertEqual(logger.log_weather_data("Atlanta", None, "x"), "No weather data to log")
+
+    def test_buffered_writes_in_batches_and_drains_on_close(self):
+        logger = WeatherLogger(self.log_file, buffered=True, flush_every=50, flush_interval=60)
+        threads = [threading.Thread(target=lambda n=n: [logger.log_weather_data(f"City {n}", WEATHER, "src")
+                                                        for _ in range(30)]) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertIsNone(logger.close())
+        lines = self.read_lines()
+        self.assertEqual(len(lines), 120)
+        self.assertEqual(sum(1 for line in lines if ", City 2, " in line), 30)
+
+    def test_flush_writes_partial_batch(self):
+        logger = WeatherLogger(self.log_file, buffered=True, flush_every=1000, flush_interval=60, fsync=True)
+        logger.log_weather_data("Atlanta", WEATHER, "src")
+
+        self.assertIsNone(logger.flush())
+        self.assertEqual(len(self.read_lines()), 1)
+        logger.close()
+
+    def test_buffered_write_error_is_returned_later(self):
+        bad_path = os.path.join(self.tmp_dir, "missing_dir", "weather_log.csv")
+        logger = WeatherLogger(bad_path, buffered=True)
+
+        self.assertIsNone(logger.log_weather_data("Atlanta", WEATHER, "src"))
+        error = logger.flush()
+        self.assertIn("Could not save data to log file", error)
+        self.assertIsNone(logger.close())
+
+
+class TestWeatherLogQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp_dir, "weather_log.csv")
+        with open(self.log_file, "w") as f:
+            f.write("date, city, temperature, description, humidity, data_source\n")
+            f.write("2025-07-01, Atlanta, 88.5, clear sky, 40, Open Weather API Data\n")
+            f.write("2025-07-02, New York, 80.0, light rain, 85, Open Weather API Data\n")
+            f.write("2025-07-03, atlanta, 90.1, few clouds, 45, Open Weather API Data\n")
+            f.write("2025-07-03, Paris, FR, 70.0, overcast clouds, 60, Open Weather API Data\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_query_by_city_dates_and_last(self):
+        logger = WeatherLogger(self.log_file)
+
+        atlanta = logger.query("ATLANTA")
+        self.assertEqual([entry["temp"] for entry in atlanta], [88.5, 90.1])
+        self.assertEqual(logger.query("Atlanta", last=1)[0]["description"], "few clouds")
+        self.assertEqual([entry["city"] for entry in logger.query(start="2025-07-02", end="2025-07-03")],
+                         ["New York", "atlanta", "Paris, FR"])
+        self.assertEqual(logger.query("Paris, FR")[0]["humidity"], 60)
+        self.assertEqual(logger.query("Boston"), [])
+
+    def test_query_tails_appended_lines_incrementally(self):
+        logger = WeatherLogger(self.log_file)
+        logger.query()
+        indexed_before = logger._index.offset
+
+        logger.log_weather_data("Atlanta", {"date": "2025-06-30", "temp": 85.0, "description": "haze",
+                                            "humidity": 50}, "Open Weather API Data")
+        with open(self.log_file, "a") as f:
+            f.write("2025-07-04, Atlanta, 91")  # Line still being written
+
+        entries = logger.query("Atlanta")
+        self.assertEqual([str(entry["date"]) for entry in entries], ["2025-06-30", "2025-07-01", "2025-07-03"])
+        self.assertEqual(logger._index.lines_indexed, 5)
+        self.assertGreater(logger._index.offset, indexed_before)
+
+        with open(self.log_file, "a") as f:
+            f.write(".0, sunny, 30, Open Weather API Data\n")
+        self.assertEqual(logger.query("Atlanta", last=1)[0]["temp"], 91.0)
+
+    def test_query_skips_torn_lines(self):
+        with open(self.log_file, "a") as f:
+            f.write("2025-07-01, Foo, bar, baz, qux, x, y\n")  # Two writers' lines interleaved
+            f.write("2025-07-04, Atlanta, 92.0, clear sky, 35, Open Weather API Data\n")
+        logger = WeatherLogger(self.log_file)
+
+        self.assertEqual([entry["temp"] for entry in logger.query("Atlanta")], [88.5, 90.1, 92.0])
+        self.assertEqual(len(logger.query()), 5)
+
+    def test_query_rereads_a_log_replaced_after_refresh(self):
+        logger = WeatherLogger(self.log_file)
+        logger.query()
+        index = logger._index
+        refresh = index.refresh
+        replaced = []
+
+        def refresh_then_replace():
+            refresh()
+            if not replaced:
+                # An archive run swaps the log between indexing and reading the lines
+                replacement = self.log_file + ".new"
+                with open(replacement, "w") as f:
+                    f.write("date, city, temperature, description, humidity, data_source\n"
+                            "2025-07-05, Chicago, 75.0, windy, 50, Open Weather API Data\n"
+                            "2025-07-05, Atlanta, 95.0, hot, 30, Open Weather API Data\n")
+                os.replace(replacement, self.log_file)
+                replaced.append(True)
+
+        with patch.object(index, 'refresh', side_effect=refresh_then_replace):
+            entries = logger.query("Atlanta")
+        self.assertEqual([entry["temp"] for entry in entries], [95.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
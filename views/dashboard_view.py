@@ -350,12 +350,24 @@ class WeatherView:
         self.change_theme(new_theme)
 
     def _on_refresh_clicked(self):
+        # The controller confirms with show_refresh() once the background refresh completes
         self.on_refresh_callback()
-        self.show_refresh()
+
+    def show_loading(self):
+        """Show that a dashboard refresh is in progress"""
+        self.refresh_button.config(text="⏳ Refreshing...")
+        self.weather_source_label.config(text="Weather: Loading...")
+        self.pollen_source_label.config(text="Pollen: Loading...")
+
+    def show_search_loading(self, city_name: str):
+        """Show that a search is in progress"""
+        if hasattr(self, 'search_temperature_label'):
+            self.search_data_source_label.config(text=f"Data Source: Searching for {city_name}...")
 
     def update_display(self, weather_data: Optional[Dict], weather_source: str,
                     pollen_data: Optional[Dict], pollen_source: str):
         """Update Dashboard tab displays with weather data"""
+        self.refresh_button.config(text="🔄 Refresh Data")
         
         # Update Dashboard tab only
         if weather_data:
@@ -442,6 +454,9 @@ class WeatherView:
 
     def show_warning(self, title: str, message: str):
         messagebox.showwarning(title, message)
+
+    def ask_yes_no(self, title: str, message: str) -> bool:
+        return messagebox.askyesno(title, message)
     
     def show_refresh(self):
         messagebox.showinfo(title="API Call Successful", message="Data has been refreshed")        
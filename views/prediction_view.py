@@ -114,6 +114,12 @@ def create_prediction_view(parent_frame, parent_view):
         }
         return risk_emojis.get(risk_level, '⚪')
     
+    def format_band(data):
+        """Ensemble range as '(p10–p90)', or '' for forecasts without a band"""
+        if 'p10' not in data:
+            return ""
+        return f"({data['p10']:.1f}–{data['p90']:.1f})"
+    
     def update_today_display(forecast):
         """Update today's forecast display"""
         predictions = forecast['predictions']
@@ -121,21 +127,21 @@ def create_prediction_view(parent_frame, parent_view):
         # Update tree pollen
         if 'Tree Pollen' in predictions:
             data = predictions['Tree Pollen']
-            today_tree_count.config(text=f"{data['count']:.1f}")
+            today_tree_count.config(text=f"{data['count']:.1f} {format_band(data)}")
             today_tree_risk.config(text=data['risk_level'])
             today_tree_status.config(text=get_risk_emoji(data['risk_level']))
         
         # Update grass pollen  
         if 'Grass Pollen' in predictions:
             data = predictions['Grass Pollen']
-            today_grass_count.config(text=f"{data['count']:.1f}")
+            today_grass_count.config(text=f"{data['count']:.1f} {format_band(data)}")
             today_grass_risk.config(text=data['risk_level'])
             today_grass_status.config(text=get_risk_emoji(data['risk_level']))
         
         # Update weed pollen
         if 'Weed Pollen' in predictions:
             data = predictions['Weed Pollen']
-            today_weed_count.config(text=f"{data['count']:.1f}")
+            today_weed_count.config(text=f"{data['count']:.1f} {format_band(data)}")
             today_weed_risk.config(text=data['risk_level'])
             today_weed_status.config(text=get_risk_emoji(data['risk_level']))
     
@@ -150,14 +156,16 @@ def create_prediction_view(parent_frame, parent_view):
             
             for pollen_type, data in forecast['predictions'].items():
                 emoji = get_risk_emoji(data['risk_level'])
-                text += f"{emoji} {pollen_type:15} | Count: {data['count']:6.1f} | Risk: {data['risk_level']}\n"
+                text += (f"{emoji} {pollen_type:15} | Count: {data['count']:6.1f} {format_band(data)} "
+                         f"| Risk: {data['risk_level']}\n")
             
             text += "\n"
         
         text += "=" * 50 + "\n"
         text += "📊 Risk Levels: 🟢 Low | 🟡 Moderate | 🟠 High | 🔴 Very High\n\n"
         text += "📈 Model Information:\n"
-        text += "• Model Type: Linear Regression\n"
+        text += f"• Model Type: Linear Regression (bootstrap ensemble of {predictor.ensemble_size})\n"
+        text += "• Ranges in brackets: 10th–90th percentile of the ensemble\n"
         text += "• Features: Temperature, Min/Max Temp, Precipitation, Wind Speed, Seasonal Patterns\n"
         text += "• Pollen Types: Tree, Grass, Weed\n"
         text += "• Predictions based on historical weather patterns for similar dates"
@@ -167,8 +175,8 @@ def create_prediction_view(parent_frame, parent_view):
     def load_predictions():
         """Load predictions in a separate thread"""
         try:
-            # Train models
-            predictor.train_models()
+            # Load the saved models (trains only if the data or configuration changed)
+            predictor.ensure_models()
             
             # Get today's forecast
             today = datetime.now().date()
@@ -217,6 +225,15 @@ def create_prediction_view(parent_frame, parent_view):
                                     "• The data is properly formatted")
         forecast_text.config(state="disabled")
     
-    # Start loading predictions in background thread
-    thread = threading.Thread(target=load_predictions, daemon=True)
-    thread.start()
\ No newline at end of file
+    loading_started = False
+
+    def start_loading(event=None):
+        """Start loading predictions in a background thread the first time the tab is shown"""
+        nonlocal loading_started
+        if loading_started:
+            return
+        loading_started = True
+        thread = threading.Thread(target=load_predictions, daemon=True)
+        thread.start()
+
+    parent_frame.bind("<Map>", start_loading, add="+")
\ No newline at end of file
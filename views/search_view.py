@@ -1,8 +1,12 @@
 # search_view.py
+import tkinter as tk  # Listbox for the typeahead dropdown
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from tkinter import messagebox  # Needed for error/warning dialogs
 
+SUGGEST_DELAY_MS = 150  # Wait for a pause in typing before looking up suggestions
+MAX_VISIBLE_SUGGESTIONS = 6
+
 def create_search_view(parent_frame, parent_view):
     """Create the search view content"""
     # Main container
@@ -33,8 +37,57 @@ def create_search_view(parent_frame, parent_view):
     city_entry = ttk.Entry(input_frame, width=15)
     city_entry.grid(row=1, column=2, pady=(10, 0))
 
+    # Typeahead dropdown below the entry, hidden until there are suggestions
+    suggestion_list = tk.Listbox(input_frame, width=15, height=MAX_VISIBLE_SUGGESTIONS, activestyle="none")
+    pending_lookup = {'job': None}
+
+    def hide_suggestions():
+        suggestion_list.grid_remove()
+
+    def update_suggestions():
+        """Show the controller's suggestions for the current entry text"""
+        pending_lookup['job'] = None
+        typed = city_entry.get().strip()
+        suggestions = parent_view.controller.suggest_cities(typed) if hasattr(parent_view, 'controller') else []
+        if not suggestions or [s.lower() for s in suggestions] == [typed.lower()]:
+            hide_suggestions()
+            return
+        suggestion_list.delete(0, END)
+        for suggestion in suggestions:
+            suggestion_list.insert(END, suggestion)
+        suggestion_list.config(height=min(len(suggestions), MAX_VISIBLE_SUGGESTIONS))
+        suggestion_list.grid(row=2, column=2, sticky=EW)
+
+    def on_key_release(event):
+        """Debounce suggestion lookups while the user is typing"""
+        if event.keysym in ("Return", "KP_Enter", "Up", "Down", "Escape", "Tab"):
+            return
+        if pending_lookup['job'] is not None:
+            city_entry.after_cancel(pending_lookup['job'])
+        pending_lookup['job'] = city_entry.after(SUGGEST_DELAY_MS, update_suggestions)
+
+    def on_down_pressed(event):
+        """Move keyboard focus into the dropdown"""
+        if suggestion_list.winfo_ismapped():
+            suggestion_list.focus_set()
+            suggestion_list.selection_clear(0, END)
+            suggestion_list.selection_set(0)
+            suggestion_list.activate(0)
+        return "break"
+
+    def on_suggestion_chosen(event=None):
+        """Fill the entry with the chosen suggestion and search for it"""
+        selection = suggestion_list.curselection()
+        if not selection:
+            return
+        city_entry.delete(0, END)
+        city_entry.insert(0, suggestion_list.get(selection[0]))
+        city_entry.focus_set()
+        on_search_clicked()
+
     def on_search_clicked():
         """Handle search button click"""
+        hide_suggestions()
         city_name = city_entry.get().strip()
         if not city_name:
             messagebox.showerror("Invalid Input", "Please enter a city name.")
@@ -58,6 +111,12 @@ def create_search_view(parent_frame, parent_view):
     
     # Bind Enter key to the entry field
     city_entry.bind('<Return>', on_enter_pressed)
+    city_entry.bind('<KeyRelease>', on_key_release)
+    city_entry.bind('<Down>', on_down_pressed)
+    city_entry.bind('<Escape>', lambda event: hide_suggestions())
+    suggestion_list.bind('<Return>', on_suggestion_chosen)
+    suggestion_list.bind('<ButtonRelease-1>', on_suggestion_chosen)
+    suggestion_list.bind('<Escape>', lambda event: (hide_suggestions(), city_entry.focus_set()))
 
     # Results Frame (same container as input_frame)
     results_frame = ttk.LabelFrame(content_wrapper, text="🌤️ Weather Conditions", padding=15)